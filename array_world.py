@@ -0,0 +1,579 @@
+from enum import IntEnum
+import numpy as np
+from typing import List, Optional, Tuple
+import entities
+from entities import EntityType, EntityRole, ResourceType, RESOURCE_CODES
+
+# Vizinhança de Moore, na mesma ordem usada por World.get_neighbors
+OFFSETS: List[Tuple[int, int]] = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                                  if (dx, dy) != (0, 0)]
+
+# Códigos de recurso nas matrizes (0 = célula sem recurso)
+RES_NONE = 0
+RES_FOOD = RESOURCE_CODES[ResourceType.FOOD]
+RES_ORE = RESOURCE_CODES[ResourceType.ORE]
+RES_MISC = RESOURCE_CODES[ResourceType.MISC]
+RESOURCE_ENERGY = np.array(entities.RESOURCE_ENERGY, dtype=np.float32)
+RESOURCE_STRENGTH = np.array(entities.RESOURCE_STRENGTH, dtype=np.float32)
+
+MAX_OCCUPANTS = 10
+CONSTRUCTION_ENERGY = 100.0
+TARGET_RADIUS = 10  # Mesmo raio de World.find_nearest_target
+P_RANDOM_MOVE = 0.2
+
+# Campos por célula que acompanham a entidade quando ela se move
+ENTITY_FIELDS = ("team", "role", "energy", "strength", "age", "last_reproduction", "ore", "misc")
+CONSTRUCTION_FIELDS = ("con_team", "con_energy", "con_occupants", "con_special", "con_energy_sum",
+                       "con_strength_sum", "con_ore", "con_misc", "con_last_reproduction")
+# Todas as matrizes de estado por célula
+STATE_FIELDS = ENTITY_FIELDS + ("resource_type", "resource_amount") + CONSTRUCTION_FIELDS
+
+
+class Draw(IntEnum):
+    """
+    Sorteios de um tick. O ArrayWorld ignora o código e consome o gerador em
+    sequência; o TiledWorld deriva dele os números de cada célula.
+    """
+    INITIAL_ROLE = 0
+    MOVE_PRIORITY = 1
+    MOVE_DIRECTION = 2
+    WANDER = 3
+    BIRTH_PRIORITY = 4
+    BIRTH_DIRECTION = 5
+    MUTATION = 6
+    MUTATION_KIND = 7
+    CHILD_ROLE = 8
+    REGROWTH = 9
+    REGROWTH_AMOUNT = 10
+    CONSTRUCTION_ROLE = 11
+
+
+def pad(a: np.ndarray, fill=0) -> np.ndarray:
+    """Copia a matriz com uma borda de 1 célula nos dois últimos eixos"""
+    widths = [(0, 0)] * (a.ndim - 2) + [(1, 1), (1, 1)]
+    return np.pad(a, widths, constant_values=fill)
+
+
+def view(padded: np.ndarray, dx: int, dy: int) -> np.ndarray:
+    """Visão (sem cópia) em que cada célula (i, j) enxerga o vizinho (i+dx, j+dy)"""
+    n, m = padded.shape[-2] - 2, padded.shape[-1] - 2
+    return padded[..., 1 + dx:1 + dx + n, 1 + dy:1 + dy + m]
+
+
+def push(a: np.ndarray, dx: int, dy: int) -> np.ndarray:
+    """Desloca cada valor uma célula na direção (dx, dy); a borda recebe 0"""
+    return view(pad(a), -dx, -dy)
+
+
+def neighbors(a: np.ndarray, fill=0) -> List[np.ndarray]:
+    """Lista com as 8 visões de vizinhos, na ordem de OFFSETS"""
+    padded = pad(a, fill)
+    return [view(padded, dx, dy) for dx, dy in OFFSETS]
+
+
+def dilate(mask: np.ndarray) -> np.ndarray:
+    """Dilatação 3x3 (separável) de uma máscara booleana"""
+    p = pad(mask, False)
+    rows = p[..., :-2, :] | p[..., 1:-1, :] | p[..., 2:, :]
+    return rows[..., :, :-2] | rows[..., :, 1:-1] | rows[..., :, 2:]
+
+
+def distance_field(sources: np.ndarray, passable: np.ndarray, radius: int) -> np.ndarray:
+    """Distância em passos (8-vizinhança) até a fonte mais próxima, limitada a `radius`"""
+    dist = np.full(sources.shape, radius + 1, dtype=np.int16)
+    dist[sources] = 0
+    reached = sources.copy()
+    for step in range(1, radius + 1):
+        grown = dilate(reached) & passable & ~reached
+        if not grown.any():
+            break
+        dist[grown] = step
+        reached |= grown
+    return dist
+
+
+class ArrayWorld:
+    """
+    Motor alternativo ao World: o estado fica em matrizes NumPy paralelas
+    (struct-of-arrays) e cada fase do tick é uma operação sobre a grade inteira.
+
+    Conflitos (duas entidades querendo a mesma célula) são resolvidos por
+    prioridade aleatória no destino, de modo que as fases não dependem da
+    ordem de varredura.
+
+    As regras por tick são um modelo simplificado e próprio, não as do
+    World (por isso ele não é um motor de create_world); com os mesmos
+    parâmetros os dois chegam a populações bem diferentes. Diferenças:
+      - toda entidade envelhece e gasta 0.08 de energia por tick (regras de
+        Entity.update); o World não aplica Entity.update, então no mapa dele
+        a idade fica em 0 e só há nascimentos dentro das construções
+      - a reprodução no mapa não precisa de parceiro, e o movimento só busca
+        construções (não há busca de parceiros)
+      - exércitos não são modelados
+
+    As fases operam sobre os dois últimos eixos; eixos anteriores (batch_shape)
+    são mundos independentes avançados juntos (ver ArrayEnsemble).
+    """
+
+    batch_shape: Tuple[int, ...] = ()
+
+    def __init__(self, size: int, prob_species1: float, prob_species2: float,
+                 seed: Optional[int] = None):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.tick = 0
+        shape = self.batch_shape + (size, size)
+
+        # Entidades livres no mapa
+        self.team = self.zeros(shape, np.int8)
+        self.role = self.zeros(shape, np.int8)
+        self.energy = self.zeros(shape, np.float32)
+        self.strength = self.zeros(shape, np.float32)
+        self.age = self.zeros(shape, np.int32)
+        self.last_reproduction = self.zeros(shape, np.int32)
+        self.ore = self.zeros(shape, np.int32)
+        self.misc = self.zeros(shape, np.int32)
+
+        # Recursos
+        self.resource_type = self.zeros(shape, np.int8)
+        self.resource_amount = self.zeros(shape, np.int8)
+
+        # Construções e o agregado dos seus ocupantes
+        self.con_team = self.zeros(shape, np.int8)
+        self.con_energy = self.zeros(shape, np.float32)
+        self.con_occupants = self.zeros(shape, np.int16)
+        self.con_special = self.zeros(shape, np.int16)  # Construtores/mineradores abrigados
+        self.con_energy_sum = self.zeros(shape, np.float32)
+        self.con_strength_sum = self.zeros(shape, np.float32)
+        self.con_ore = self.zeros(shape, np.int32)
+        self.con_misc = self.zeros(shape, np.int32)
+        self.con_last_reproduction = self.zeros(shape, np.int32)
+
+        # Contadores (mesma interface do World)
+        self.species1_count = 0
+        self.species2_count = 0
+        self.construction1_count = 0
+        self.construction2_count = 0
+        self.resources1 = {ResourceType.ORE: 0, ResourceType.MISC: 0}
+        self.resources2 = {ResourceType.ORE: 0, ResourceType.MISC: 0}
+        self.births = {EntityType.SPECIES1: 0, EntityType.SPECIES2: 0}  # Acumulados desde a criação
+        self.armies = {
+            EntityType.SPECIES1: [],
+            EntityType.SPECIES2: []
+        }
+
+        self.initialize_world(prob_species1, prob_species2)
+        self.count_entities()
+
+    def zeros(self, shape: Tuple[int, ...], dtype) -> np.ndarray:
+        """Aloca uma matriz de estado (o TiledWorld a coloca em memória compartilhada)"""
+        return np.zeros(shape, dtype=dtype)
+
+    def initialize_world(self, prob_species1: float, prob_species2: float) -> None:
+        rand = self.rng.random(self.team.shape)
+        self.team[rand < prob_species1] = EntityType.SPECIES1.value
+        self.team[(rand >= prob_species1) & (rand < prob_species1 + prob_species2)] = EntityType.SPECIES2.value
+        alive = self.team != 0
+        self.role[alive] = self.roll_roles(alive, Draw.INITIAL_ROLE)
+        self.energy[alive] = 2.0
+        self.strength[alive] = 1.0
+
+        # Minério: 5% das células de cada mundo, sem repetição
+        num_ore_deposits = int(self.size * self.size * 0.05)
+        for world in np.ndindex(self.batch_shape):
+            cells = self.rng.choice(self.size * self.size, num_ore_deposits, replace=False)
+            self.resource_type[world].flat[cells] = RES_ORE
+            self.resource_amount[world].flat[cells] = 3
+
+    def layers(self):
+        """Camadas de estado para renderização (ver rendering.py)"""
+        return {
+            "team": self.team,
+            "resource": self.resource_type,
+            "construction": self.con_team,
+            "occupants": self.con_occupants,
+            "capacity": np.full(self.con_occupants.shape, MAX_OCCUPANTS, dtype=np.int16)
+        }
+
+    def uniform(self, draw: Draw, lead: Tuple[int, ...] = (), dtype=np.float64) -> np.ndarray:
+        """Uniformes em [0, 1), um por célula (com eixos `lead` à frente)"""
+        return self.rng.random(lead + self.team.shape, dtype=dtype)
+
+    def integers(self, draw: Draw, low: int, high: int, dtype=np.int64) -> np.ndarray:
+        """Inteiros em [low, high), um por célula"""
+        return self.rng.integers(low, high, self.team.shape, dtype=dtype)
+
+    def masked_uniform(self, draw: Draw, mask: np.ndarray) -> np.ndarray:
+        """Uniformes só para as células da máscara, na ordem de a[mask]"""
+        return self.rng.random(int(mask.sum()))
+
+    def masked_integers(self, draw: Draw, mask: np.ndarray, low: int, high: int) -> np.ndarray:
+        return self.rng.integers(low, high, int(mask.sum()))
+
+    def roll_roles(self, mask: np.ndarray, draw: Draw) -> np.ndarray:
+        """Sorteia papéis para as células da máscara com as mesmas chances de Entity.__init__"""
+        roll = self.masked_uniform(draw, mask)
+        roles = np.full(len(roll), EntityRole.NORMAL.value, dtype=np.int8)
+        roles[roll < 0.32] = EntityRole.MINER.value
+        roles[roll < 0.16] = EntityRole.BUILDER.value
+        return roles
+
+    def power(self) -> np.ndarray:
+        return self.energy + self.strength * 2
+
+    def resolve(self, proposal: np.ndarray, draw: Draw) -> np.ndarray:
+        """
+        Resolve propostas de ocupação: `proposal` guarda, na célula de origem, o
+        índice em OFFSETS da célula desejada (-1 = nenhuma). Retorna, por célula
+        de destino, o índice do vencedor (-1 = ninguém), escolhido pela maior
+        prioridade aleatória entre os candidatos.
+        """
+        priority = np.where(proposal >= 0, self.uniform(draw, dtype=np.float32), -1.0)
+        proposal_p = pad(proposal, -1)
+        priority_p = pad(priority, -1.0)
+        candidates = np.empty((len(OFFSETS),) + proposal.shape, dtype=np.float32)
+        for d, (dx, dy) in enumerate(OFFSETS):
+            # O candidato vindo pela direção d está em (i-dx, j-dy)
+            candidates[d] = np.where(view(proposal_p, -dx, -dy) == d, view(priority_p, -dx, -dy), -1.0)
+        winner = candidates.argmax(axis=0).astype(np.int8)
+        winner[candidates.max(axis=0) < 0] = -1
+        return winner
+
+    def accepted(self, proposal: np.ndarray, winner: np.ndarray) -> np.ndarray:
+        """Máscara das origens cuja proposta venceu no destino"""
+        winner_p = pad(winner, -1)
+        result = np.zeros(proposal.shape, dtype=bool)
+        for d, (dx, dy) in enumerate(OFFSETS):
+            result |= (proposal == d) & (view(winner_p, dx, dy) == d)
+        return result
+
+    def pull(self, a: np.ndarray, winner: np.ndarray) -> np.ndarray:
+        """Valor de `a` na origem do vencedor de cada destino (0 onde não há vencedor)"""
+        # Índice plano da origem: o vencedor veio pela direção d, de (i-dx, j-dy),
+        # sempre dentro do mesmo mundo; sem vencedor, lê o próprio destino
+        arrived = winner >= 0
+        offsets = np.array([dx * self.size + dy for dx, dy in OFFSETS], dtype=np.int64)
+        shift = np.where(arrived, offsets[winner], 0)
+        origin = np.arange(a.size).reshape(a.shape) - shift
+        return np.where(arrived, a.ravel()[origin], 0).astype(a.dtype)
+
+    def choose_direction(self, allowed: np.ndarray, draw: Draw) -> np.ndarray:
+        """Escolhe, por célula, uma direção aleatória entre as permitidas (8 x ...)"""
+        keys = np.where(allowed, self.uniform(draw, (len(OFFSETS),), np.float32), -1.0)
+        direction = keys.argmax(axis=0).astype(np.int8)
+        direction[keys.max(axis=0) < 0] = -1
+        return direction
+
+    def free_cells(self) -> np.ndarray:
+        return (self.team == 0) & (self.con_team == 0)
+
+    def update(self) -> None:
+        self.advance()
+        self.count_entities()
+        self.tick += 1
+
+    def advance(self) -> None:
+        """As fases de um tick, sem contagem"""
+        self.attack_constructions()
+        self.consume_resources()
+        self.move()
+        self.combat()
+        self.reproduce()
+        self.update_resources()
+        self.build()
+        self.shelter()
+        self.transfer_to_builders()
+        self.update_constructions()
+        self.age_entities()
+
+    def attack_constructions(self) -> None:
+        """Entidades adjacentes a construções inimigas causam dano; as atacadas liberam defensores"""
+        power = np.where(self.team != 0, self.power(), 0.0)
+        damage = np.zeros(self.con_energy.shape, dtype=np.float32)
+        for team_n, power_n in zip(neighbors(self.team), neighbors(power)):
+            damage += np.where((team_n != 0) & (team_n != self.con_team), power_n, 0.0)
+        damage *= 0.2
+        attacked = (self.con_team != 0) & (damage > 0)
+        if not attacked.any():
+            return
+        self.con_energy -= np.where(attacked, damage, 0.0)
+
+        # Construções destruídas: os ocupantes se perdem junto com elas
+        destroyed = attacked & (self.con_energy <= 0)
+        for name in CONSTRUCTION_FIELDS:
+            getattr(self, name)[destroyed] = 0
+
+        # Defensores (apenas seres normais) saem para as células livres ao redor
+        defending = attacked & ~destroyed & (self.con_occupants > self.con_special)
+        if not defending.any():
+            return
+        remaining = np.where(defending, self.con_occupants - self.con_special, 0).astype(np.int16)
+        mean_energy = np.where(defending, self.con_energy_sum / np.maximum(self.con_occupants, 1), 0)
+        mean_strength = np.where(defending, self.con_strength_sum / np.maximum(self.con_occupants, 1), 0)
+        for dx, dy in OFFSETS:
+            # Defensor da construção em (i, j) vai para (i+dx, j+dy); uma direção
+            # por vez, para que duas construções nunca disputem a mesma célula
+            placed = (remaining > 0) & view(pad(self.free_cells(), False), dx, dy)
+            if not placed.any():
+                continue
+            dest = push(placed, dx, dy)
+            self.team[dest] = push(self.con_team, dx, dy)[dest]
+            self.role[dest] = EntityRole.NORMAL.value
+            self.energy[dest] = push(mean_energy, dx, dy)[dest]
+            self.strength[dest] = push(mean_strength, dx, dy)[dest]
+            remaining[placed] -= 1
+            self.con_occupants[placed] -= 1
+            self.con_energy_sum[placed] -= mean_energy[placed]
+            self.con_strength_sum[placed] -= mean_strength[placed]
+
+    def consume_resources(self) -> None:
+        """Entidades consomem o recurso da própria célula (minério apenas por mineradores)"""
+        eating = (self.team != 0) & (self.resource_type != RES_NONE)
+        if not eating.any():
+            return
+        rtype = self.resource_type[eating]
+        amount = self.resource_amount[eating].astype(np.float32)
+        gains = (rtype != RES_ORE) | (self.role[eating] == EntityRole.MINER.value)
+        amount = np.where(gains, amount, 0)
+        self.energy[eating] += amount * RESOURCE_ENERGY[rtype]
+        self.strength[eating] += amount * RESOURCE_STRENGTH[rtype]
+        self.ore[eating] += np.where(rtype == RES_ORE, amount, 0).astype(np.int32)
+        self.misc[eating] += np.where(rtype == RES_MISC, amount, 0).astype(np.int32)
+        self.resource_type[eating] = RES_NONE
+        self.resource_amount[eating] = 0
+
+    def target_field(self, team: int) -> np.ndarray:
+        """Distância até construções inimigas ou construções aliadas com espaço"""
+        sources = ((self.con_team != 0) & (self.con_team != team)) | \
+                  ((self.con_team == team) & (self.con_occupants < MAX_OCCUPANTS))
+        return distance_field(sources, self.con_team == 0, TARGET_RADIUS)
+
+    def move(self) -> None:
+        """Movimento: descer o campo de distância até o alvo ou passo aleatório"""
+        free = self.free_cells()
+        free_n = np.stack(neighbors(free, False))
+        proposal = np.full(self.team.shape, -1, dtype=np.int8)
+
+        for team in (EntityType.SPECIES1.value, EntityType.SPECIES2.value):
+            members = self.team == team
+            if not members.any():
+                continue
+            dist = self.target_field(team)
+            dist_n = np.stack(neighbors(dist, TARGET_RADIUS + 1))
+            dist_n = np.where(free_n, dist_n, TARGET_RADIUS + 1)
+            best = dist_n.argmin(axis=0).astype(np.int8)
+            improves = (dist_n.min(axis=0) < dist) & (dist > 1)
+            proposal[members & improves] = best[members & improves]
+
+        # Sem alvo alcançável: passo aleatório com probabilidade P_RANDOM_MOVE
+        wander = (self.team != 0) & (proposal < 0) & (self.uniform(Draw.WANDER) < P_RANDOM_MOVE)
+        direction = self.choose_direction(free_n, Draw.MOVE_DIRECTION)
+        proposal[wander] = direction[wander]
+
+        winner = self.resolve(proposal, Draw.MOVE_PRIORITY)
+        moved = self.accepted(proposal, winner)
+        arrived = winner >= 0
+        for name in ENTITY_FIELDS:
+            a = getattr(self, name)
+            pulled = self.pull(a, winner)
+            a[moved] = 0
+            a[arrived] = pulled[arrived]
+
+    def combat(self) -> None:
+        """Uma entidade morre se algum vizinho inimigo tiver mais poder"""
+        power = self.power()
+        dies = np.zeros(self.team.shape, dtype=bool)
+        for team_n, power_n in zip(neighbors(self.team), neighbors(power)):
+            dies |= (team_n != 0) & (team_n != self.team) & (power_n > power)
+        dies &= self.team != 0
+        for name in ENTITY_FIELDS:
+            getattr(self, name)[dies] = 0
+
+    def reproduce(self) -> None:
+        """Entidades aptas geram um filho numa célula livre vizinha (regras de Entity.reproduce)"""
+        able = ((self.team != 0) & (self.energy > 2.85) & (self.age > 1) &
+                (self.age - self.last_reproduction > 1))
+        if not able.any():
+            return
+        direction = self.choose_direction(np.stack(neighbors(self.free_cells(), False)),
+                                          Draw.BIRTH_DIRECTION)
+        proposal = np.where(able, direction, -1).astype(np.int8)
+        winner = self.resolve(proposal, Draw.BIRTH_PRIORITY)
+        parents = self.accepted(proposal, winner)
+        born = winner >= 0
+        count = int(born.sum())
+        if count == 0:
+            return
+
+        child_energy = self.pull(self.energy, winner)[born] * 0.4
+        child_strength = self.pull(self.strength, winner)[born]
+        mutation = self.masked_uniform(Draw.MUTATION, born)
+        kind = self.masked_integers(Draw.MUTATION_KIND, born, 0, 3)  # energy+, strength+, efficiency+
+        child_energy = np.where((mutation < 0.15) & (kind == 0), child_energy * 1.2, child_energy)
+        child_strength = np.where((mutation < 0.15) & (kind == 1), child_strength * 1.2, child_strength)
+
+        self.team[born] = self.pull(self.team, winner)[born]
+        self.role[born] = self.roll_roles(born, Draw.CHILD_ROLE)
+        self.energy[born] = child_energy
+        self.strength[born] = child_strength
+        self.age[born] = 0
+        self.last_reproduction[born] = 0
+        self.ore[born] = 0
+        self.misc[born] = 0
+        self.energy[parents] *= 0.6
+        self.last_reproduction[parents] = self.age[parents]
+        self.count_births(self.team, born)
+
+    def update_resources(self) -> None:
+        """Regeneração: comida ou misc (10% cada) em células sem recurso"""
+        empty = self.resource_type == RES_NONE
+        roll = self.uniform(Draw.REGROWTH, dtype=np.float32)
+        food = empty & (roll < 0.1)
+        misc = empty & ~food & (roll < 0.19)  # 10% dos 90% restantes
+        amount = self.integers(Draw.REGROWTH_AMOUNT, 1, 4, np.int8)
+        self.resource_type[food] = RES_FOOD
+        self.resource_type[misc] = RES_MISC
+        grown = food | misc
+        self.resource_amount[grown] = amount[grown]
+
+    def build(self) -> None:
+        """Construtores com recursos e espaço (>= 3 vizinhos livres) erguem uma construção"""
+        can_build = ((self.team != 0) & (self.role == EntityRole.BUILDER.value) &
+                     (self.ore >= 1) & (self.misc >= 2) & (self.con_team == 0))
+        if not can_build.any():
+            return
+        free_count = sum(n.astype(np.int8) for n in neighbors(self.free_cells(), False))
+        builders = can_build & (free_count >= 3)
+        self.con_team[builders] = self.team[builders]
+        self.con_energy[builders] = CONSTRUCTION_ENERGY
+        self.con_occupants[builders] = 1
+        self.con_special[builders] = 1
+        self.con_energy_sum[builders] = self.energy[builders]
+        self.con_strength_sum[builders] = self.strength[builders]
+        self.con_ore[builders] = self.ore[builders] - 1
+        self.con_misc[builders] = self.misc[builders] - 2
+        self.con_last_reproduction[builders] = 0
+        for name in ENTITY_FIELDS:
+            getattr(self, name)[builders] = 0
+
+    def shelter(self) -> None:
+        """Entidades entram em construções aliadas vizinhas com espaço"""
+        for dx, dy in OFFSETS:
+            # Entidade em (i, j) entra na construção em (i+dx, j+dy)
+            con_team_n = view(pad(self.con_team), dx, dy)
+            space_n = view(pad(self.con_occupants < MAX_OCCUPANTS, False), dx, dy)
+            entering = (self.team != 0) & (con_team_n == self.team) & space_n
+            if not entering.any():
+                continue
+            # Em cada direção uma construção recebe no máximo uma entidade
+            special = entering & (self.role != EntityRole.NORMAL.value)
+            self.con_occupants += push(entering, dx, dy)
+            self.con_special += push(special, dx, dy)
+            self.con_energy_sum += push(np.where(entering, self.energy, 0), dx, dy)
+            self.con_strength_sum += push(np.where(entering, self.strength, 0), dx, dy)
+            self.con_ore += push(np.where(entering, self.ore, 0), dx, dy)
+            self.con_misc += push(np.where(entering, self.misc, 0), dx, dy)
+            for name in ENTITY_FIELDS:
+                getattr(self, name)[entering] = 0
+
+    def transfer_to_builders(self) -> None:
+        """Mineradores entregam todo o inventário a um construtor aliado vizinho"""
+        miners = ((self.team != 0) & (self.role == EntityRole.MINER.value) &
+                  ((self.ore > 0) | (self.misc > 0)))
+        if not miners.any():
+            return
+        builders = self.role == EntityRole.BUILDER.value
+        for dx, dy in OFFSETS:
+            # Minerador em (i, j) entrega ao construtor em (i+dx, j+dy)
+            giving = miners & view(pad(builders, False), dx, dy) & (view(pad(self.team), dx, dy) == self.team)
+            if not giving.any():
+                continue
+            self.ore += push(np.where(giving, self.ore, 0), dx, dy)
+            self.misc += push(np.where(giving, self.misc, 0), dx, dy)
+            self.ore[giving] = 0
+            self.misc[giving] = 0
+            miners &= ~giving
+
+    def update_constructions(self) -> None:
+        """Reprodução dentro das construções (regras de Construction.try_reproduce)"""
+        active = self.con_team != 0
+        self.con_last_reproduction[active] += 1
+        breeding = (active & (self.con_occupants >= 2) & (self.con_occupants < MAX_OCCUPANTS) &
+                    (self.con_last_reproduction >= 2))
+        count = int(breeding.sum())
+        if count == 0:
+            return
+        occupants = self.con_occupants[breeding].astype(np.float32)
+        mean_energy = self.con_energy_sum[breeding] / occupants
+        mean_strength = self.con_strength_sum[breeding] / occupants
+        # Filho com 120% da média; os dois pais perdem 10% da energia
+        self.con_energy_sum[breeding] += mean_energy * 1.2 - mean_energy * 0.2
+        self.con_strength_sum[breeding] += mean_strength * 1.2
+        self.con_occupants[breeding] += 1
+        self.con_special[breeding] += (self.roll_roles(breeding, Draw.CONSTRUCTION_ROLE) != EntityRole.NORMAL.value).astype(np.int16)
+        self.con_last_reproduction[breeding] = 0
+        self.count_births(self.con_team, breeding)
+
+    def count_births(self, team: np.ndarray, born: np.ndarray) -> None:
+        for entity_team in self.births:
+            self.births[entity_team] = self.births[entity_team] + self.total(team == entity_team.value, born)
+
+    def age_entities(self) -> None:
+        """Envelhecimento e gasto de energia (regras de Entity.update)"""
+        alive = self.team != 0
+        self.age[alive] += 1
+        self.energy[alive] = np.maximum(0, self.energy[alive] - 0.08)
+
+    def total(self, a: np.ndarray, mask: np.ndarray):
+        """Soma por mundo dos valores sob a máscara (int num mundo só, vetor num ensemble)"""
+        counts = np.where(mask, a, 0).sum(axis=(-2, -1), dtype=np.int64)
+        return int(counts) if counts.ndim == 0 else counts
+
+    def count_entities(self) -> None:
+        for team, attr in ((EntityType.SPECIES1, "1"), (EntityType.SPECIES2, "2")):
+            members = self.team == team.value
+            owned = self.con_team == team.value
+            setattr(self, f"species{attr}_count",
+                    self.total(members, True) + self.total(self.con_occupants, owned))
+            setattr(self, f"construction{attr}_count", self.total(owned, True))
+            setattr(self, f"resources{attr}", {
+                ResourceType.ORE: self.total(self.ore, members) + self.total(self.con_ore, owned),
+                ResourceType.MISC: self.total(self.misc, members) + self.total(self.con_misc, owned)
+            })
+
+
+class ArrayEnsemble(ArrayWorld):
+    """
+    K mundos ArrayWorld independentes guardados no eixo 0 das mesmas matrizes
+    e avançados pelo mesmo tick vetorizado: o custo Python de um tick é pago
+    uma vez para todos. Os contadores viram vetores de K posições. A semente
+    vale para o ensemble inteiro (os mundos não reproduzem um ArrayWorld
+    isolado com a mesma semente, mas são estatisticamente independentes).
+    """
+
+    def __init__(self, worlds: int, size: int, prob_species1: float, prob_species2: float,
+                 seed: Optional[int] = None):
+        self.worlds = worlds
+        self.batch_shape = (worlds,)
+        super().__init__(size, prob_species1, prob_species2, seed=seed)
+
+    def winners(self) -> np.ndarray:
+        """Por mundo: 1 ou 2 para o time com mais seres, 0 em empate"""
+        return np.where(self.species1_count > self.species2_count, 1,
+                        np.where(self.species2_count > self.species1_count, 2, 0))
+
+    def outcomes(self) -> List[dict]:
+        """Estatísticas finais de cada mundo"""
+        winners = self.winners().tolist()
+        return [{
+            "world": k,
+            "winner": winners[k],
+            "species1_count": int(self.species1_count[k]),
+            "species2_count": int(self.species2_count[k]),
+            "construction1_count": int(self.construction1_count[k]),
+            "construction2_count": int(self.construction2_count[k]),
+            "ore1": int(self.resources1[ResourceType.ORE][k]),
+            "misc1": int(self.resources1[ResourceType.MISC][k]),
+            "ore2": int(self.resources2[ResourceType.ORE][k]),
+            "misc2": int(self.resources2[ResourceType.MISC][k]),
+        } for k in range(self.worlds)]
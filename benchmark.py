@@ -0,0 +1,163 @@
+import argparse
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import platform
+import resource
+import sys
+import time
+from typing import Dict, List, Tuple
+import numpy as np
+from world import create_world, ENGINES
+
+DEFAULT_SIZES = (20, 50, 100, 200, 500, 1000)
+DEFAULT_DENSITIES = ((0.05, 0.05), (0.15, 0.15), (0.3, 0.3))
+
+
+def run_case(engine: str, size: int, prob_species1: float, prob_species2: float,
+             ticks: int, seed: int, max_seconds: float) -> Dict:
+    """
+    Executa um caso sem interface e mede cada tick. Roda num processo próprio,
+    então o pico de memória (RSS máximo do processo) é o do próprio caso.
+    Com `max_seconds` o caso para antes dos `ticks` (ao menos um tick é medido).
+    """
+    start = time.perf_counter()
+    world = create_world(size, prob_species1, prob_species2, engine=engine, seed=seed)
+    init_seconds = time.perf_counter() - start
+
+    latencies: List[float] = []
+    started = time.perf_counter()
+    while len(latencies) < ticks:
+        t = time.perf_counter()
+        world.update()
+        latencies.append(time.perf_counter() - t)
+        if max_seconds and time.perf_counter() - started > max_seconds:
+            break
+    if hasattr(world, "close"):
+        world.close()
+
+    lat = np.array(latencies)
+    p50, p90, p99 = np.percentile(lat, [50, 90, 99]) * 1000
+    return {
+        "engine": engine,
+        "size": size,
+        "prob_species1": prob_species1,
+        "prob_species2": prob_species2,
+        "seed": seed,
+        "ticks": len(latencies),
+        "init_s": round(init_seconds, 4),
+        "ticks_per_s": round(len(latencies) / lat.sum(), 3),
+        "p50_ms": round(float(p50), 3),
+        "p90_ms": round(float(p90), 3),
+        "p99_ms": round(float(p99), 3),
+        "peak_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def case_key(result: Dict) -> Tuple:
+    return (result["engine"], result["size"], result["prob_species1"], result["prob_species2"])
+
+
+def find_regressions(results: List[Dict], baseline: Dict, tolerance: float) -> List[str]:
+    """Casos mais lentos ou com mais memória que a base além da tolerância (fração)"""
+    reference = {case_key(r): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        base = reference.get(case_key(result))
+        if base is None:
+            continue
+        label = "{} {}x{} p=({}, {})".format(result["engine"], result["size"], result["size"],
+                                              result["prob_species1"], result["prob_species2"])
+        if result["ticks_per_s"] < base["ticks_per_s"] * (1 - tolerance):
+            regressions.append(f"{label}: {result['ticks_per_s']} ticks/s "
+                               f"(base {base['ticks_per_s']})")
+        if result["peak_mib"] > base["peak_mib"] * (1 + tolerance):
+            regressions.append(f"{label}: pico {result['peak_mib']} MiB "
+                               f"(base {base['peak_mib']})")
+    return regressions
+
+
+def print_result(result: Dict) -> None:
+    print("{engine:>6} {size:>5} {prob_species1:>5} {prob_species2:>5} {ticks:>5} "
+          "{init_s:>8.3f} {ticks_per_s:>10.2f} {p50_ms:>9.2f} {p90_ms:>9.2f} {p99_ms:>9.2f} "
+          "{peak_mib:>8.1f}".format(**result), flush=True)
+
+
+def parse_densities(text: str) -> List[Tuple[float, float]]:
+    """"0.1,0.1;0.3,0.3" -> [(0.1, 0.1), (0.3, 0.3)]"""
+    densities = []
+    for pair in text.split(";"):
+        p1, p2 = (float(p) for p in pair.split(","))
+        densities.append((p1, p2))
+    return densities
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do World.update sem interface")
+    parser.add_argument("--engine", choices=ENGINES, nargs="+", default=["object"],
+                        help="motores a medir")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="lados de grade a medir")
+    parser.add_argument("--densities", type=parse_densities,
+                        default=list(DEFAULT_DENSITIES),
+                        help='pares prob1,prob2 separados por ";" (ex.: "0.1,0.1;0.3,0.3")')
+    parser.add_argument("--ticks", type=int, default=20,
+                        help="ticks medidos por caso")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="semente fixa de todos os casos")
+    parser.add_argument("--max-seconds", type=float, default=60.0,
+                        help="tempo máximo de ticks por caso (0 = sem limite)")
+    parser.add_argument("--output", default="benchmark_results.json",
+                        help="arquivo JSON com os resultados")
+    parser.add_argument("--baseline", default=None,
+                        help="resultados anteriores (JSON) para detectar regressões")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="piora tolerada em relação à base (fração)")
+    args = parser.parse_args(argv)
+    if any(p1 + p2 > 1 for p1, p2 in args.densities):
+        parser.error("A soma das probabilidades das espécies não pode ser maior que 1.")
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    print(f"{'motor':>6} {'lado':>5} {'p1':>5} {'p2':>5} {'ticks':>5} {'init(s)':>8} "
+          f"{'ticks/s':>10} {'p50(ms)':>9} {'p90(ms)':>9} {'p99(ms)':>9} {'pico MiB':>8}")
+    results = []
+    # Um processo novo por caso: memória e estado do interpretador não vazam
+    # entre casos
+    context = multiprocessing.get_context("spawn")
+    for engine in args.engine:
+        for size in args.sizes:
+            for p1, p2 in args.densities:
+                with ProcessPoolExecutor(1, mp_context=context) as executor:
+                    result = executor.submit(run_case, engine, size, p1, p2, args.ticks,
+                                             args.seed, args.max_seconds).result()
+                print_result(result)
+                results.append(result)
+
+    report = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Resultados salvos em {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSÃO {line}")
+        if regressions:
+            return 1
+        print(f"Sem regressões em relação a {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
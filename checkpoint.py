@@ -0,0 +1,229 @@
+import gc
+import json
+import os
+from collections import deque
+from contextlib import contextmanager
+from itertools import chain, compress, repeat
+from operator import attrgetter, is_not, setitem
+from typing import Dict, List
+import numpy as np
+from entities import Entity, EntityType, EntityRole, Construction
+from world import World, TEAMS
+
+# Formato do arquivo: um .npz (sem compressão) com tabelas em colunas.
+# Entidades e construções ganham um id (posição na tabela) e as ligações entre
+# objetos (ocupantes, exércitos, construção atual) viram listas de ids em
+# formato CSR: `*_offsets[k]:*_offsets[k+1]` delimita os membros do item k.
+FORMAT_VERSION = 1
+MUTATIONS = ("energy+", "strength+", "efficiency+")
+TYPES = list(EntityType)
+ROLES = list(EntityRole)
+
+ENTITY_FIELDS = (
+    ("type", np.int8), ("role", np.int8), ("energy", np.float64), ("strength", np.float64),
+    ("age", np.int64), ("last_reproduction", np.int64), ("ore", np.int64), ("misc", np.int64),
+    ("is_sheltered", np.bool_),
+)
+
+
+def offsets_of(groups) -> np.ndarray:
+    """Início de cada grupo numa lista CSR: `offsets[k]:offsets[k+1]` são os membros do grupo k"""
+    offsets = np.zeros(len(groups) + 1, dtype=np.int64)
+    np.cumsum(np.fromiter(map(len, groups), dtype=np.int64, count=len(groups)), out=offsets[1:])
+    return offsets
+
+
+def entity_ids(entities: List[Entity], members: List[Entity]) -> np.ndarray:
+    """
+    Ids (posição em `entities`) dos membros citados por ocupantes e exércitos.
+    A busca é feita pelos id() ordenados; membros que não estão na tabela (fora
+    da grade) são acrescentados ao fim dela, uma vez cada.
+    """
+    known = np.fromiter(map(id, entities), dtype=np.int64, count=len(entities))
+    order = np.argsort(known)
+    wanted = np.fromiter(map(id, members), dtype=np.int64, count=len(members))
+    slots = np.minimum(np.searchsorted(known[order], wanted), max(len(entities) - 1, 0))
+    ids = np.full(len(members), -1, dtype=np.int64)
+    if len(entities):
+        found = known[order[slots]] == wanted
+        ids[found] = order[slots[found]]
+    added: Dict[int, int] = {}
+    for k in np.flatnonzero(ids < 0).tolist():
+        member = members[k]
+        ids[k] = added.get(id(member), -1)
+        if ids[k] < 0:
+            ids[k] = added[id(member)] = len(entities)
+            entities.append(member)
+    return ids
+
+
+@contextmanager
+def paused_gc():
+    """
+    Suspende o coletor de ciclos: criar centenas de milhares de objetos de uma
+    vez dispararia coletas repetidas sobre o mundo inteiro
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def save_world(world: World, path: str) -> None:
+    """
+    Grava o estado completo do World (grade, recursos, construções, exércitos,
+    contadores e RNG). O arquivo é escrito ao lado e renomeado no fim: uma
+    falha no meio da gravação não destrói o checkpoint anterior.
+    """
+    partial = path + ".partial"
+    with paused_gc():
+        write_snapshot(world, partial)
+    os.replace(partial, path)
+
+
+def load_world(path: str) -> World:
+    """Reconstrói um World idêntico ao gravado por save_world"""
+    with paused_gc():
+        return read_snapshot(path)
+
+
+def write_snapshot(world: World, path: str) -> None:
+    # Construções, na ordem de criação (a ordem da manutenção por tick)
+    constructions = list(world.constructions)
+    cons_positions = [c.position for c in constructions]
+    construction_ids = {id(c): k for k, c in enumerate(constructions)}
+
+    # Entidades: primeiro as da grade, depois ocupantes e soldados fora dela
+    grid = world.grid
+    grid_positions = list(chain.from_iterable(world.entity_index[team] for team in TEAMS))
+    entities: List[Entity] = [grid[x][y] for x, y in grid_positions]
+    occupants = [list(c.occupants) for c in constructions]
+    armies = [army for team in TEAMS for army in world.armies[team]]
+    army_teams = [team for team in TEAMS for _ in world.armies[team]]
+    occupant_offsets = offsets_of(occupants)
+    army_offsets = offsets_of(armies)
+    members = entity_ids(entities, list(chain.from_iterable(chain(occupants, armies))))
+    occupant_ids, army_members = np.split(members, [occupant_offsets[-1]])
+
+    count = len(entities)
+    columns = {name: np.fromiter(map(attrgetter(name), entities), dtype=dtype, count=count)
+               for name, dtype in ENTITY_FIELDS}
+    positions = list(map(attrgetter("position"), entities))
+    placed = np.fromiter(map(is_not, positions, repeat(None)), dtype=np.bool_, count=count)
+    position = np.full((count, 2), -1, dtype=np.int64)
+    position[placed] = np.fromiter(chain.from_iterable(compress(positions, placed)), dtype=np.int64,
+                                   count=2 * int(placed.sum())).reshape(-1, 2)
+    # Campos quase sempre vazios: só as exceções são convertidas
+    current = np.full(count, -1, dtype=np.int64)
+    homes = list(map(attrgetter("current_construction"), entities))
+    for k in np.flatnonzero(np.fromiter(map(is_not, homes, repeat(None)), dtype=np.bool_,
+                                        count=count)).tolist():
+        current[k] = construction_ids.get(id(homes[k]), -1)
+    mutations = list(map(attrgetter("mutations"), entities))
+    mutation_offsets = offsets_of(mutations)
+    mutation_codes = np.array([MUTATIONS.index(name) for name in chain.from_iterable(mutations)],
+                              dtype=np.int64)
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "size": world.size,
+        "tick": world.tick,
+        "counters": {team.name: values for team, values in world.counters().items()},
+        "births": {team.name: world.births[team] for team in TEAMS},
+        "rng": world.rng.get_state(),
+    }
+    with open(path, "wb") as f:
+        np.savez(
+            f,
+            meta=np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8),
+            resource_type=world.resource_type,
+            resource_amount=world.resource_amount,
+            grid_positions=np.fromiter(chain.from_iterable(grid_positions), dtype=np.int64,
+                                       count=2 * len(grid_positions)).reshape(-1, 2),
+            entity_position=position,
+            entity_construction=current,
+            mutation_offsets=mutation_offsets,
+            mutation_codes=mutation_codes,
+            construction_positions=np.array(cons_positions, dtype=np.int64).reshape(-1, 2),
+            construction_owner=np.array([c.owner_type for c in constructions], dtype=np.int8),
+            construction_energy=np.array([c.energy for c in constructions], dtype=np.float64),
+            construction_max_occupants=np.array([c.max_occupants for c in constructions], dtype=np.int64),
+            construction_last_reproduction=np.array([c.last_reproduction for c in constructions],
+                                                    dtype=np.int64),
+            occupant_offsets=occupant_offsets,
+            occupant_ids=occupant_ids,
+            army_teams=np.array(army_teams, dtype=np.int8),
+            army_offsets=army_offsets,
+            army_members=army_members,
+            **{f"entity_{name}": column for name, column in columns.items()},
+        )
+
+
+def read_snapshot(path: str) -> World:
+    with np.load(path) as data:
+        data = dict(data)
+    meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+    if meta["version"] != FORMAT_VERSION:
+        raise ValueError(f"Versão de checkpoint não suportada: {meta['version']}")
+
+    world = World.empty(meta["size"])
+    world.tick = meta["tick"]
+    world.rng.set_state(meta["rng"])
+    world.resource_type[...] = data["resource_type"]
+    world.resource_amount[...] = data["resource_amount"]
+
+    # Entidades sem passar por Entity.__init__ (que sorteia o papel), coluna a coluna
+    position = data["entity_position"]
+    positions = list(zip(position[:, 0].tolist(), position[:, 1].tolist()))
+    for k in np.flatnonzero(position[:, 0] < 0).tolist():
+        positions[k] = None
+    columns = [data[f"entity_{name}"].tolist() for name, _ in ENTITY_FIELDS]
+    columns[0] = list(map(TYPES.__getitem__, columns[0]))
+    columns[1] = list(map(ROLES.__getitem__, columns[1]))
+    entities = list(map(Entity.restore, *columns, positions))
+
+    offsets = data["mutation_offsets"]
+    codes = data["mutation_codes"].tolist()
+    for k in np.flatnonzero(offsets[1:] > offsets[:-1]).tolist():
+        entities[k].mutations = tuple(MUTATIONS[m] for m in codes[offsets[k]:offsets[k + 1]])
+
+    constructions = []
+    occupant_offsets = data["occupant_offsets"].tolist()
+    occupant_ids = data["occupant_ids"].tolist()
+    for k, ((x, y), owner, energy, max_occupants, last) in enumerate(zip(
+            data["construction_positions"].tolist(), data["construction_owner"].tolist(),
+            data["construction_energy"].tolist(), data["construction_max_occupants"].tolist(),
+            data["construction_last_reproduction"].tolist())):
+        members = [entities[m] for m in occupant_ids[occupant_offsets[k]:occupant_offsets[k + 1]]]
+        c = Construction(TYPES[owner], (x, y), energy, max_occupants, members, last)
+        world.set_construction(x, y, c)
+        constructions.append(c)
+    current = data["entity_construction"]
+    for k in np.flatnonzero(current >= 0).tolist():
+        entities[k].current_construction = constructions[current[k]]
+
+    # As primeiras entidades são as da grade, na ordem de grid_positions
+    grid_positions = data["grid_positions"]
+    grid = world.grid
+    deque(map(setitem, map(grid.__getitem__, grid_positions[:, 0].tolist()),
+              grid_positions[:, 1].tolist(), entities), maxlen=0)
+    teams = data["entity_type"][:len(grid_positions)]
+    for team in TEAMS:
+        world.entity_index[team].extend(grid_positions[teams == team])
+
+    army_offsets = data["army_offsets"].tolist()
+    army_members = data["army_members"].tolist()
+    for k, team in enumerate(data["army_teams"].tolist()):
+        members = army_members[army_offsets[k]:army_offsets[k + 1]]
+        world.armies[TYPES[team]].append([entities[m] for m in members])
+
+    counters = {EntityType[name]: values for name, values in meta["counters"].items()}
+    for team in TEAMS:
+        world.add_counts(team, *counters[team])
+    # Checkpoints anteriores aos nascimentos acumulados recomeçam do zero
+    for name, births in meta.get("births", {}).items():
+        world.births[EntityType[name]] = births
+    return world
@@ -1,6 +1,5 @@
-import tkinter as tk
-
 def get_config():
+    import tkinter as tk  # Importado sob demanda: a simulação roda sem display
     config = {}
     def submit():
         try:
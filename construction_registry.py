@@ -0,0 +1,57 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from entities import Construction, EntityType
+from spatial_index import SpatialIndex
+
+Position = Tuple[int, int]
+
+
+class ConstructionRegistry:
+    """
+    Construções do mundo por id (ordem de criação), por posição e por time,
+    com um SpatialIndex por time para as consultas por raio. Substitui a
+    grade size x size de construções: fases que precisam delas percorrem só
+    as existentes, e a consulta por posição é um acesso a dicionário.
+    """
+
+    def __init__(self, size: int, teams: Iterable[EntityType]):
+        self.by_id: Dict[int, Construction] = {}
+        self.positions: Dict[Position, Construction] = {}
+        self.teams: Dict[EntityType, Dict[int, Construction]] = {team: {} for team in teams}
+        self.index: Dict[EntityType, SpatialIndex] = {team: SpatialIndex(size) for team in self.teams}
+        self.next_id = 0
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __iter__(self) -> Iterator[Construction]:
+        """Todas as construções, na ordem de criação"""
+        return iter(self.by_id.values())
+
+    def __contains__(self, pos: Position) -> bool:
+        return pos in self.positions
+
+    def at(self, x: int, y: int) -> Optional[Construction]:
+        return self.positions.get((x, y))
+
+    def team(self, team: EntityType) -> List[Construction]:
+        """Construções do time, na ordem de criação"""
+        return list(self.teams[team].values())
+
+    def add(self, construction: Construction) -> int:
+        """Registra a construção na sua posição (que deve estar livre) e devolve o id"""
+        pos = construction.position
+        if pos in self.positions:
+            raise ValueError(f"Já existe uma construção em {pos}")
+        construction.id = self.next_id
+        self.next_id += 1
+        self.by_id[construction.id] = construction
+        self.positions[pos] = construction
+        self.teams[construction.owner_type][construction.id] = construction
+        self.index[construction.owner_type].add(pos)
+        return construction.id
+
+    def remove(self, construction: Construction) -> None:
+        del self.by_id[construction.id]
+        del self.positions[construction.position]
+        del self.teams[construction.owner_type][construction.id]
+        self.index[construction.owner_type].remove(construction.position)
@@ -0,0 +1,57 @@
+import argparse
+import json
+import sys
+import time
+import numpy as np
+from array_world import ArrayEnsemble
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="K mundos pequenos avançados juntos (Monte Carlo)")
+    parser.add_argument("--worlds", type=int, default=256,
+                        help="número de mundos no ensemble")
+    parser.add_argument("--size", type=int, default=20,
+                        help="tamanho da grade de cada mundo (lado)")
+    parser.add_argument("--prob1", type=float, default=0.15,
+                        help="probabilidade inicial da espécie 1 por célula")
+    parser.add_argument("--prob2", type=float, default=0.15,
+                        help="probabilidade inicial da espécie 2 por célula")
+    parser.add_argument("--ticks", type=int, default=200,
+                        help="ticks a simular")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="semente do ensemble")
+    parser.add_argument("--output", default=None,
+                        help="arquivo JSON com o resultado de cada mundo")
+    args = parser.parse_args(argv)
+    if args.prob1 + args.prob2 > 1:
+        parser.error("A soma das probabilidades das espécies não pode ser maior que 1.")
+    return args
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    ensemble = ArrayEnsemble(args.worlds, args.size, args.prob1, args.prob2, seed=args.seed)
+
+    start = time.perf_counter()
+    for _ in range(args.ticks):
+        ensemble.update()
+    seconds = time.perf_counter() - start
+
+    winners = np.bincount(ensemble.winners(), minlength=3)
+    print(f"{args.worlds} mundos {args.size}x{args.size}, {args.ticks} ticks em {seconds:.2f}s "
+          f"({args.worlds * args.ticks / seconds:.0f} mundo-ticks/s)")
+    print(f"vitórias: azul {winners[1]}, vermelho {winners[2]}, empate {winners[0]}")
+    for name, counts in (("seres azul", ensemble.species1_count),
+                         ("seres vermelho", ensemble.species2_count),
+                         ("construções azul", ensemble.construction1_count),
+                         ("construções vermelho", ensemble.construction2_count)):
+        print(f"{name}: média {counts.mean():.1f}, desvio {counts.std():.1f}, "
+              f"mín {counts.min()}, máx {counts.max()}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "seconds": seconds, "worlds": ensemble.outcomes()}, f)
+        print(f"Resultados salvos em {args.output}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
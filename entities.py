@@ -1,14 +1,16 @@
-from dataclasses import dataclass
-from enum import Enum
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum
 import random
 from typing import List, Tuple, Optional, Dict
 
-class EntityType(Enum):
+# Tipo e papel são IntEnum: guardados e comparados como inteiros pequenos,
+# e usados diretamente como índices nas camadas em matriz
+class EntityType(IntEnum):
     EMPTY = 0
     SPECIES1 = 1
     SPECIES2 = 2
 
-class EntityRole(Enum):
+class EntityRole(IntEnum):
     NORMAL = 0
     BUILDER = 1
     MINER = 2  # Novo papel
@@ -18,7 +20,20 @@ class ResourceType(Enum):
     ORE = "ore"
     MISC = "misc"
 
-@dataclass
+# Códigos numéricos dos recursos nas camadas em matriz (0 = sem recurso)
+RESOURCE_CODES = {
+    ResourceType.FOOD: 1,
+    ResourceType.ORE: 2,
+    ResourceType.MISC: 3
+}
+ORE_CODE = RESOURCE_CODES[ResourceType.ORE]
+MISC_CODE = RESOURCE_CODES[ResourceType.MISC]
+
+# Fatores de energia e força por código de recurso (mesmos valores de Resource)
+RESOURCE_ENERGY = (0.0, 1.0, 3.0, 0.5)
+RESOURCE_STRENGTH = (0.0, 0.0, 2.0, 0.5)
+
+@dataclass(slots=True)
 class Resource:
     type: ResourceType
     amount: int
@@ -26,12 +41,12 @@ class Resource:
     strength_factor: float
 
     @staticmethod
-    def create_random(resource_type: ResourceType) -> Optional['Resource']:
+    def create_random(resource_type: ResourceType, rng=random) -> Optional['Resource']:
         if resource_type == ResourceType.ORE:  # Minério não gera aleatoriamente
             return None
         
-        if random.random() < 0.1:
-            amount = random.randint(1, 3)
+        if rng.random() < 0.1:
+            amount = rng.randint(1, 3)
             if resource_type == ResourceType.FOOD:
                 return Resource(resource_type, amount, 1.0, 0.0)
             elif resource_type == ResourceType.MISC:
@@ -42,22 +57,31 @@ class Resource:
     def create_ore(amount: int = 3) -> 'Resource':
         return Resource(ResourceType.ORE, amount, 3.0, 2.0)  # Minério dá mais energia e força
 
-@dataclass
+@dataclass(slots=True)
 class Construction:
     owner_type: EntityType
     position: Tuple[int, int]
     energy: float = 100.0
     max_occupants: int = 10
-    occupants: List['Entity'] = None
+    # Conjunto ordenado (dicionário sem valores): pertinência, entrada e saída
+    # em O(1), mantendo a ordem de chegada
+    occupants: Dict['Entity', None] = None
     last_reproduction: int = 0
-    
+    id: int = -1  # Atribuído pelo ConstructionRegistry
+    special: int = field(default=0, init=False)  # Ocupantes construtores/mineradores
+
     def __post_init__(self):
-        if self.occupants is None:
-            self.occupants = []
-    
+        self.occupants = dict.fromkeys(self.occupants or ())
+        self.special = sum(1 for o in self.occupants if o.role != EntityRole.NORMAL)
+
+    def is_full(self) -> bool:
+        return len(self.occupants) >= self.max_occupants
+
     def add_occupant(self, entity: 'Entity') -> bool:
         if len(self.occupants) < self.max_occupants:
-            self.occupants.append(entity)
+            self.occupants[entity] = None
+            if entity.role != EntityRole.NORMAL:
+                self.special += 1
             entity.is_sheltered = True
             entity.current_construction = self
             return True
@@ -66,9 +90,11 @@ class Construction:
     def remove_occupant(self, entity: 'Entity'):
         if entity in self.occupants:
             # Não remover construtores/mineradores se estiver sob ataque
-            if entity.role != EntityRole.NORMAL and len(self.occupants) <= 2:
-                return
-            self.occupants.remove(entity)
+            if entity.role != EntityRole.NORMAL:
+                if len(self.occupants) <= 2:
+                    return
+                self.special -= 1
+            del self.occupants[entity]
             entity.is_sheltered = False
             entity.current_construction = None
     
@@ -79,71 +105,100 @@ class Construction:
         self.energy -= amount
         if self.energy <= 0:
             # Expulsar todos os ocupantes
-            for entity in self.occupants[:]:
+            for entity in list(self.occupants):
                 self.remove_occupant(entity)
         return self.energy <= 0
-    
-    def try_reproduce(self) -> Optional['Entity']:
-        if len(self.occupants) >= 2:  # Precisa de pelo menos 2 seres
-            if len(self.occupants) >= self.max_occupants:
-                # Se estiver lotado, liberar apenas seres normais para formar exército
-                normal_occupants = [o for o in self.occupants if o.role == EntityRole.NORMAL]
-                special_occupants = [o for o in self.occupants if o.role != EntityRole.NORMAL]
-                
-                if len(normal_occupants) >= 8:
-                    army = normal_occupants[:8]  # Pegar 8 seres normais
-                    # Manter especiais e 2 normais para reprodução
-                    self.occupants = special_occupants + normal_occupants[8:]
-                    
-                    for soldier in army:
-                        self.remove_occupant(soldier)
-                    print(f"Exército de 8 guerreiros formado da construção em {self.position}")
-                    return army
-            
-            elif self.last_reproduction >= 2:
-                parent1, parent2 = random.sample(self.occupants, 2)
-                avg_energy = (parent1.energy + parent2.energy) * 0.5
-                avg_strength = (parent1.strength + parent2.strength) * 0.5
-                
-                child = Entity(self.owner_type, avg_energy * 1.2, avg_strength * 1.2)
-                
-                if self.add_occupant(child):
-                    parent1.energy *= 0.9
-                    parent2.energy *= 0.9
-                    self.last_reproduction = 0
-                    print(f"Novo ser gerado na construção em {self.position}. Total: {len(self.occupants)}")
-                
-        return None
+
+    def release_army(self, count: int = 8) -> List['Entity']:
+        """
+        Lotada, libera até `count` seres normais (os que chegaram primeiro)
+        para formar exército; especiais e os demais normais ficam
+        """
+        if not self.is_full() or len(self.occupants) - self.special < 8:
+            return []
+        army = []
+        for occupant in self.occupants:
+            if len(army) == count:
+                break
+            if occupant.role == EntityRole.NORMAL:
+                army.append(occupant)
+        for soldier in army:
+            self.remove_occupant(soldier)
+        return army
+
+    def try_reproduce(self, rng=random) -> Optional['Entity']:
+        """Com 2 ou mais ocupantes e vaga, gera um filho a cada 2 ticks; devolve o filho"""
+        if len(self.occupants) < 2 or self.is_full() or self.last_reproduction < 2:
+            return None
+        parent1, parent2 = rng.sample(list(self.occupants), 2)
+        avg_energy = (parent1.energy + parent2.energy) * 0.5
+        avg_strength = (parent1.strength + parent2.strength) * 0.5
+
+        child = Entity(self.owner_type, avg_energy * 1.2, avg_strength * 1.2, rng)
+        self.add_occupant(child)
+        parent1.energy *= 0.9
+        parent2.energy *= 0.9
+        self.last_reproduction = 0
+        return child
     
     def update(self):
         self.last_reproduction += 1
 
 class Entity:
-    def __init__(self, entity_type: EntityType, initial_energy: float = 2.0, initial_strength: float = 1.0):
+    # Sem __dict__: centenas de milhares de instâncias em mapas grandes
+    __slots__ = ("type", "energy", "strength", "age", "mutations", "last_reproduction", "position",
+                 "role", "ore", "misc", "is_sheltered", "current_construction")
+
+    def __init__(self, entity_type: EntityType, initial_energy: float = 2.0, initial_strength: float = 1.0,
+                 rng=random):
         self.type = entity_type
         self.energy = initial_energy
         self.strength = initial_strength
         self.age = 0
-        self.mutations = []
+        self.mutations: Tuple[str, ...] = ()  # Tupla vazia compartilhada até a primeira mutação
         self.last_reproduction = 0
         self.position: Optional[Tuple[int, int]] = None
         
         # Sistema de roles com probabilidades aumentadas
-        role_chance = random.random()
+        role_chance = rng.random()
         if role_chance < 0.16:  # 16% chance de ser construtor
             self.role = EntityRole.BUILDER
         elif role_chance < 0.32:  # 16% chance de ser minerador
             self.role = EntityRole.MINER
         else:
             self.role = EntityRole.NORMAL
-            
-        self.inventory: Dict[ResourceType, int] = {
-            ResourceType.ORE: 0,
-            ResourceType.MISC: 0
-        }
+        
+        # Inventário: um campo inteiro por recurso guardado
+        self.ore = 0
+        self.misc = 0
         self.is_sheltered = False
         self.current_construction = None
 
+    @classmethod
+    def restore(cls, entity_type: EntityType, role: EntityRole, energy: float, strength: float,
+                age: int, last_reproduction: int, ore: int, misc: int, is_sheltered: bool,
+                position: Optional[Tuple[int, int]]) -> 'Entity':
+        """Entidade com um estado gravado, sem sortear o papel (usado por checkpoint.py)"""
+        entity = cls.__new__(cls)
+        entity.type = entity_type
+        entity.role = role
+        entity.energy = energy
+        entity.strength = strength
+        entity.age = age
+        entity.last_reproduction = last_reproduction
+        entity.ore = ore
+        entity.misc = misc
+        entity.is_sheltered = is_sheltered
+        entity.position = position
+        entity.mutations = ()
+        entity.current_construction = None
+        return entity
+
+    @property
+    def inventory(self) -> Dict[ResourceType, int]:
+        """Cópia do inventário no formato de dicionário"""
+        return {ResourceType.ORE: self.ore, ResourceType.MISC: self.misc}
+
     def get_power(self) -> float:
         base_power = self.energy + (self.strength * 2)
         if self.is_sheltered:
@@ -152,16 +207,16 @@ class Entity:
 
     def can_build(self) -> bool:
         return (self.role == EntityRole.BUILDER and 
-                self.inventory[ResourceType.ORE] >= 1 and 
-                self.inventory[ResourceType.MISC] >= 2)
+                self.ore >= 1 and 
+                self.misc >= 2)
 
     def build_construction(self, position: Tuple[int, int]) -> Optional[Construction]:
         if not self.can_build():
             return None
         
         # Consumir recursos
-        self.inventory[ResourceType.ORE] -= 1
-        self.inventory[ResourceType.MISC] -= 2
+        self.ore -= 1
+        self.misc -= 2
         
         # Criar construção
         construction = Construction(self.type, position)
@@ -175,11 +230,10 @@ class Entity:
         if (builder.role == EntityRole.BUILDER and 
             self.type == builder.type):  # Mesmo time
             # Transferir todos os recursos
-            for resource_type in [ResourceType.ORE, ResourceType.MISC]:
-                amount = self.inventory[resource_type]
-                if amount > 0:
-                    builder.inventory[resource_type] += amount
-                    self.inventory[resource_type] = 0
+            builder.ore += self.ore
+            builder.misc += self.misc
+            self.ore = 0
+            self.misc = 0
             return True
         return False
 
@@ -187,16 +241,30 @@ class Entity:
         if resource.type == ResourceType.ORE and not self.can_mine():
             return  # Apenas mineradores podem coletar minério
             
-        if resource.type in [ResourceType.ORE, ResourceType.MISC]:
-            self.inventory[resource.type] += resource.amount
+        if resource.type == ResourceType.ORE:
+            self.ore += resource.amount
+        elif resource.type == ResourceType.MISC:
+            self.misc += resource.amount
         self.energy += resource.amount * resource.energy_factor
         self.strength += resource.amount * resource.strength_factor
 
+    def consume(self, code: int, amount: int) -> None:
+        """Como consume_resource, para recursos guardados como código e quantidade"""
+        if code == ORE_CODE:
+            if not self.can_mine():
+                return
+            self.ore += amount
+        elif code == MISC_CODE:
+            self.misc += amount
+        self.energy += amount * RESOURCE_ENERGY[code]
+        self.strength += amount * RESOURCE_STRENGTH[code]
+
     def transfer_resources(self, other: 'Entity', resource_type: ResourceType, amount: int) -> bool:
+        slot = "ore" if resource_type == ResourceType.ORE else "misc"
         if (self.type == other.type and  # Mesmo time
-            self.inventory[resource_type] >= amount):
-            self.inventory[resource_type] -= amount
-            other.inventory[resource_type] += amount
+            getattr(self, slot) >= amount):
+            setattr(self, slot, getattr(self, slot) - amount)
+            setattr(other, slot, getattr(other, slot) + amount)
             return True
         return False
 
@@ -205,14 +273,14 @@ class Entity:
                 self.age > 1 and  # Reduzido de 2 para 1 (reprodução mais cedo)
                 self.age - self.last_reproduction > 1)
 
-    def reproduce(self) -> 'Entity':
-        child = Entity(self.type, self.energy * 0.4, self.strength)
+    def reproduce(self, rng=random) -> 'Entity':
+        child = Entity(self.type, self.energy * 0.4, self.strength, rng)
         self.energy *= 0.6
         self.last_reproduction = self.age
         
-        if random.random() < 0.15:
-            mutation = random.choice(['energy+', 'strength+', 'efficiency+'])
-            child.mutations = self.mutations + [mutation]
+        if rng.random() < 0.15:
+            mutation = rng.choice(['energy+', 'strength+', 'efficiency+'])
+            child.mutations = self.mutations + (mutation,)
             if mutation == 'energy+':
                 child.energy *= 1.2
             elif mutation == 'strength+':
@@ -0,0 +1,199 @@
+import json
+import sys
+from enum import IntEnum
+from typing import List, Optional
+import numpy as np
+
+class EventKind(IntEnum):
+    CONSTRUCTION_ATTACKED = 1
+    DEFENDERS_DEPLOYED = 2
+    DEFENDER_PLACED = 3
+    CONSTRUCTION_DESTROYED = 4
+    BIRTH = 5
+    DEATH = 6
+    ORE_MINED = 7
+    CONSTRUCTION_BUILT = 8
+    DEFENDER_RETURNED = 9
+    ARMY_FORMED = 10
+    CONSTRUCTION_BIRTH = 11
+    CONSTRUCTION_ARMY = 12
+
+# Registro de evento: tipo, tick, posição, time e um valor numérico
+# (dano, quantidade de defensores, tamanho do exército...)
+EVENT_DTYPE = np.dtype([
+    ("kind", np.uint8),
+    ("tick", np.uint32),
+    ("x", np.int32),
+    ("y", np.int32),
+    ("team", np.int8),
+    ("payload", np.float32),
+])
+
+TEAM_NAMES = {1: "Time Azul", 2: "Time Vermelho"}
+
+# Mensagens no formato dos antigos print() da simulação
+MESSAGES = {
+    EventKind.CONSTRUCTION_ATTACKED: "Construção atacada na posição ({x}, {y})",
+    EventKind.DEFENDERS_DEPLOYED: "{payload:.0f} defensores saindo para proteger a construção!",
+    EventKind.DEFENDER_PLACED: "Defensor posicionado em ({x}, {y})",
+    EventKind.CONSTRUCTION_DESTROYED: "Construção destruída na posição ({x}, {y})",
+    EventKind.BIRTH: "Reprodução ocorreu na posição ({x}, {y})",
+    EventKind.DEATH: "Morte na posição ({x}, {y})",
+    EventKind.ORE_MINED: "Minério minerado por {team_name} na posição ({x}, {y})",
+    EventKind.CONSTRUCTION_BUILT: "Nova construção do {team_name} na posição ({x}, {y})",
+    EventKind.DEFENDER_RETURNED: "Defensor retornou para a construção em ({x}, {y})",
+    EventKind.ARMY_FORMED: "Novo exército formado para o {team_name} com {payload:.0f} guerreiros",
+    EventKind.CONSTRUCTION_BIRTH: "Novo ser gerado na construção em ({x}, {y}). Total: {payload:.0f}",
+    EventKind.CONSTRUCTION_ARMY: "Exército de {payload:.0f} guerreiros formado da construção em ({x}, {y})",
+}
+
+
+def format_event(event) -> str:
+    team = int(event["team"])
+    return MESSAGES[EventKind(int(event["kind"]))].format(
+        x=int(event["x"]), y=int(event["y"]), team_name=TEAM_NAMES.get(team, "?"),
+        payload=float(event["payload"]))
+
+
+class DiscardSink:
+    """Descarta os eventos (útil para medir o custo de emissão)"""
+
+    def write(self, batch: np.ndarray) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class RingSink:
+    """
+    Mantém em memória apenas os últimos `capacity` eventos; com `stream`,
+    escreve-os como texto (ver TextSink) em close()
+    """
+
+    def __init__(self, capacity: int = 65536, stream=None):
+        self.buffer = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self.capacity = capacity
+        self.total = 0
+        self.stream = stream
+
+    def write(self, batch: np.ndarray) -> None:
+        if len(batch) >= self.capacity:
+            batch = batch[-self.capacity:]
+        start = self.total % self.capacity
+        first = min(len(batch), self.capacity - start)
+        self.buffer[start:start + first] = batch[:first]
+        self.buffer[:len(batch) - first] = batch[first:]
+        self.total += len(batch)
+
+    def events(self) -> np.ndarray:
+        """Eventos guardados, do mais antigo ao mais recente"""
+        if self.total <= self.capacity:
+            return self.buffer[:self.total].copy()
+        start = self.total % self.capacity
+        return np.concatenate([self.buffer[start:], self.buffer[:start]])
+
+    def close(self) -> None:
+        if self.stream is not None:
+            sink = TextSink(self.stream)
+            sink.write(self.events())
+            sink.close()
+
+
+class BinarySink:
+    """Grava os registros brutos (EVENT_DTYPE); leia com read_events()"""
+
+    def __init__(self, path: str):
+        self.file = open(path, "wb")
+
+    def write(self, batch: np.ndarray) -> None:
+        batch.tofile(self.file)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class JsonLinesSink:
+    """Um objeto JSON por linha, com o nome do tipo de evento"""
+
+    def __init__(self, path: str):
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write(self, batch: np.ndarray) -> None:
+        lines = []
+        for kind, tick, x, y, team, payload in batch.tolist():
+            lines.append(json.dumps({"kind": EventKind(kind).name, "tick": tick, "x": x, "y": y,
+                                     "team": team, "payload": payload}))
+        if lines:
+            self.file.write("\n".join(lines) + "\n")
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class TextSink:
+    """Mensagens legíveis, como os antigos print() (stdout por padrão)"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def write(self, batch: np.ndarray) -> None:
+        for event in batch:
+            self.stream.write(format_event(event) + "\n")
+
+    def close(self) -> None:
+        self.stream.flush()
+
+
+def read_events(path: str) -> np.ndarray:
+    return np.fromfile(path, dtype=EVENT_DTYPE)
+
+
+class EventBus:
+    """
+    Fluxo de eventos da simulação. emit() escreve num buffer pré-alocado, que é
+    entregue em lote aos sinks quando enche ou em flush(). Com eventos
+    desativados o World guarda None no lugar do barramento e não paga nada.
+    """
+
+    def __init__(self, sinks: Optional[List] = None, capacity: int = 4096):
+        self.sinks = sinks if sinks is not None else []
+        self.buffer = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self.size = 0
+        self.tick = 0
+        self.emitted = 0  # Total de eventos emitidos desde a criação
+
+    def emit(self, kind: EventKind, x: int, y: int, team: int = 0, payload: float = 0.0) -> None:
+        if self.size == len(self.buffer):
+            self.flush()
+        self.buffer[self.size] = (kind, self.tick, x, y, team, payload)
+        self.size += 1
+        self.emitted += 1
+
+    def flush(self) -> None:
+        if self.size:
+            batch = self.buffer[:self.size]
+            for sink in self.sinks:
+                sink.write(batch)
+            self.size = 0
+
+    def close(self) -> None:
+        self.flush()
+        for sink in self.sinks:
+            sink.close()
+
+
+def open_sink(spec: str):
+    """
+    Cria um sink a partir da linha de comando: none, ring (últimos eventos no
+    stdout ao final), text ou um arquivo (.jsonl ou binário)
+    """
+    if spec == "none":
+        return DiscardSink()
+    if spec == "ring":
+        return RingSink(stream=sys.stdout)
+    if spec == "text":
+        return TextSink()
+    if spec.endswith(".jsonl"):
+        return JsonLinesSink(spec)
+    return BinarySink(spec)
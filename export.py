@@ -0,0 +1,112 @@
+import os
+import shutil
+import struct
+import subprocess
+import zlib
+from typing import Optional
+import numpy as np
+from rendering import compose_indexed, compose_rgba
+
+# Exportação de quadros sem matplotlib: o quadro vem de compose_rgba (mesmas
+# cores do Visualizer) e é gravado como PNG por um codificador mínimo (zlib da
+# biblioteca padrão) ou enviado cru a um codificador de vídeo local (ffmpeg).
+# Como no Visualizer (origin="lower"), a linha 0 do mapa fica embaixo. Os
+# rótulos de ocupantes das construções não são desenhados.
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+VIDEO_EXTENSIONS = (".mp4", ".mkv", ".webm", ".avi", ".mov", ".gif")
+
+
+def png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def encode_png(pixels: np.ndarray, palette: Optional[np.ndarray] = None, level: int = 1) -> bytes:
+    """
+    PNG de 8 bits sem filtros: RGBA a partir de (altura, largura, 4) uint8 ou,
+    com `palette` (N x 4), em cores indexadas a partir de (altura, largura)
+    """
+    height, width = pixels.shape[:2]
+    rows = pixels.reshape(height, -1)
+    raw = np.zeros((height, 1 + rows.shape[1]), dtype=np.uint8)  # Byte de filtro 0 por linha
+    raw[:, 1:] = rows
+    color_type = 6 if palette is None else 3
+    chunks = [png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0))]
+    if palette is not None:
+        chunks.append(png_chunk(b"PLTE", np.ascontiguousarray(palette[:, :3]).tobytes()))
+    chunks.append(png_chunk(b"IDAT", zlib.compress(raw, level)))
+    chunks.append(png_chunk(b"IEND", b""))
+    return PNG_SIGNATURE + b"".join(chunks)
+
+
+def enlarge(image: np.ndarray, scale: int) -> np.ndarray:
+    """Cada célula vira um bloco scale x scale de pixels"""
+    if scale == 1:
+        return image
+    return image.repeat(scale, axis=0).repeat(scale, axis=1)
+
+
+class FrameExporter:
+    """
+    Grava um quadro a cada `every` chamadas de export(): numa pasta, como
+    frame_000123.png (o número é o tick), ou num vídeo se `path` terminar
+    com uma extensão de vídeo. `scale` amplia cada célula para scale x scale
+    pixels. Chame close() ao terminar (fecha o codificador de vídeo).
+    """
+
+    def __init__(self, path: str, size: int, every: int = 1, scale: int = 1, fps: int = 30):
+        self.path = path
+        self.every = max(1, every)
+        self.scale = max(1, scale)
+        self.calls = 0
+        self.frames = 0
+        # Buffers reaproveitados entre quadros
+        self.frame = np.empty((size, size, 4), dtype=np.uint8)
+        self.indices = np.empty((size, size), dtype=np.uint8)
+        pixels = size * self.scale
+
+        self.encoder: Optional[subprocess.Popen] = None
+        if path.lower().endswith(VIDEO_EXTENSIONS):
+            ffmpeg = shutil.which("ffmpeg")
+            if ffmpeg is None:
+                raise RuntimeError("Exportar vídeo requer o ffmpeg no PATH; use uma pasta para gravar PNGs.")
+            self.encoder = subprocess.Popen(
+                [ffmpeg, "-loglevel", "error", "-y", "-f", "rawvideo", "-pix_fmt", "rgba",
+                 "-s", f"{pixels}x{pixels}", "-r", str(fps), "-i", "-",
+                 "-pix_fmt", "yuv420p", "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", path],
+                stdin=subprocess.PIPE)
+        else:
+            os.makedirs(path, exist_ok=True)
+
+    def render(self, world) -> np.ndarray:
+        """Quadro RGBA do mundo na orientação da imagem, já ampliado"""
+        return enlarge(compose_rgba(world.layers(), out=self.frame)[::-1], self.scale)
+
+    def encode(self, world) -> bytes:
+        """PNG do quadro; em cores indexadas (1 byte por pixel) sempre que a paleta couber"""
+        layers = world.layers()
+        indexed = compose_indexed(layers, out=self.indices)
+        if indexed is None:
+            return encode_png(enlarge(compose_rgba(layers, out=self.frame)[::-1], self.scale))
+        indices, palette = indexed
+        return encode_png(enlarge(indices[::-1], self.scale), palette)
+
+    def export(self, world) -> bool:
+        """Grava o quadro se for a vez dele; devolve se gravou"""
+        self.calls += 1
+        if (self.calls - 1) % self.every:
+            return False
+        if self.encoder is not None:
+            self.encoder.stdin.write(np.ascontiguousarray(self.render(world)).tobytes())
+        else:
+            with open(os.path.join(self.path, f"frame_{world.tick:06d}.png"), "wb") as f:
+                f.write(self.encode(world))
+        self.frames += 1
+        return True
+
+    def close(self) -> None:
+        if self.encoder is not None:
+            self.encoder.stdin.close()
+            if self.encoder.wait() != 0:
+                raise RuntimeError(f"O ffmpeg terminou com erro ({self.encoder.returncode}) ao gravar {self.path}")
+            self.encoder = None
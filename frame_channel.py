@@ -0,0 +1,108 @@
+from multiprocessing import shared_memory
+from typing import Dict, Optional
+import numpy as np
+from recording import COUNTERS, LAYERS, world_counters, set_world_counters
+
+# Quadros da simulação para o renderizador em outro processo, por um buffer
+# triplo em memória compartilhada. Cada um dos três slots guarda os
+# contadores, o tick e as camadas de renderização (7 bytes por célula). O
+# simulador escreve sempre no slot "back" e o troca com o "ready"; o
+# renderizador troca o "ready" com o "front" e lê o "front". Só a troca de
+# índices acontece sob o lock, então nenhum lado espera o outro desenhar ou
+# calcular, e um quadro não lido é simplesmente sobrescrito pelo seguinte:
+# o renderizador sempre pega o mais recente e os antigos são descartados.
+BACK, READY, FRONT, FRESH = range(4)
+SLOTS = 3
+
+
+def aligned(nbytes: int) -> int:
+    return (nbytes + 7) // 8 * 8
+
+
+class LiveFrame:
+    """
+    Último quadro recebido: size, tick, layers() e os contadores com os nomes
+    do World, então pode ser passado ao Visualizer no lugar dele (como o Replay).
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.tick = -1
+        self.state = {name: np.zeros((size, size), dtype=dtype) for name, dtype in LAYERS}
+        set_world_counters(self, np.zeros(len(COUNTERS), dtype=np.int64))
+
+    def layers(self):
+        return dict(self.state)
+
+
+class FrameChannel:
+    """
+    Canal de quadros entre o processo da simulação (publish) e o do
+    renderizador (receive). Quem cria (`name` None) é o dono do segmento e o
+    remove em close(); o outro lado abre pelo nome, com o mesmo `lock`.
+    Quando publicar é decisão de quem chama (ver scheduler.Scheduler).
+    """
+
+    def __init__(self, size: int, lock, name: Optional[str] = None):
+        self.size = size
+        self.lock = lock
+        self.layout = [("counters", np.int64, (len(COUNTERS),)), ("tick", np.int64, (1,))]
+        self.layout += [(layer, dtype, (size, size)) for layer, dtype in LAYERS]
+        slot_bytes = sum(aligned(np.dtype(dtype).itemsize * int(np.prod(shape)))
+                         for _, dtype, shape in self.layout)
+        header_bytes = aligned(4 * np.dtype(np.int64).itemsize)
+
+        self.owner = name is None
+        if self.owner:
+            self.block = shared_memory.SharedMemory(create=True, size=header_bytes + SLOTS * slot_bytes)
+        else:
+            self.block = shared_memory.SharedMemory(name=name)
+        self.name = self.block.name
+        self.header = np.ndarray((4,), dtype=np.int64, buffer=self.block.buf)
+        if self.owner:
+            self.header[:] = (0, 1, 2, 0)
+        self.slots = [self.slot(header_bytes + k * slot_bytes) for k in range(SLOTS)]
+
+    def slot(self, offset: int) -> Dict[str, np.ndarray]:
+        arrays = {}
+        for field, dtype, shape in self.layout:
+            arrays[field] = np.ndarray(shape, dtype=dtype, buffer=self.block.buf, offset=offset)
+            offset += aligned(arrays[field].nbytes)
+        return arrays
+
+    def publish(self, world) -> None:
+        """Copia o estado do mundo para o slot livre e o torna o mais recente"""
+        back = self.slots[self.header[BACK]]  # Só este processo muda BACK
+        layers = world.layers()
+        for layer, _ in LAYERS:
+            back[layer][...] = layers[layer]
+        back["counters"][...] = world_counters(world)
+        back["tick"][0] = world.tick
+        with self.lock:
+            header = self.header
+            header[BACK], header[READY] = header[READY], header[BACK]
+            header[FRESH] = 1
+
+    def receive(self, frame: LiveFrame) -> bool:
+        """Passa o quadro mais recente para `frame`; False se não há quadro novo"""
+        with self.lock:
+            header = self.header
+            if not header[FRESH]:
+                return False
+            header[FRONT], header[READY] = header[READY], header[FRONT]
+            header[FRESH] = 0
+        # O simulador não escreve no FRONT até a próxima troca, feita por este processo;
+        # a cópia deixa o quadro válido depois de close()
+        front = self.slots[self.header[FRONT]]
+        for layer, _ in LAYERS:
+            frame.state[layer][...] = front[layer]
+        set_world_counters(frame, front["counters"])
+        frame.tick = int(front["tick"][0])
+        return True
+
+    def close(self) -> None:
+        self.header = None
+        self.slots = []
+        self.block.close()
+        if self.owner:
+            self.block.unlink()
@@ -0,0 +1,231 @@
+import numpy as np
+from typing import Optional
+from entities import EntityType, ResourceType
+from array_world import OFFSETS, RES_FOOD, RES_ORE, RES_MISC, neighbors, push
+
+# Regras do autômato celular original (antes do World), agora sem estado global
+INITIAL_ENERGY = 2
+ENERGY_GROWTH = 1
+ENERGY_THRESHOLD = 10
+ENERGY_COST = 1
+INITIAL_STRENGTH = 1
+
+FOOD_ENERGY_FACTOR = 2
+ORE_STRENGTH_FACTOR = 1
+MISC_ENERGY_FACTOR = 1
+
+SPECIES = (EntityType.SPECIES1.value, EntityType.SPECIES2.value)
+
+
+class LegacyAutomaton:
+    """
+    Autômato celular legado: vida de Conway com duas espécies, energia, força
+    e recursos. Cada fase é uma operação sobre a grade inteira (contagens e
+    somas de vizinhos por matrizes deslocadas), sem laços por célula.
+
+    A versão original atualizava a grade em varredura, então o resultado de
+    uma célula dependia das que vinham antes dela. Aqui as fases são
+    simultâneas: cada uma lê o estado do fim da fase anterior, e disputas
+    (duas células querendo o mesmo destino) são decididas por prioridade
+    aleatória. Mesma interface de contadores e layers() do World.
+    """
+
+    def __init__(self, size: int, prob_species1: float, prob_species2: float,
+                 seed: Optional[int] = None, p_move: float = 0.2):
+        if prob_species1 + prob_species2 > 1:
+            raise ValueError("A soma das probabilidades das espécies não pode ser maior que 1.")
+        self.size = size
+        self.p_move = p_move
+        self.rng = np.random.default_rng(seed)
+        self.tick = 0
+        shape = (size, size)
+
+        rand = self.rng.random(shape)
+        self.team = np.zeros(shape, dtype=np.int8)
+        self.team[rand < prob_species1] = EntityType.SPECIES1.value
+        self.team[(rand >= prob_species1) & (rand < prob_species1 + prob_species2)] = EntityType.SPECIES2.value
+        alive = self.team != 0
+        self.energy = np.where(alive, INITIAL_ENERGY, 0).astype(np.float32)
+        self.strength = np.where(alive, INITIAL_STRENGTH, 0).astype(np.float32)
+
+        self.food = np.zeros(shape, dtype=np.int8)
+        self.ore = np.zeros(shape, dtype=np.int8)
+        self.misc = np.zeros(shape, dtype=np.int8)
+        self.grow(np.ones(shape, dtype=bool), 0.1, 0.05, 0.05)
+
+        self.construction1_count = 0
+        self.construction2_count = 0
+        self.armies = {EntityType.SPECIES1: [], EntityType.SPECIES2: []}
+        self.count_entities()
+
+    def grow(self, cells: np.ndarray, p_food: float, p_ore: float, p_misc: float) -> None:
+        """Sorteia recursos nas células da máscara (o valor anterior é substituído)"""
+        for layer, p, high in ((self.food, p_food, 3), (self.ore, p_ore, 3), (self.misc, p_misc, 2)):
+            hit = cells & (self.rng.random(cells.shape) < p)
+            layer[hit] = self.rng.integers(1, high + 1, int(hit.sum()), dtype=np.int8)
+
+    def layers(self):
+        """Camadas de estado para renderização (ver rendering.py); sem construções"""
+        resource = np.select([self.food > 0, self.ore > 0, self.misc > 0],
+                             [RES_FOOD, RES_ORE, RES_MISC], 0).astype(np.int8)
+        empty = np.zeros(self.team.shape, dtype=np.int16)
+        return {
+            "team": self.team,
+            "resource": resource,
+            "construction": np.zeros(self.team.shape, dtype=np.int8),
+            "occupants": empty,
+            "capacity": empty,
+        }
+
+    def power(self) -> np.ndarray:
+        return self.energy + self.strength * 2
+
+    def same_species(self) -> np.ndarray:
+        """Vizinhos da mesma espécie de cada célula viva (8 x N x N)"""
+        return np.stack([(n == self.team) & (self.team != 0) for n in neighbors(self.team)])
+
+    def resolve(self, claims: np.ndarray) -> np.ndarray:
+        """
+        `claims[d]` marca as células que querem o vizinho na direção OFFSETS[d].
+        Retorna, por destino, a direção de onde veio o vencedor (-1 = ninguém),
+        pela maior prioridade aleatória entre os pretendentes.
+        """
+        priority = self.rng.random(self.team.shape, dtype=np.float32)
+        candidates = np.stack([np.where(push(claims[d], dx, dy), push(priority, dx, dy), -1.0)
+                               for d, (dx, dy) in enumerate(OFFSETS)])
+        winner = candidates.argmax(axis=0).astype(np.int8)
+        winner[candidates.max(axis=0) < 0] = -1
+        return winner
+
+    def pull(self, a: np.ndarray, winner: np.ndarray) -> np.ndarray:
+        """Valor de `a` na célula de onde veio o vencedor de cada destino"""
+        result = np.zeros_like(a)
+        for d, (dx, dy) in enumerate(OFFSETS):
+            arrived = winner == d
+            result[arrived] = push(a, dx, dy)[arrived]
+        return result
+
+    def choose(self, allowed: np.ndarray) -> np.ndarray:
+        """Uma direção aleatória entre as permitidas (8 x ...), como máscara de uma posição"""
+        keys = np.where(allowed, self.rng.random(allowed.shape, dtype=np.float32), -1.0)
+        direction = keys.argmax(axis=0)
+        return (np.arange(len(OFFSETS)).reshape(-1, 1, 1) == direction) & allowed
+
+    def update(self) -> None:
+        initial_energy = self.energy.copy()
+        self.consume()
+        self.combat()
+        self.life(initial_energy)
+        self.spread()
+        self.reproduce()
+        self.grow(self.team == 0, 0.05, 0.03, 0.03)
+        self.count_entities()
+        self.tick += 1
+
+    def consume(self) -> None:
+        """Células vivas consomem os recursos da própria célula e ganham energia"""
+        alive = self.team != 0
+        self.energy += np.where(alive, self.food * FOOD_ENERGY_FACTOR + self.misc * MISC_ENERGY_FACTOR
+                                + ENERGY_GROWTH, 0)
+        self.strength += np.where(alive, self.ore * ORE_STRENGTH_FACTOR, 0)
+        for layer in (self.food, self.ore, self.misc):
+            layer[alive] = 0
+
+    def combat(self) -> None:
+        """
+        Uma célula é convertida pela espécie do vizinho inimigo mais forte se
+        ele tiver mais poder; em empate, perde quem tiver a menor prioridade
+        """
+        power = self.power()
+        key = self.rng.random(self.team.shape, dtype=np.float32)
+        alive = self.team != 0
+        enemy = np.stack([(n != 0) & (n != self.team) & alive for n in neighbors(self.team)])
+        power_n = np.stack(neighbors(power))
+        score = np.where(enemy, power_n, np.float32(-np.inf))
+        best = score.max(axis=0)
+        tie = (enemy & (power_n == power) & (np.stack(neighbors(key, -1.0)) > key)).any(axis=0)
+        converted = alive & ((best > power) | ((best == power) & tie))
+        if not converted.any():
+            return
+        # Valores do vizinho vencedor (o de maior poder)
+        winner = score.argmax(axis=0)[np.newaxis]
+        team = np.take_along_axis(np.stack(neighbors(self.team)), winner, axis=0)[0]
+        strength = np.take_along_axis(np.stack(neighbors(self.strength)), winner, axis=0)[0]
+        self.team[converted] = team[converted]
+        self.energy[converted] = np.maximum(best[converted] - ENERGY_COST, 0)
+        self.strength[converted] = strength[converted]
+
+    def life(self, initial_energy: np.ndarray) -> None:
+        """
+        Regra de Conway por espécie: morre com menos de 2 ou mais de 3 vizinhos
+        iguais (ou energia acima do limite); nasce onde há exatamente 3 de uma
+        espécie. Com 3 de cada, vence a espécie com mais energia no início do tick.
+        """
+        alive = self.team != 0
+        same = self.same_species().sum(axis=0)
+        dies = alive & ((same < 2) | (same > 3) | (self.energy > ENERGY_THRESHOLD))
+
+        team_n = neighbors(self.team)
+        counts = [sum((n == s).astype(np.int8) for n in team_n) for s in SPECIES]
+        sums = [sum(np.where(n == s, e, 0) for n, e in zip(team_n, neighbors(initial_energy)))
+                for s in SPECIES]
+        empty = ~alive
+        born1 = empty & (counts[0] == 3) & ((counts[1] != 3) | (sums[0] >= sums[1]))
+        born2 = empty & (counts[1] == 3) & ~born1
+
+        self.team[dies] = 0
+        self.energy[dies] = 0
+        self.strength[dies] = 0
+        for born, s in ((born1, SPECIES[0]), (born2, SPECIES[1])):
+            self.team[born] = s
+            self.energy[born] = INITIAL_ENERGY
+            self.strength[born] = INITIAL_STRENGTH
+
+    def spread(self) -> None:
+        """
+        Com probabilidade p_move uma célula se copia para um vizinho vazio (a
+        original continua no lugar), com a energia menos o custo
+        """
+        empty_n = np.stack(neighbors(self.team == 0, False))
+        movers = (self.team != 0) & (self.rng.random(self.team.shape) < self.p_move)
+        winner = self.resolve(self.choose(empty_n) & movers)
+        arrived = winner >= 0
+        self.team[arrived] = self.pull(self.team, winner)[arrived]
+        self.energy[arrived] = np.maximum(self.pull(self.energy, winner)[arrived] - ENERGY_COST, 0)
+        self.strength[arrived] = self.pull(self.strength, winner)[arrived]
+
+    def reproduce(self) -> None:
+        """
+        Células com 2 ou 3 vizinhos iguais: 55% geram um filho no primeiro
+        vizinho vazio, 5% nos dois primeiros, 10% matam um vizinho igual
+        """
+        same_n = self.same_species()
+        density = same_n.sum(axis=0)
+        active = (density == 2) | (density == 3)
+        roll = self.rng.random(self.team.shape)
+        children = np.where(active & (roll < 0.55), 1, np.where(active & (roll < 0.60), 2, 0))
+        kills = active & (roll >= 0.60) & (roll < 0.80) & (self.rng.random(self.team.shape) >= 0.5)
+
+        # Primeiros vizinhos vazios na ordem de OFFSETS
+        empty_n = np.stack(neighbors(self.team == 0, False))
+        claims = empty_n & (np.cumsum(empty_n, axis=0) <= children)
+        victim_dir = self.choose(same_n) & kills
+        victims = np.zeros(self.team.shape, dtype=bool)
+        for d, (dx, dy) in enumerate(OFFSETS):
+            victims |= push(victim_dir[d], dx, dy)
+
+        winner = self.resolve(claims)
+        born = winner >= 0
+        self.team[born] = self.pull(self.team, winner)[born]
+        self.energy[born] = INITIAL_ENERGY
+        self.strength[born] = INITIAL_STRENGTH
+        self.team[victims] = 0
+        self.energy[victims] = 0
+        self.strength[victims] = 0
+
+    def count_entities(self) -> None:
+        self.species1_count = int((self.team == EntityType.SPECIES1.value).sum())
+        self.species2_count = int((self.team == EntityType.SPECIES2.value).sum())
+        # Sem inventário por time: minério e misc ficam no mapa
+        self.resources1 = {ResourceType.ORE: 0, ResourceType.MISC: 0}
+        self.resources2 = {ResourceType.ORE: 0, ResourceType.MISC: 0}
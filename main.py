@@ -1,349 +1,301 @@
-import numpy as np
-import random
-import time
-import os
-import matplotlib.pyplot as plt
-from matplotlib import colors
-import tkinter as tk
-from world import World
-from visualization import Visualizer
-from config import get_config
-
-
-def get_config():
-    config = {}
-    def submit():
+import argparse
+import multiprocessing
+import sys
+from multiprocessing import resource_tracker
+from world import create_world, ENGINES
+from events import EventBus, open_sink
+from profiling import PhaseProfiler
+from checkpoint import save_world, load_world
+from recording import Recorder
+from frame_channel import FrameChannel, LiveFrame
+from export import FrameExporter
+from stats import StatsCollector
+from scheduler import RunControl, Scheduler
+
+# Configuração padrão (mesmos valores da janela de configuração)
+DEFAULT_CONFIG = {
+    "grid_size": 20,
+    "prob_species1": 0.15,
+    "prob_species2": 0.15,
+    "delay": 0.5,
+    "p_move": 0.2,
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Simulador de vida com dois times")
+    parser.add_argument("--size", type=int, default=DEFAULT_CONFIG["grid_size"],
+                        help="tamanho da grade (lado)")
+    parser.add_argument("--prob1", type=float, default=DEFAULT_CONFIG["prob_species1"],
+                        help="probabilidade inicial da espécie 1 por célula")
+    parser.add_argument("--prob2", type=float, default=DEFAULT_CONFIG["prob_species2"],
+                        help="probabilidade inicial da espécie 2 por célula")
+    parser.add_argument("--ticks", type=int, default=100,
+                        help="número de ticks a simular (0 = sem limite)")
+    parser.add_argument("--until-tick", type=int, default=None,
+                        help="parar quando o mundo chegar a este tick (conta também os de um checkpoint)")
+    parser.add_argument("--until-extinct", action="store_true",
+                        help="parar quando um dos times não tiver mais seres")
+    parser.add_argument("--tick-rate", type=float, default=None,
+                        help="ticks por segundo alvo (0 = sem limite; padrão: sem limite, "
+                             "ou 1/--delay com --render)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="semente para reproduzir a simulação")
+    parser.add_argument("--engine", choices=ENGINES, default="object",
+                        help="motor de simulação (legacy é o autômato celular original)")
+    parser.add_argument("--render", action="store_true",
+                        help="abrir o visualizador (matplotlib)")
+    parser.add_argument("--delay", type=float, default=DEFAULT_CONFIG["delay"],
+                        help="com --render e sem --tick-rate, segundos por tick")
+    parser.add_argument("--render-every", type=int, default=0,
+                        help="desenhar um quadro a cada N ticks (0 = seguir --fps)")
+    parser.add_argument("--fps", type=float, default=30,
+                        help="quadros por segundo no máximo na janela (0 = um por tick)")
+    parser.add_argument("--paused", action="store_true",
+                        help="abrir a janela com a simulação pausada "
+                             "(espaço pausa/continua, n avança um tick)")
+    parser.add_argument("--config-dialog", action="store_true",
+                        help="ler a configuração pela janela Tk")
+    parser.add_argument("--events", default="none",
+                        help="destino dos eventos: none, text (stdout), ring (os últimos 65536 "
+                             "no stdout ao final) ou um arquivo (.jsonl para JSON lines, outro "
+                             "nome para binário)")
+    parser.add_argument("--report-every", type=int, default=0,
+                        help="imprimir os contadores a cada N ticks (0 = só no final)")
+    parser.add_argument("--checkpoint", default=None,
+                        help="gravar o estado do mundo neste arquivo ao terminar")
+    parser.add_argument("--checkpoint-every", type=int, default=0,
+                        help="gravar o checkpoint também a cada N ticks")
+    parser.add_argument("--resume", default=None,
+                        help="continuar a simulação a partir de um checkpoint")
+    parser.add_argument("--record", default=None,
+                        help="gravar a trajetória neste arquivo (reproduza com replay.py)")
+    parser.add_argument("--keyframe-every", type=int, default=100,
+                        help="ticks entre quadros completos na gravação")
+    parser.add_argument("--export", default=None,
+                        help="gravar quadros sem matplotlib: numa pasta (PNGs) ou num vídeo "
+                             "(.mp4, .webm...; requer ffmpeg)")
+    parser.add_argument("--export-every", type=int, default=1,
+                        help="exportar um quadro a cada N ticks")
+    parser.add_argument("--export-scale", type=int, default=1,
+                        help="pixels por célula nos quadros exportados")
+    parser.add_argument("--export-fps", type=int, default=30,
+                        help="quadros por segundo do vídeo exportado")
+    parser.add_argument("--stats", default=None,
+                        help="gravar séries por tick (população, papéis, histogramas, construções, "
+                             "exércitos, recursos, nascimentos e mortes) neste arquivo .npz")
+    parser.add_argument("--stats-every", type=int, default=100,
+                        help="gravar as estatísticas também a cada N ticks (0 = só no fim)")
+    parser.add_argument("--profile", action="store_true",
+                        help="medir cada fase do World.update e imprimir o resumo no final")
+    parser.add_argument("--profile-csv", default=None,
+                        help="gravar as medições por tick e fase neste arquivo CSV")
+    args = parser.parse_args(argv)
+
+    if args.config_dialog:
+        from config import get_config
+        config = get_config()
+        args.size = config["grid_size"]
+        args.prob1 = config["prob_species1"]
+        args.prob2 = config["prob_species2"]
+        args.delay = config["delay"]
+    if args.prob1 + args.prob2 > 1:
+        parser.error("A soma das probabilidades das espécies não pode ser maior que 1.")
+    if (args.profile or args.profile_csv) and args.engine != "object":
+        parser.error("A medição por fase só existe no motor object.")
+    if (args.checkpoint or args.resume) and args.engine != "object":
+        parser.error("Checkpoints só existem no motor object.")
+    if args.keyframe_every < 1:
+        parser.error("--keyframe-every precisa ser ao menos 1.")
+    if args.paused and not args.render:
+        parser.error("--paused só faz sentido com --render.")
+    if args.tick_rate is None:
+        args.tick_rate = 1 / args.delay if args.render and args.delay > 0 else 0
+    return args
+
+
+def report(world, tick: int) -> None:
+    print(f"tick {tick}: "
+          f"azul {world.species1_count} seres/{world.construction1_count} construções, "
+          f"vermelho {world.species2_count} seres/{world.construction2_count} construções")
+
+
+def open_world(args):
+    """Cria o mundo (ou retoma um checkpoint) com eventos e medição pedidos"""
+    if args.resume:
+        world = load_world(args.resume)
+    else:
+        world = create_world(args.size, args.prob1, args.prob2, engine=args.engine, seed=args.seed)
+    if args.events != "none":
+        world.events = EventBus([open_sink(args.events)])
+    if args.profile or args.profile_csv:
+        world.profiler = PhaseProfiler()
+    return world
+
+
+def make_scheduler(args, control=None) -> Scheduler:
+    return Scheduler(tick_rate=args.tick_rate, render_every=args.render_every, fps=args.fps,
+                     max_ticks=args.ticks, until_tick=args.until_tick,
+                     until_extinct=args.until_extinct, control=control)
+
+
+def simulate(args, world, channel=None, control=None) -> None:
+    """
+    Loop principal e saídas finais. Com `channel` (FrameChannel) publica os
+    quadros para o renderizador quando o Scheduler manda; `control`
+    (RunControl) pausa, avança passo a passo ou encerra antes do fim.
+    """
+    scheduler = make_scheduler(args, control)
+    recorder = collector = exporter = None
+    tick = 0
+    try:
+        if args.record:
+            recorder = Recorder(args.record, world.size, args.keyframe_every)
+            recorder.record(world)
+        if args.stats:
+            collector = StatsCollector(args.stats, capacity=args.ticks + 1 if args.ticks else 1024,
+                                       flush_every=args.stats_every)
+            collector.record(world)
+        if args.export:
+            exporter = FrameExporter(args.export, world.size, args.export_every, args.export_scale,
+                                     args.export_fps)
+            exporter.export(world)
+        if channel is not None:
+            channel.publish(world)
+
+        while not scheduler.done(world):
+            if not scheduler.wait():
+                break
+            world.update()
+            tick += 1
+            if recorder is not None:
+                recorder.record(world)
+            if collector is not None:
+                collector.record(world)
+            if exporter is not None:
+                exporter.export(world)
+            if channel is not None and scheduler.frame_due(world):
+                channel.publish(world)
+            if args.report_every and tick % args.report_every == 0:
+                report(world, tick)
+            if args.checkpoint and args.checkpoint_every and tick % args.checkpoint_every == 0:
+                save_world(world, args.checkpoint)
+
+        if channel is not None:
+            channel.publish(world)  # O último quadro sempre chega
+        if not args.report_every or tick % args.report_every:
+            report(world, tick)
+        if args.checkpoint:
+            save_world(world, args.checkpoint)
+    finally:
+        # Também numa falha ou Ctrl+C: a gravação e o vídeo são finalizados, os
+        # eventos descarregados e a série até o último tick completo não se perde
+        if recorder is not None:
+            recorder.close()
+        if exporter is not None:
+            exporter.close()
+        if collector is not None:
+            collector.close()
+        if hasattr(world, "close"):
+            world.close()
+        if getattr(world, "events", None) is not None:
+            world.events.close()
+    if args.profile:
+        print(world.profiler.format_table())
+    if args.profile_csv:
+        world.profiler.write_csv(args.profile_csv, per_tick=True)
+
+
+def simulation_process(args, lock, control, conn) -> None:
+    """
+    Processo da simulação: cria o mundo, informa o canal de quadros e, depois
+    que a janela confirma que abriu o canal, roda o loop
+    """
+    world = open_world(args)
+    channel = FrameChannel(world.size, lock)
+    try:
+        conn.send((channel.name, world.size))
+        # Sem a confirmação, uma execução curta poderia remover o segmento
+        # antes de a janela abri-lo
         try:
-            config["grid_size"] = int(entry_grid.get())
-            config["prob_species1"] = float(entry_prob1.get())
-            config["prob_species2"] = float(entry_prob2.get())
-            config["delay"] = float(entry_delay.get())
-            config["p_move"] = float(entry_pmove.get())
-        except ValueError:
-            config["grid_size"] = 20
-            config["prob_species1"] = 0.15
-            config["prob_species2"] = 0.15
-            config["delay"] = 0.5
-            config["p_move"] = 0.2
-        root.destroy()
-    root = tk.Tk()
-    root.title("Configurações do Simulador")
-    tk.Label(root, text="Tamanho da Grade:").grid(row=0, column=0, padx=5, pady=5)
-    entry_grid = tk.Entry(root)
-    entry_grid.insert(0, "20")
-    entry_grid.grid(row=0, column=1, padx=5, pady=5)
-    tk.Label(root, text="Probabilidade de Espécie 1 (0 a 1):").grid(row=1, column=0, padx=5, pady=5)
-    entry_prob1 = tk.Entry(root)
-    entry_prob1.insert(0, "0.15")
-    entry_prob1.grid(row=1, column=1, padx=5, pady=5)
-    tk.Label(root, text="Probabilidade de Espécie 2 (0 a 1):").grid(row=2, column=0, padx=5, pady=5)
-    entry_prob2 = tk.Entry(root)
-    entry_prob2.insert(0, "0.15")
-    entry_prob2.grid(row=2, column=1, padx=5, pady=5)
-    tk.Label(root, text="Intervalo de Atualização (s):").grid(row=3, column=0, padx=5, pady=5)
-    entry_delay = tk.Entry(root)
-    entry_delay.insert(0, "0.5")
-    entry_delay.grid(row=3, column=1, padx=5, pady=5)
-    tk.Label(root, text="Probabilidade de Movimento (0 a 1):").grid(row=4, column=0, padx=5, pady=5)
-    entry_pmove = tk.Entry(root)
-    entry_pmove.insert(0, "0.2")
-    entry_pmove.grid(row=4, column=1, padx=5, pady=5)
-    submit_button = tk.Button(root, text="Iniciar Simulação", command=submit)
-    submit_button.grid(row=5, column=0, columnspan=2, padx=5, pady=10)
-    root.mainloop()
-    return config
-
-config = get_config()
-GRID_SIZE = config["grid_size"]
-prob_species1 = config["prob_species1"]
-prob_species2 = config["prob_species2"]
-DELAY = config["delay"]
-p_move = config["p_move"]
-
-if prob_species1 + prob_species2 > 1:
-    raise ValueError("A soma das probabilidades das espécies não pode ser maior que 1.")
-
-
-initial_energy   = 2      
-energy_growth    = 1      
-energy_threshold = 10     
-energy_cost      = 1      
-initial_strength = 1      
-
-
-food_energy_factor = 2   
-ore_strength_factor = 1  
-misc_energy_factor = 1   
-
-
-energia = np.zeros((GRID_SIZE, GRID_SIZE))
-forca   = np.zeros((GRID_SIZE, GRID_SIZE))
-
-
-
-food = np.zeros((GRID_SIZE, GRID_SIZE))
-ore  = np.zeros((GRID_SIZE, GRID_SIZE))
-misc = np.zeros((GRID_SIZE, GRID_SIZE))
-
-for i in range(GRID_SIZE):
-    for j in range(GRID_SIZE):
-        if random.random() < 0.1:  
-            food[i, j] = random.randint(1, 3)
-        if random.random() < 0.05: 
-            ore[i, j] = random.randint(1, 3)
-        if random.random() < 0.05: 
-            misc[i, j] = random.randint(1, 2)
-
-
-def criar_mundo():
-    
-    p_empty = 1 - (prob_species1 + prob_species2)
-    mundo = np.random.choice([0, 1, 2],
-                             GRID_SIZE * GRID_SIZE,
-                             p=[p_empty, prob_species1, prob_species2]).reshape(GRID_SIZE, GRID_SIZE)
-    
-    for i in range(GRID_SIZE):
-        for j in range(GRID_SIZE):
-            if mundo[i, j] != 0:
-                energia[i, j] = initial_energy
-                forca[i, j] = initial_strength
-    return mundo
-
-
-def obter_vizinhos(i, j):
-    vizinhos = [
-        (i-1, j-1), (i-1, j), (i-1, j+1),
-        (i, j-1),           (i, j+1),
-        (i+1, j-1), (i+1, j), (i+1, j+1)
-    ]
-    return [(x, y) for (x, y) in vizinhos if 0 <= x < GRID_SIZE and 0 <= y < GRID_SIZE]
-
-def contar_vizinhos_por_especie(mundo, i, j, especie):
-    count = 0
-    for (x, y) in obter_vizinhos(i, j):
-        if mundo[x, y] == especie:
-            count += 1
-    return count
-
-def soma_energia_vizinhos(mundo, energia, i, j, especie):
-    total = 0
-    for (x, y) in obter_vizinhos(i, j):
-        if mundo[x, y] == especie:
-            total += energia[x, y]
-    return total
-
-def soma_forca_vizinhos(mundo, forca, i, j, especie):
-    total = 0
-    for (x, y) in obter_vizinhos(i, j):
-        if mundo[x, y] == especie:
-            total += forca[x, y]
-    return total
-
-
-def atualizar_mundo(mundo):
-    global energia, forca, food, ore, misc
-    novo_mundo = np.copy(mundo)
-    nova_energia = np.copy(energia)
-    nova_forca = np.copy(forca)
-    
-    
-    for i in range(GRID_SIZE):
-        for j in range(GRID_SIZE):
-            if novo_mundo[i, j] != 0:
-                
-                if food[i, j] > 0:
-                    nova_energia[i, j] += food[i, j] * food_energy_factor
-                    food[i, j] = 0
-                
-                if ore[i, j] > 0:
-                    nova_forca[i, j] += ore[i, j] * ore_strength_factor
-                    ore[i, j] = 0
-                
-                if misc[i, j] > 0:
-                    nova_energia[i, j] += misc[i, j] * misc_energy_factor
-                    misc[i, j] = 0
-                
-                nova_energia[i, j] += energy_growth
-
-    
-    
-    for i in range(GRID_SIZE):
-        for j in range(GRID_SIZE):
-            if novo_mundo[i, j] != 0:
-                especie = novo_mundo[i, j]
-                poder = nova_energia[i, j] + nova_forca[i, j] * 2
-                for (x, y) in obter_vizinhos(i, j):
-                    if novo_mundo[x, y] != 0 and novo_mundo[x, y] != especie:
-                        poder_inimigo = nova_energia[x, y] + nova_forca[x, y] * 2
-                        if poder > poder_inimigo:
-                            novo_mundo[x, y] = especie
-                            nova_energia[x, y] = max(poder - energy_cost, 0)
-                            nova_forca[x, y] = nova_forca[i, j]
-                        elif poder_inimigo > poder:
-                            novo_mundo[i, j] = novo_mundo[x, y]
-                            nova_energia[i, j] = max(poder_inimigo - energy_cost, 0)
-                            nova_forca[i, j] = nova_forca[x, y]
-                        else:
-                            if random.random() < 0.5:
-                                novo_mundo[x, y] = especie
-                                nova_energia[x, y] = max(poder - energy_cost, 0)
-                                nova_forca[x, y] = nova_forca[i, j]
-                            else:
-                                novo_mundo[i, j] = novo_mundo[x, y]
-                                nova_energia[i, j] = max(poder_inimigo - energy_cost, 0)
-                                nova_forca[i, j] = nova_forca[x, y]
+            attached = conn.recv()
+        except EOFError:
+            attached = False
+        finally:
+            conn.close()
+        if attached:
+            simulate(args, world, channel, control)
+    finally:
+        channel.close()
+
+
+def run_with_renderer(args) -> None:
+    """
+    Simulação num processo e janela neste: a simulação nunca espera o
+    desenho, e a janela desenha sempre o quadro mais recente (os que chegam
+    enquanto ela desenha são descartados). Na janela, espaço pausa/continua
+    e n avança um tick. Fechá-la encerra a simulação, que ainda grava
+    checkpoint e relatórios.
+    """
+    context = multiprocessing.get_context()
+    # O rastreador de recursos precisa existir antes do processo filho: assim os
+    # dois lados registram o segmento de quadros no mesmo rastreador, e a
+    # remoção feita pelo filho (o dono) vale para ambos
+    resource_tracker.ensure_running()
+    lock = context.Lock()
+    control = RunControl(context, paused=args.paused)
+    parent, child = context.Pipe()
+    process = context.Process(target=simulation_process, args=(args, lock, control, child))
+    process.start()
+    child.close()
+    try:
+        name, size = parent.recv()
+        channel = FrameChannel(size, lock, name)
+        parent.send(True)  # Canal aberto: a simulação pode começar
+    except EOFError:
+        process.join()
+        raise SystemExit(f"A simulação terminou antes do primeiro quadro (código {process.exitcode}).")
+    finally:
+        parent.close()
+
+    from visualization import Visualizer
+    frame = LiveFrame(size)
+    # O ritmo dos quadros é do Scheduler, no processo da simulação
+    visualizer = Visualizer(frame, 0)
+
+    def show_status() -> None:
+        visualizer.status = "pausado (espaço continua, n avança um tick)" if control.is_paused() else ""
+        visualizer.update()
 
-    
-    for i in range(GRID_SIZE):
-        for j in range(GRID_SIZE):
-            celula = novo_mundo[i, j]
-            if celula != 0:
-                same = contar_vizinhos_por_especie(novo_mundo, i, j, celula)
-                
-                if same < 2 or same > 3 or nova_energia[i, j] > energy_threshold:
-                    pass
-                    novo_mundo[i, j] = 0
-                    nova_energia[i, j] = 0
-                    nova_forca[i, j] = 0
+    def on_key(key: str) -> None:
+        if key == " ":
+            control.toggle_pause()
+            show_status()
+        elif key == "n":
+            control.step()
+
+    visualizer.on_key(on_key)
+    show_status()
+    try:
+        while visualizer.is_open():
+            if channel.receive(frame):
+                visualizer.update()
+            elif not process.is_alive():
+                break
             else:
-                count1 = contar_vizinhos_por_especie(novo_mundo, i, j, 1)
-                count2 = contar_vizinhos_por_especie(novo_mundo, i, j, 2)
-                if count1 == 3 and count2 != 3:
-                    novo_mundo[i, j] = 1
-                    nova_energia[i, j] = initial_energy
-                    nova_forca[i, j] = initial_strength
-                elif count2 == 3 and count1 != 3:
-                    novo_mundo[i, j] = 2
-                    nova_energia[i, j] = initial_energy
-                    nova_forca[i, j] = initial_strength
-                elif count1 == 3 and count2 == 3:
-                    total_energy_1 = soma_energia_vizinhos(novo_mundo, energia, i, j, 1)
-                    total_energy_2 = soma_energia_vizinhos(novo_mundo, energia, i, j, 2)
-                    if total_energy_1 >= total_energy_2:
-                        novo_mundo[i, j] = 1
-                        nova_energia[i, j] = initial_energy
-                        nova_forca[i, j] = initial_strength
-                    else:
-                        novo_mundo[i, j] = 2
-                        nova_energia[i, j] = initial_energy
-                        nova_forca[i, j] = initial_strength
-
-    
-    indices = [(i, j) for i in range(GRID_SIZE) for j in range(GRID_SIZE)]
-    random.shuffle(indices)
-    for (i, j) in indices:
-        if novo_mundo[i, j] != 0:
-            vizinhos = obter_vizinhos(i, j)
-            empty_neighbors = [(x, y) for (x, y) in vizinhos if novo_mundo[x, y] == 0]
-            if empty_neighbors and random.random() < p_move:
-                new_i, new_j = random.choice(empty_neighbors)
-                novo_mundo[new_i, new_j] = novo_mundo[i, j]
-                nova_energia[new_i, new_j] = max(nova_energia[i, j] - energy_cost, 0)
-                nova_forca[new_i, new_j] = nova_forca[i, j]
-                #novo_mundo[i, j] = 0
-                #nova_energia[i, j] = 0
-                #nova_forca[i, j] = 0
-
-    
-    
-    processed = set()
-    for i in range(GRID_SIZE):
-        for j in range(GRID_SIZE):
-            if novo_mundo[i, j] != 0:
-                especie = novo_mundo[i, j]
-                
-                same_neighbors = [(x, y) for (x, y) in obter_vizinhos(i, j) if novo_mundo[x, y] == especie]
-                local_density = len(same_neighbors)
-                
-                
-                if local_density >= 4:
-                    if random.random() < 0.15:  
-                        pass
-                        #novo_mundo[i, j] = 0
-                        #nova_energia[i, j] = 0
-                        #nova_forca[i, j] = 0
-                
-                elif local_density in [2, 3]:
-                    r = random.random()
-                    if r < 0.55:
-                        
-                        for (a, b) in obter_vizinhos(i, j):
-                            if novo_mundo[a, b] == 0:
-                                novo_mundo[a, b] = especie
-                                nova_energia[a, b] = initial_energy
-                                nova_forca[a, b] = initial_strength
-                                break
-                    elif r < 0.60:
-                        
-                        filhos_criados = 0
-                        for (a, b) in obter_vizinhos(i, j):
-                            if novo_mundo[a, b] == 0:
-                                novo_mundo[a, b] = especie
-                                nova_energia[a, b] = initial_energy
-                                nova_forca[a, b] = initial_strength
-                                filhos_criados += 1
-                                if filhos_criados == 2:
-                                    break
-                    elif r < 0.80:
-                        
-                        if random.random() < 0.5:
-                            pass
-                            #novo_mundo[i, j] = 0
-                            #nova_energia[i, j] = 0
-                            #nova_forca[i, j] = 0
-                        else:
-                            if same_neighbors:
-                                x, y = random.choice(same_neighbors)
-                                novo_mundo[x, y] = 0
-                                nova_energia[x, y] = 0
-                                nova_forca[x, y] = 0
-                    else:
-                        
-                        pass
-                        processed.add((i, j, x, y))
-    
-    
-    for i in range(GRID_SIZE):
-        for j in range(GRID_SIZE):
-            if novo_mundo[i, j] == 0:
-                if random.random() < 0.05:
-                    food[i, j] = random.randint(1, 3)
-                if random.random() < 0.03:
-                    ore[i, j] = random.randint(1, 3)
-                if random.random() < 0.03:
-                    misc[i, j] = random.randint(1, 2)
-    
-    energia = nova_energia
-    forca = nova_forca
-    return novo_mundo
+                visualizer.wait(0.01)
+    finally:
+        control.stop()
+        process.join()
+        channel.close()
 
 
-def exibir_mundo_visualmente(mundo):
-    plt.cla()
-    cmap = colors.ListedColormap(["white", "blue", "red"])
-    plt.imshow(mundo, cmap=cmap, interpolation="nearest")
-    plt.title("Simulador de Vida - Ambiente com Recursos")
-    plt.pause(DELAY)
-
-
-def main():
-    # Obter configurações
-    config = get_config()
-    
-    # Criar mundo
-    world = World(
-        size=config["grid_size"],
-        prob_species1=config["prob_species1"],
-        prob_species2=config["prob_species2"]
-    )
-    
-    # Criar visualizador
-    visualizer = Visualizer(world, config["delay"])
-    
-    # Loop principal
-    while plt.get_fignums():
-        world.update()
-        visualizer.update()
+def main(argv=None):
+    args = parse_args(argv)
+    if args.render:
+        run_with_renderer(args)
+    else:
+        simulate(args, open_world(args))
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:])
@@ -0,0 +1,288 @@
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+# Classes de alvo com campo de distância próprio
+ATTACK = "attack"    # Construções inimigas
+SHELTER = "shelter"  # Construções aliadas com espaço
+ENEMY = "enemy"      # Entidades inimigas (usado pelos exércitos)
+
+UNREACHED = 1 << 30
+FIELD_RADIUS = 20  # Alcance dos campos de construções (o dobro do raio de busca de alvos)
+BLOCK_SHIFT = 5    # Blocos de 32 x 32 células no índice das janelas de um campo
+
+Window = Tuple[int, int, int, int]  # x0, y0, x1, y1 (fim exclusivo)
+
+
+def distance_field(sources: np.ndarray, blocked: np.ndarray, offsets: np.ndarray,
+                   max_distance: int, needed: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    BFS multi-fonte em frentes numa janela: distância em passos até a fonte
+    mais próxima. `blocked` é a janela já com a borda de 1 célula bloqueada
+    (nenhum vizinho cai fora dela), `sources` e `needed` são índices planos
+    nela e `offsets` os deslocamentos planos dos vizinhos. Com `needed` a
+    busca para quando todas essas células foram alcançadas (as demais ficam
+    UNREACHED): o custo é o da região entre elas e as fontes.
+    """
+    blocked = blocked.ravel()
+    dist = np.full(blocked.shape, UNREACHED, dtype=np.int64)
+    dist[sources] = 0
+    # Sem np.unique (ordena a frente inteira): cada célula repetida fica com o
+    # último índice escrito e só essa ocorrência segue na frente
+    claim = np.empty(blocked.shape, dtype=np.int64)
+    frontier = sources
+    step = 0
+    while frontier.size and step < max_distance:
+        if needed is not None:
+            needed = needed[dist[needed] == UNREACHED]
+            if not needed.size:
+                break
+        step += 1
+        candidates = (frontier[:, None] + offsets).ravel()
+        candidates = candidates[(dist[candidates] == UNREACHED) & ~blocked[candidates]]
+        order = np.arange(len(candidates))
+        claim[candidates] = order
+        frontier = candidates[claim[candidates] == order]
+        dist[frontier] = step
+    return dist
+
+
+def merge_windows(boxes: np.ndarray) -> List[Window]:
+    """
+    Une os retângulos (n, 4) que se sobrepõem até sobrarem janelas disjuntas;
+    cada retângulo dado fica inteiro dentro de uma delas
+    """
+    rest = boxes
+    merged = np.empty((0, 4), dtype=np.int64)
+    while len(rest):
+        box, rest = rest[0].copy(), rest[1:]
+        while True:
+            overlap = ((rest[:, 0] < box[2]) & (rest[:, 2] > box[0]) &
+                       (rest[:, 1] < box[3]) & (rest[:, 3] > box[1]))
+            overlap_done = ((merged[:, 0] < box[2]) & (merged[:, 2] > box[0]) &
+                            (merged[:, 1] < box[3]) & (merged[:, 3] > box[1]))
+            if not overlap.any() and not overlap_done.any():
+                break
+            group = np.concatenate([rest[overlap], merged[overlap_done], box[None]])
+            box = np.concatenate([group[:, :2].min(axis=0), group[:, 2:].max(axis=0)])
+            rest, merged = rest[~overlap], merged[~overlap_done]
+        merged = np.concatenate([merged, box[None]])
+    return [tuple(window) for window in merged.tolist()]
+
+
+def inside(cells: np.ndarray, window: Window) -> np.ndarray:
+    """Máscara das células (n, 2) dentro da janela"""
+    x0, y0, x1, y1 = window
+    return (cells[:, 0] >= x0) & (cells[:, 0] < x1) & (cells[:, 1] >= y0) & (cells[:, 1] < y1)
+
+
+class WindowedField:
+    """
+    Campo de distâncias guardado só nas janelas calculadas (fora delas,
+    UNREACHED), com um índice de blocos 32 x 32 para achar a janela de
+    uma célula.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.blocks: Dict[Tuple[int, int], List[tuple]] = {}
+
+    def add(self, window: Window, values: List[int]) -> None:
+        """`values`: a janela com borda de 1 célula, em lista plana"""
+        x0, y0, x1, y1 = window
+        entry = (x0, y0, x1, y1, y1 - y0 + 2, values)
+        for bx in range(x0 >> BLOCK_SHIFT, ((x1 - 1) >> BLOCK_SHIFT) + 1):
+            for by in range(y0 >> BLOCK_SHIFT, ((y1 - 1) >> BLOCK_SHIFT) + 1):
+                self.blocks.setdefault((bx, by), []).append(entry)
+
+    def window(self, x: int, y: int) -> Optional[tuple]:
+        for entry in self.blocks.get((x >> BLOCK_SHIFT, y >> BLOCK_SHIFT), ()):
+            if entry[0] <= x < entry[2] and entry[1] <= y < entry[3]:
+                return entry
+        return None
+
+    def at(self, x: int, y: int) -> int:
+        entry = self.window(x, y)
+        if entry is None:
+            return UNREACHED
+        x0, y0, _, _, width, values = entry
+        return values[(x - x0 + 1) * width + y - y0 + 1]
+
+    def around(self, x: int, y: int, neighbors) -> Tuple[int, List[int]]:
+        """Distância da célula e dos vizinhos dados"""
+        entry = self.window(x, y)
+        if entry is not None:
+            x0, y0, x1, y1, width, values = entry
+            # Longe da borda da janela, os vizinhos estão nela: leitura direta
+            if x0 < x < x1 - 1 and y0 < y < y1 - 1:
+                base = (x - x0 + 1) * width + y - y0 + 1
+                return values[base], [values[base + (nx - x) * width + ny - y] for nx, ny in neighbors]
+        at = self.at
+        return at(x, y), [at(nx, ny) for nx, ny in neighbors]
+
+
+class SparseField(dict):
+    """Distâncias só das células calculadas, por índice plano (as demais, UNREACHED)"""
+
+    def __init__(self, size: int):
+        super().__init__()
+        self.size = size
+
+    def around(self, x: int, y: int, neighbors) -> Tuple[int, List[int]]:
+        """Distância da célula e dos vizinhos dados"""
+        size, get = self.size, self.get
+        return get(x * size + y, UNREACHED), [get(nx * size + ny, UNREACHED) for nx, ny in neighbors]
+
+
+class Navigator:
+    """
+    Camada de navegação do World: um campo de distância por (time, classe de alvo),
+    calculado no máximo uma vez por tick e compartilhado por todas as entidades
+    e exércitos do time, que apenas descem o gradiente. Os campos são
+    calculados em janelas em volta de quem os usa (fontes ou soldados), então
+    o custo acompanha a população e não a área do mapa.
+    """
+
+    def __init__(self, world):
+        if world.topology.wrap:
+            raise ValueError("A navegação em janelas supõe bordas limitadas")
+        self.world = world
+        self.size = world.size
+        self.fields = {}
+        self.blocked_key = None
+        self.blocked_cells = np.empty((0, 2), dtype=np.int64)
+
+    def reset(self) -> None:
+        """Descarta os campos do tick anterior"""
+        self.fields = {}
+
+    def blocked(self) -> np.ndarray:
+        """Células (n, 2) das construções; refeito só quando o registro muda"""
+        constructions = self.world.constructions
+        key = (len(constructions), constructions.next_id)
+        if key != self.blocked_key:
+            self.blocked_key = key
+            self.blocked_cells = np.array(list(constructions.positions), dtype=np.int64).reshape(-1, 2)
+        return self.blocked_cells
+
+    def window_distances(self, window: Window, sources: np.ndarray, max_distance: int,
+                         needed: Optional[np.ndarray] = None) -> np.ndarray:
+        """BFS na janela a partir das fontes (n, 2) dentro dela; devolve a janela com borda, plana"""
+        x0, y0, x1, y1 = window
+        width = y1 - y0 + 2
+        blocked = np.ones((x1 - x0 + 2, width), dtype=bool)
+        blocked[1:-1, 1:-1] = False
+        cells = self.blocked()
+        cells = cells[inside(cells, window)]
+        blocked[cells[:, 0] - x0 + 1, cells[:, 1] - y0 + 1] = True
+        sources = sources[inside(sources, window)]
+        flat = (sources[:, 0] - x0 + 1) * width + sources[:, 1] - y0 + 1
+        if needed is not None:
+            needed = (needed[:, 0] - x0 + 1) * width + needed[:, 1] - y0 + 1
+        offsets = np.array([dx * width + dy for dx, dy in self.world.topology.offsets], dtype=np.int64)
+        return distance_field(flat, blocked, offsets, max_distance, needed)
+
+    def field(self, team, target: str):
+        """Campo do time para a classe de alvo: WindowedField ou, para ENEMY, SparseField das células lidas"""
+        key = (team, target)
+        dist = self.fields.get(key)
+        if dist is None:
+            sources = np.array(self.sources(team, target), dtype=np.int64).reshape(-1, 2)
+            if target == ENEMY:
+                dist = self.local_field(sources, self.soldier_boxes(team))
+            else:
+                # Nada a mais de FIELD_RADIUS passos de uma fonte sai do quadrado em volta dela
+                dist = WindowedField(self.size)
+                for window in merge_windows(self.boxes(sources, sources, FIELD_RADIUS)):
+                    # Lista Python: a leitura escalar por vizinho é mais barata que em NumPy
+                    dist.add(window, self.window_distances(window, sources, FIELD_RADIUS).tolist())
+            self.fields[key] = dist
+        return dist
+
+    def boxes(self, low: np.ndarray, high: np.ndarray, margin: int) -> np.ndarray:
+        """Retângulos [low - margin, high + margin] (pontos (n, 2), fim inclusivo), cortados no mapa"""
+        return np.concatenate([np.maximum(low - margin, 0),
+                               np.minimum(high + margin + 1, self.size)], axis=1)
+
+    def local_field(self, sources: np.ndarray, regions: np.ndarray) -> SparseField:
+        """
+        Distâncias só nas células dos retângulos `regions` (x0, y0, x1, y1, fim
+        inclusivo), calculadas em janelas de raio r em volta deles: um caminho
+        que sai da janela tem mais de r passos, então toda distância <= r achada
+        dentro dela é exata. As células que passam de r são refeitas com o raio
+        dobrado (no limite, o mapa inteiro).
+        """
+        size = self.size
+        result = SparseField(size)
+        if not len(regions):
+            return result
+        needed = np.unique(np.concatenate([
+            (np.arange(x0, x1 + 1)[:, None] * size + np.arange(y0, y1 + 1)).ravel()
+            for x0, y0, x1, y1 in regions.tolist()]))
+        low, high = regions[:, :2], regions[:, 2:]
+        radius = 8
+        while True:
+            final = radius >= size
+            cells = np.stack(np.divmod(needed, size), axis=1)
+            pending = []
+            for window in merge_windows(self.boxes(low, high, radius)):
+                mask = inside(cells, window)
+                if not mask.any():
+                    continue
+                x0, y0, _, y1 = window
+                dist = self.window_distances(window, sources, 2 * size, cells[mask])
+                dist = dist[(cells[mask, 0] - x0 + 1) * (y1 - y0 + 2) + cells[mask, 1] - y0 + 1]
+                exact = (dist <= radius) | final
+                result.update(zip(needed[mask][exact].tolist(), dist[exact].tolist()))
+                if not exact.all():
+                    pending.append(cells[mask][~exact])
+            if not pending:
+                return result
+            # As células que faltam, com um retângulo por janela de onde vieram
+            needed = np.concatenate([p[:, 0] * size + p[:, 1] for p in pending])
+            low = np.array([p.min(axis=0) for p in pending])
+            high = np.array([p.max(axis=0) for p in pending])
+            radius *= 2
+
+    def soldier_boxes(self, team) -> np.ndarray:
+        """
+        Células que step() pode ler para os soldados do time, como retângulos
+        (x0, y0, x1, y1, fim inclusivo): o campo ENEMY, de alcance igual ao
+        mapa, só precisa chegar até elas. Um soldado em m exércitos anda até m
+        passos no tick e lê os vizinhos de cada posição, então basta o
+        quadrado de raio m em volta dele.
+        """
+        memberships: Dict[int, int] = {}
+        soldiers = {}
+        for army in self.world.armies[team]:
+            for soldier in army:
+                if soldier.position:
+                    memberships[id(soldier)] = memberships.get(id(soldier), 0) + 1
+                    soldiers[id(soldier)] = soldier
+        boxes = [(x - m, y - m, x + m, y + m) for key, soldier in soldiers.items()
+                 for (x, y), m in [(soldier.position, memberships[key])]]
+        boxes = np.array(boxes, dtype=np.int64).reshape(-1, 4)
+        return np.concatenate([np.maximum(boxes[:, :2], 0), np.minimum(boxes[:, 2:], self.size - 1)], axis=1)
+
+    def sources(self, team, target: str) -> List[Tuple[int, int]]:
+        world = self.world
+        enemy = next(t for t in world.construction_index if t != team)
+        if target == ATTACK:
+            return list(world.construction_index[enemy])
+        if target == SHELTER:
+            return [c.position for c in world.constructions.team(team) if not c.is_full()]
+        if target == ENEMY:
+            return list(world.entity_index[enemy])
+        raise ValueError(f"Classe de alvo desconhecida: {target}")
+
+    def step(self, team, target: str, pos: Tuple[int, int]) -> Tuple[int, int]:
+        """Vizinho livre com a menor distância ao alvo; fica parado se nenhum melhora"""
+        grid = self.world.grid
+        x, y = pos
+        neighbors = self.world.topology.neighbors(x, y)
+        best, distances = self.field(team, target).around(x, y, neighbors)
+        best_pos = pos
+        for (nx, ny), d in zip(neighbors, distances):
+            # Distância 0 é a própria fonte: a entidade para ao lado dela
+            if 0 < d < best and grid[nx][ny] is None:
+                best, best_pos = d, (nx, ny)
+        return best_pos
@@ -0,0 +1,113 @@
+import csv
+import time
+from typing import Dict, List
+import numpy as np
+
+# Fases de World.update, na ordem em que rodam
+PHASES = (
+    "movement",        # Movimento, ataque a construções e consumo de recursos
+    "combat",          # Combate e reprodução
+    "resources",       # Regeneração de recursos
+    "build",           # Construção e defesa contra ameaças
+    "build_again",     # Segunda passada de construção
+    "shelter",         # Entrada em construções aliadas
+    "transfer",        # Mineradores entregam recursos aos construtores
+    "defenders",       # Defensores voltam às construções
+    "constructions",   # Manutenção, reprodução e exércitos das construções
+    "counting",        # Conferência dos contadores (check_counters)
+    "army_formation",  # Formação de exércitos
+    "army_update",     # Movimento dos exércitos
+)
+
+# Registro por (tick, fase): tempo de parede e contagens de itens
+PROFILE_DTYPE = np.dtype([
+    ("tick", np.uint32),
+    ("phase", np.uint8),       # Índice em PHASES
+    ("seconds", np.float64),
+    ("visited", np.int64),     # Entidades (ou células/soldados) percorridas
+    ("searched", np.int64),    # Buscas de alvo
+    ("events", np.int64),      # Eventos emitidos durante a fase
+])
+
+SUMMARY_FIELDS = ("phase", "ticks", "total_s", "mean_ms", "max_ms", "share",
+                  "visited", "searched", "events")
+
+
+class PhaseProfiler:
+    """
+    Cronômetro por fase do World.update. O World chama start() no início do
+    tick e lap() ao fim de cada fase; cada lap mede o tempo desde a marca
+    anterior. Sem profiler o World guarda None e não paga nada além de uma
+    comparação por fase.
+    """
+
+    def __init__(self):
+        self.records: List[tuple] = []
+        self.phase_ids = {phase: k for k, phase in enumerate(PHASES)}
+        self.tick = 0
+        self.last = 0.0
+        self.events = None
+        self.emitted = 0
+
+    def start(self, tick: int, events=None) -> None:
+        self.tick = tick
+        self.events = events
+        self.emitted = events.emitted if events is not None else 0
+        self.last = time.perf_counter()
+
+    def lap(self, phase: str, visited: int = 0, searched: int = 0) -> None:
+        now = time.perf_counter()
+        fired = 0
+        if self.events is not None:
+            fired = self.events.emitted - self.emitted
+            self.emitted = self.events.emitted
+        self.records.append((self.tick, self.phase_ids[phase], now - self.last, visited, searched, fired))
+        self.last = time.perf_counter()  # Não conta o próprio registro na fase seguinte
+
+    def to_array(self) -> np.ndarray:
+        return np.array(self.records, dtype=PROFILE_DTYPE)
+
+    def summary(self) -> List[Dict]:
+        """Uma linha por fase: tempo total, médio e máximo, fatia do tick e médias por tick"""
+        data = self.to_array()
+        total = data["seconds"].sum() or 1.0
+        rows = []
+        for k, phase in enumerate(PHASES):
+            rows_k = data[data["phase"] == k]
+            if not len(rows_k):
+                continue
+            seconds = rows_k["seconds"]
+            rows.append({
+                "phase": phase,
+                "ticks": len(rows_k),
+                "total_s": float(seconds.sum()),
+                "mean_ms": float(seconds.mean() * 1000),
+                "max_ms": float(seconds.max() * 1000),
+                "share": float(seconds.sum() / total),
+                "visited": float(rows_k["visited"].mean()),
+                "searched": float(rows_k["searched"].mean()),
+                "events": float(rows_k["events"].mean()),
+            })
+        return rows
+
+    def format_table(self) -> str:
+        lines = [f"{'fase':<15} {'ticks':>6} {'total(s)':>9} {'média(ms)':>10} {'máx(ms)':>9} "
+                 f"{'fatia':>6} {'visitados':>10} {'buscas':>8} {'eventos':>8}"]
+        for row in self.summary():
+            lines.append(f"{row['phase']:<15} {row['ticks']:>6} {row['total_s']:>9.3f} "
+                         f"{row['mean_ms']:>10.2f} {row['max_ms']:>9.2f} {row['share']:>6.1%} "
+                         f"{row['visited']:>10.0f} {row['searched']:>8.0f} {row['events']:>8.1f}")
+        return "\n".join(lines)
+
+    def write_csv(self, path: str, per_tick: bool = False) -> None:
+        """Resumo por fase ou, com `per_tick`, um registro por (tick, fase)"""
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            if per_tick:
+                writer.writerow(PROFILE_DTYPE.names)
+                for tick, phase, seconds, visited, searched, fired in self.records:
+                    writer.writerow((tick, PHASES[phase], seconds, visited, searched, fired))
+            else:
+                writer.writerow(SUMMARY_FIELDS)
+                for row in self.summary():
+                    writer.writerow(row[field] for field in SUMMARY_FIELDS)
@@ -0,0 +1,198 @@
+import json
+import struct
+import zlib
+from bisect import bisect_right
+from typing import Dict, List, Optional
+import numpy as np
+from entities import ResourceType
+
+# Gravação da trajetória a partir das camadas de renderização (World.layers() /
+# ArrayWorld.layers()), então funciona com os dois motores e alimenta o mesmo
+# compose_rgba/Visualizer na reprodução.
+#
+# Arquivo: MAGIC, cabeçalho JSON com tamanho prefixado e uma sequência de
+# registros, cada um com RECORD_HEADER (tipo, tick, bytes do conteúdo):
+#   keyframe  contadores + todas as camadas inteiras (zlib)
+#   delta     contadores + células alteradas desde o registro anterior (zlib):
+#             índices planos em diferenças e os valores de todas as camadas nelas
+# Um delta cresce com a atividade do tick, não com a área do mapa.
+
+MAGIC = b"LIFEREC1"
+RECORD_HEADER = struct.Struct("<BIQ")  # tipo, tick, bytes do conteúdo
+KEYFRAME = 1
+DELTA = 2
+
+LAYERS = (
+    ("team", np.int8),
+    ("resource", np.int8),
+    ("construction", np.int8),
+    ("occupants", np.int16),
+    ("capacity", np.int16),
+)
+
+# Contadores do título do Visualizer, na ordem gravada
+COUNTERS = ("species1_count", "construction1_count", "ore1", "misc1",
+            "species2_count", "construction2_count", "ore2", "misc2")
+
+
+def world_counters(world) -> np.ndarray:
+    return np.array([world.species1_count, world.construction1_count,
+                     world.resources1[ResourceType.ORE], world.resources1[ResourceType.MISC],
+                     world.species2_count, world.construction2_count,
+                     world.resources2[ResourceType.ORE], world.resources2[ResourceType.MISC]],
+                    dtype=np.int64)
+
+
+def set_world_counters(target, values: np.ndarray) -> None:
+    """Inverso de world_counters: escreve os contadores com os nomes do World em `target`"""
+    (target.species1_count, target.construction1_count, ore1, misc1,
+     target.species2_count, target.construction2_count, ore2, misc2) = values.tolist()
+    target.resources1 = {ResourceType.ORE: ore1, ResourceType.MISC: misc1}
+    target.resources2 = {ResourceType.ORE: ore2, ResourceType.MISC: misc2}
+
+
+class Recorder:
+    """
+    Grava um registro por chamada de record(): keyframe a cada `keyframe_every`
+    registros e, entre eles, apenas as células que mudaram. Guarda uma cópia
+    das camadas anteriores para comparar.
+    """
+
+    def __init__(self, path: str, size: int, keyframe_every: int = 100):
+        if keyframe_every < 1:
+            raise ValueError(f"keyframe_every precisa ser ao menos 1 (recebido {keyframe_every})")
+        self.file = open(path, "wb")
+        self.size = size
+        self.keyframe_every = keyframe_every
+        self.previous: Optional[Dict[str, np.ndarray]] = None
+        self.records = 0
+        header = json.dumps({"size": size, "keyframe_every": keyframe_every,
+                             "layers": [name for name, _ in LAYERS]}).encode("utf-8")
+        self.file.write(MAGIC + struct.pack("<I", len(header)) + header)
+
+    def record(self, world) -> None:
+        layers = world.layers()
+        current = {name: np.asarray(layers[name], dtype=dtype) for name, dtype in LAYERS}
+        counters = world_counters(world).tobytes()
+        if self.previous is None or self.records % self.keyframe_every == 0:
+            payload = zlib.compress(b"".join(current[name].tobytes() for name, _ in LAYERS), 1)
+            self.write(KEYFRAME, world.tick, counters + payload)
+        else:
+            changed = np.zeros(self.size * self.size, dtype=bool)
+            for name, _ in LAYERS:
+                changed |= (current[name] != self.previous[name]).ravel()
+            cells = np.flatnonzero(changed).astype(np.uint32)
+            # Índices como diferenças entre células alteradas: pequenos e repetitivos, comprimem bem
+            parts = [struct.pack("<I", len(cells)), np.diff(cells, prepend=np.uint32(0)).tobytes()]
+            parts += [current[name].ravel()[cells].tobytes() for name, _ in LAYERS]
+            self.write(DELTA, world.tick, counters + zlib.compress(b"".join(parts), 1))
+        # Cópia: as camadas do ArrayWorld são as próprias matrizes de estado
+        self.previous = {name: layer.copy() for name, layer in current.items()}
+        self.records += 1
+
+    def write(self, kind: int, tick: int, payload: bytes) -> None:
+        self.file.write(RECORD_HEADER.pack(kind, tick, len(payload)))
+        self.file.write(payload)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class Replay:
+    """
+    Reprodução de uma gravação sem rodar World.update. Expõe size, layers() e
+    os contadores com os mesmos nomes do World, então pode ser passado ao
+    Visualizer no lugar dele. seek() parte do keyframe mais próximo (ou do
+    estado atual, se estiver antes do tick pedido) e aplica os deltas.
+    """
+
+    def __init__(self, path: str):
+        self.file = open(path, "rb")
+        if self.file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} não é uma gravação da simulação")
+        (length,) = struct.unpack("<I", self.file.read(4))
+        header = json.loads(self.file.read(length).decode("utf-8"))
+        self.size = header["size"]
+        self.keyframe_every = header["keyframe_every"]
+
+        # Índice dos registros (tick, tipo, posição do conteúdo, bytes); um
+        # registro incompleto no fim (gravação interrompida) é ignorado
+        self.index: List[tuple] = []
+        end = self.file.seek(0, 2)
+        offset = len(MAGIC) + 4 + length
+        while offset + RECORD_HEADER.size <= end:
+            self.file.seek(offset)
+            kind, tick, nbytes = RECORD_HEADER.unpack(self.file.read(RECORD_HEADER.size))
+            start = offset + RECORD_HEADER.size
+            if start + nbytes > end:
+                break
+            self.index.append((tick, kind, start, nbytes))
+            offset = start + nbytes
+        if not self.index:
+            raise ValueError(f"{path} não contém registros")
+        self.ticks = [tick for tick, _, _, _ in self.index]
+        self.keyframes = [k for k, (_, kind, _, _) in enumerate(self.index) if kind == KEYFRAME]
+
+        self.state = {name: np.zeros((self.size, self.size), dtype=dtype) for name, dtype in LAYERS}
+        self.position = -1  # Registro aplicado por último
+        self.tick = self.ticks[0]
+        self.set_counters(np.zeros(len(COUNTERS), dtype=np.int64))
+        self.seek(self.ticks[0])
+
+    def set_counters(self, values: np.ndarray) -> None:
+        set_world_counters(self, values)
+
+    def read(self, k: int) -> bytes:
+        _, _, start, nbytes = self.index[k]
+        self.file.seek(start)
+        return self.file.read(nbytes)
+
+    def apply(self, k: int) -> None:
+        tick, kind, _, _ = self.index[k]
+        payload = self.read(k)
+        counters = np.frombuffer(payload, dtype=np.int64, count=len(COUNTERS))
+        body = payload[counters.nbytes:]
+        if kind == KEYFRAME:
+            data = zlib.decompress(body)
+            offset = 0
+            for name, dtype in LAYERS:
+                layer = self.state[name]
+                layer[...] = np.frombuffer(data, dtype=dtype, count=layer.size,
+                                           offset=offset).reshape(layer.shape)
+                offset += layer.nbytes
+        else:
+            body = zlib.decompress(body)
+            (count,) = struct.unpack_from("<I", body)
+            offset = 4
+            cells = np.cumsum(np.frombuffer(body, dtype=np.uint32, count=count, offset=offset),
+                              dtype=np.uint32)
+            offset += cells.nbytes
+            for name, dtype in LAYERS:
+                values = np.frombuffer(body, dtype=dtype, count=count, offset=offset)
+                self.state[name].ravel()[cells] = values
+                offset += values.nbytes
+        self.set_counters(counters)
+        self.position = k
+        self.tick = tick
+
+    def seek(self, tick: int) -> None:
+        """Vai para o último registro com tick <= `tick`"""
+        target = max(bisect_right(self.ticks, tick) - 1, 0)
+        keyframe = self.keyframes[bisect_right(self.keyframes, target) - 1]
+        # Continua do estado atual se ele estiver entre o keyframe e o alvo
+        start = self.position + 1 if keyframe <= self.position <= target else keyframe
+        for k in range(start, target + 1):
+            self.apply(k)
+
+    def step(self) -> bool:
+        """Avança um registro; False no fim da gravação"""
+        if self.position + 1 >= len(self.index):
+            return False
+        self.apply(self.position + 1)
+        return True
+
+    def layers(self):
+        return dict(self.state)
+
+    def close(self) -> None:
+        self.file.close()
@@ -0,0 +1,87 @@
+import numpy as np
+
+# Composição do quadro a partir das camadas de World.layers() / ArrayWorld.layers(),
+# sem depender do matplotlib. Camadas (matrizes size x size):
+#   team          0 = vazio, 1 = time azul, 2 = time vermelho
+#   resource      0 = nenhum, 1 = comida, 2 = minério, 3 = misc
+#   construction  0 = nenhuma, 1/2 = time dono
+#   occupants     ocupantes da construção
+#   capacity      capacidade da construção
+
+WHITE = np.array([255, 255, 255], dtype=np.float32)
+
+# Mesmo esquema de cores do Visualizer (nomes do matplotlib em RGB)
+ENTITY_COLORS = np.array([[255, 255, 255],   # white
+                          [0, 0, 255],       # blue
+                          [255, 0, 0]],      # red
+                         dtype=np.uint8)
+RESOURCE_COLORS = np.array([[255, 255, 255],  # nenhum
+                            [0, 128, 0],      # green
+                            [255, 215, 0],    # gold
+                            [128, 0, 128]],   # purple
+                           dtype=np.float32)
+RESOURCE_ALPHA = np.array([0.0, 0.3, 0.5, 0.3], dtype=np.float32)
+CONSTRUCTION_COLORS = np.array([[0, 0, 0],
+                                [0, 0, 0],        # black (time azul)
+                                [255, 192, 203]],  # pink (time vermelho)
+                               dtype=np.float32)
+
+# Recursos ficam sempre sobre o fundo branco: a mistura pode ser pré-calculada
+RESOURCE_RGB = WHITE * (1 - RESOURCE_ALPHA[:, None]) + RESOURCE_COLORS * RESOURCE_ALPHA[:, None]
+
+# Cor final (RGBA) de uma célula sem construção, pelo código team * 4 + resource;
+# vista como uint32, um quadro inteiro sai de uma única indexação
+CELL_RGBA = np.empty((len(ENTITY_COLORS), len(RESOURCE_RGB), 4), dtype=np.uint8)
+CELL_RGBA[..., :3] = (RESOURCE_RGB + 0.5).astype(np.uint8)  # Arredonda na conversão para uint8
+CELL_RGBA[1:, :, :3] = ENTITY_COLORS[1:, None]
+CELL_RGBA[..., 3] = 255
+CELL_RGBA32 = CELL_RGBA.reshape(-1, 4).view(np.uint32)[:, 0]
+
+
+def construction_cells(layers):
+    """Células com construção e sem entidade por cima, e a cor (float32) de cada uma"""
+    construction = layers["construction"]
+    cells = np.nonzero((construction > 0) & (layers["team"] == 0))
+    if not len(cells[0]):
+        return cells, None
+    # Opacidade de 0.3 (vazia) a 1.0 (lotada)
+    capacity = np.maximum(layers["capacity"][cells], 1)
+    alpha = (0.3 + 0.7 * layers["occupants"][cells] / capacity).astype(np.float32)[:, None]
+    rgb = RESOURCE_RGB[layers["resource"][cells]] * (1 - alpha) + CONSTRUCTION_COLORS[construction[cells]] * alpha
+    return cells, rgb
+
+
+def compose_rgba(layers, out: np.ndarray = None) -> np.ndarray:
+    """Compõe recursos, construções e entidades num único buffer RGBA (uint8)"""
+    team = layers["team"]
+    if out is None:
+        out = np.empty(team.shape + (4,), dtype=np.uint8)
+    out.view(np.uint32)[..., 0] = CELL_RGBA32[team.astype(np.intp) * len(RESOURCE_RGB) + layers["resource"]]
+    cells, rgb = construction_cells(layers)
+    if rgb is not None:
+        out[cells + (slice(0, 3),)] = rgb + 0.5
+    return out
+
+
+def compose_indexed(layers, out: np.ndarray = None):
+    """
+    O mesmo quadro de compose_rgba em cores indexadas: (índices uint8, paleta
+    RGBA). As primeiras entradas da paleta são CELL_RGBA; cada mistura de
+    construção presente no quadro ganha uma entrada depois delas. None se o
+    quadro tiver mais de 256 cores.
+    """
+    team = layers["team"]
+    if out is None:
+        out = np.empty(team.shape, dtype=np.uint8)
+    np.add(team * len(RESOURCE_RGB), layers["resource"], out=out, casting="unsafe")
+    palette = CELL_RGBA.reshape(-1, 4)
+    cells, rgb = construction_cells(layers)
+    if rgb is not None:
+        rgba = np.full((len(rgb), 4), 255, dtype=np.uint8)
+        rgba[:, :3] = rgb + 0.5
+        colors, inverse = np.unique(rgba.view(np.uint32)[:, 0], return_inverse=True)
+        if len(palette) + len(colors) > 256:
+            return None
+        out[cells] = len(palette) + inverse.ravel()
+        palette = np.concatenate([palette, colors.view(np.uint8).reshape(-1, 4)])
+    return out, palette
@@ -0,0 +1,49 @@
+import argparse
+import sys
+from recording import Replay
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Reproduz uma gravação da simulação")
+    parser.add_argument("recording", help="arquivo gravado com main.py --record")
+    parser.add_argument("--start", type=int, default=None,
+                        help="tick inicial (padrão: o primeiro gravado)")
+    parser.add_argument("--end", type=int, default=None,
+                        help="tick final (padrão: o último gravado)")
+    parser.add_argument("--delay", type=float, default=0.1,
+                        help="intervalo entre quadros (s)")
+    parser.add_argument("--export", default=None,
+                        help="em vez de abrir a janela, gravar os quadros numa pasta (PNGs) "
+                             "ou num vídeo (.mp4, .webm...; requer ffmpeg)")
+    parser.add_argument("--export-every", type=int, default=1,
+                        help="exportar um a cada N registros")
+    parser.add_argument("--export-scale", type=int, default=1,
+                        help="pixels por célula nos quadros exportados")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    replay = Replay(args.recording)
+    replay.seek(args.start if args.start is not None else replay.ticks[0])
+    end = args.end if args.end is not None else replay.ticks[-1]
+
+    if args.export:
+        from export import FrameExporter
+        exporter = FrameExporter(args.export, replay.size, args.export_every, args.export_scale)
+        exporter.export(replay)
+        while replay.tick < end and replay.step():
+            exporter.export(replay)
+        exporter.close()
+        replay.close()
+        return
+
+    from visualization import Visualizer
+    visualizer = Visualizer(replay, args.delay)
+    visualizer.update()
+    while replay.tick < end and visualizer.is_open() and replay.step():
+        visualizer.update()
+    replay.close()
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,69 @@
+from typing import List, MutableSequence, Optional, Sequence, TypeVar
+import numpy as np
+
+T = TypeVar("T")
+
+
+class RandomStream:
+    """
+    Fonte de aleatoriedade de um World: um numpy Generator semeável cujos
+    números são sorteados em blocos (uma chamada vetorizada por bloco) e
+    consumidos um a um pelas fases. Oferece a mesma interface usada do módulo
+    random (random, randint, choice, shuffle, sample), então pode ser passado
+    às entidades no lugar dele. Com a mesma semente, a sequência é idêntica.
+    """
+
+    def __init__(self, seed: Optional[int] = None, block: int = 8192):
+        self.generator = np.random.default_rng(seed)
+        self.block = block
+        self.refill()
+
+    def refill(self, count: int = 0) -> None:
+        # Estado do gerador antes do bloco: com ele e a posição, o fluxo pode ser restaurado
+        self.block_state = self.generator.bit_generator.state
+        self.buffer: List[float] = self.generator.random(max(count, self.block)).tolist()
+        self.pos = 0
+
+    def random(self) -> float:
+        if self.pos == len(self.buffer):
+            self.refill()
+        value = self.buffer[self.pos]
+        self.pos += 1
+        return value
+
+    def randint(self, a: int, b: int) -> int:
+        """Inteiro em [a, b], como random.randint"""
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq: Sequence[T]) -> T:
+        return seq[int(self.random() * len(seq))]
+
+    def shuffle(self, seq: MutableSequence) -> None:
+        for i in range(len(seq) - 1, 0, -1):
+            j = int(self.random() * (i + 1))
+            seq[i], seq[j] = seq[j], seq[i]
+
+    def sample(self, seq: Sequence[T], k: int) -> List[T]:
+        pool = list(seq)
+        for i in range(k):
+            j = i + int(self.random() * (len(pool) - i))
+            pool[i], pool[j] = pool[j], pool[i]
+        return pool[:k]
+
+    def uniform_array(self, count: int) -> np.ndarray:
+        """Sorteio vetorizado direto do gerador (para fases que operam em lote)"""
+        return self.generator.random(count)
+
+    def get_state(self):
+        return {
+            "block_state": self.block_state,
+            "block": len(self.buffer),
+            "pos": self.pos,
+            "state": self.generator.bit_generator.state  # Inclui sorteios de uniform_array
+        }
+
+    def set_state(self, state) -> None:
+        self.generator.bit_generator.state = state["block_state"]
+        self.refill(state["block"])
+        self.pos = state["pos"]
+        self.generator.bit_generator.state = state["state"]
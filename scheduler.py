@@ -0,0 +1,118 @@
+import multiprocessing
+import time
+from typing import Optional
+
+# Ritmo da simulação separado do ritmo dos quadros. Nada aqui acrescenta
+# espera fixa ao tick: sem ritmo alvo os ticks seguem um atrás do outro, e
+# com ritmo alvo só se espera o que falta até o horário do próximo tick (um
+# tick lento não é compensado com uma rajada depois). Os quadros saem a cada
+# N ticks ou no máximo `fps` por segundo, independente do ritmo dos ticks.
+
+
+class RunControl:
+    """
+    Pausa, passo a passo e parada compartilhados entre processos (a janela
+    comanda, a simulação obedece). Criado antes do processo da simulação.
+    """
+
+    def __init__(self, context=None, paused: bool = False):
+        context = context or multiprocessing.get_context()
+        self.resumed = context.Event()
+        self.stopped = context.Event()
+        self.steps = context.Semaphore(0)
+        if not paused:
+            self.resumed.set()
+
+    def is_paused(self) -> bool:
+        return not self.resumed.is_set()
+
+    def toggle_pause(self) -> None:
+        if self.resumed.is_set():
+            self.resumed.clear()
+        else:
+            self.resumed.set()
+
+    def step(self) -> None:
+        """Libera um tick enquanto pausado (fora da pausa não tem efeito)"""
+        if not self.resumed.is_set():
+            self.steps.release()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.resumed.set()  # Acorda quem estiver pausado
+
+
+class Scheduler:
+    """
+    Decide quando rodar o próximo tick, quando ele deve virar quadro e
+    quando parar:
+      tick_rate      ticks por segundo alvo (0 = sem limite)
+      render_every   publicar um quadro a cada N ticks; 0 usa `fps`
+      fps            quadros por segundo no máximo (0 = um por tick)
+      max_ticks      ticks a rodar nesta execução (0 = sem limite)
+      until_tick     parar ao chegar neste tick do mundo
+      until_extinct  parar quando um dos times não tiver mais seres
+    `control` (RunControl) acrescenta pausa, passo a passo e parada externa.
+    """
+
+    def __init__(self, tick_rate: float = 0, render_every: int = 0, fps: float = 0,
+                 max_ticks: int = 0, until_tick: Optional[int] = None, until_extinct: bool = False,
+                 control: Optional[RunControl] = None):
+        self.tick_interval = 1.0 / tick_rate if tick_rate > 0 else 0.0
+        self.render_every = render_every
+        self.frame_interval = 1.0 / fps if fps > 0 else 0.0
+        self.max_ticks = max_ticks
+        self.until_tick = until_tick
+        self.until_extinct = until_extinct
+        self.control = control
+        self.ticks = 0
+        self.stepping = False  # O último tick foi um passo pedido durante a pausa
+        self.next_tick = 0.0
+        self.last_frame = -float("inf")
+
+    def done(self, world) -> bool:
+        if self.control is not None and self.control.stopped.is_set():
+            return True
+        if self.max_ticks and self.ticks >= self.max_ticks:
+            return True
+        if self.until_tick is not None and world.tick >= self.until_tick:
+            return True
+        return self.until_extinct and (world.species1_count == 0 or world.species2_count == 0)
+
+    def wait(self) -> bool:
+        """Espera a vez do próximo tick (pausa e ritmo alvo); False se a execução foi parada"""
+        control = self.control
+        self.stepping = False
+        if control is not None:
+            while not control.resumed.is_set():
+                # Timeout curto: o passo chega pelo semáforo e a retomada pelo evento
+                if control.steps.acquire(timeout=0.05):
+                    self.stepping = True
+                    break
+            if control.stopped.is_set():
+                return False
+
+        if self.tick_interval and not self.stepping:
+            now = time.perf_counter()
+            if now < self.next_tick:
+                if control is not None:
+                    if control.stopped.wait(self.next_tick - now):
+                        return False
+                else:
+                    time.sleep(self.next_tick - now)
+                now = self.next_tick
+            self.next_tick = now + self.tick_interval
+        self.ticks += 1
+        return True
+
+    def frame_due(self, world) -> bool:
+        """Se o estado atual deve virar quadro (um passo durante a pausa sempre vira)"""
+        if self.stepping:
+            return True
+        if self.render_every:
+            return world.tick % self.render_every == 0
+        now = time.perf_counter()
+        if now - self.last_frame < self.frame_interval:
+            return False
+        self.last_frame = now
+        return True
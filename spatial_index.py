@@ -0,0 +1,116 @@
+import heapq
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import numpy as np
+
+Position = Tuple[int, int]
+
+
+class SpatialIndex:
+    """
+    Índice espacial em baldes: o mapa é dividido em blocos de `bucket` x `bucket`
+    células e cada bloco guarda o conjunto de posições ocupadas nele. Consultas
+    por raio visitam apenas os blocos que cruzam a vizinhança pedida.
+    """
+
+    def __init__(self, size: int, bucket: int = 8):
+        self.size = size
+        self.bucket = bucket
+        self.num_buckets = (size + bucket - 1) // bucket
+        self.buckets: Dict[Position, Set[Position]] = {}
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, pos: Position) -> bool:
+        cell = self.buckets.get((pos[0] // self.bucket, pos[1] // self.bucket))
+        return cell is not None and pos in cell
+
+    def __iter__(self) -> Iterator[Position]:
+        return chain.from_iterable(self.buckets.values())
+
+    def add(self, pos: Position) -> None:
+        key = (pos[0] // self.bucket, pos[1] // self.bucket)
+        cell = self.buckets.get(key)
+        if cell is None:
+            cell = self.buckets[key] = set()
+        if pos not in cell:
+            cell.add(pos)
+            self.count += 1
+
+    def extend(self, positions: np.ndarray) -> None:
+        """
+        Adiciona de uma vez as posições (ainda não presentes) de um array (n, 2).
+        Dentro de cada bloco a ordem de inserção é a do array.
+        """
+        b, num_buckets = self.bucket, self.num_buckets
+        keys = (positions[:, 0] // b) * num_buckets + positions[:, 1] // b
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        ordered = list(zip(positions[order, 0].tolist(), positions[order, 1].tolist()))
+        starts = np.flatnonzero(np.diff(keys, prepend=-1))
+        bounds = starts.tolist() + [len(ordered)]
+        buckets = self.buckets
+        for key, start, stop in zip(keys[starts].tolist(), bounds, bounds[1:]):
+            cell = buckets.get(divmod(key, num_buckets))
+            if cell is None:
+                buckets[divmod(key, num_buckets)] = set(ordered[start:stop])
+            else:
+                cell.update(ordered[start:stop])
+        self.count = sum(map(len, buckets.values()))
+
+    def remove(self, pos: Position) -> None:
+        key = (pos[0] // self.bucket, pos[1] // self.bucket)
+        cell = self.buckets.get(key)
+        if cell is not None and pos in cell:
+            cell.remove(pos)
+            self.count -= 1
+            if not cell:
+                del self.buckets[key]
+
+    def within(self, x: int, y: int, radius: int) -> Iterator[Position]:
+        """Posições a distância de Manhattan <= radius de (x, y)"""
+        b = self.bucket
+        for bx in range(max(0, (x - radius) // b), min(self.num_buckets - 1, (x + radius) // b) + 1):
+            for by in range(max(0, (y - radius) // b), min(self.num_buckets - 1, (y + radius) // b) + 1):
+                cell = self.buckets.get((bx, by))
+                if cell:
+                    for pos in cell:
+                        if abs(pos[0] - x) + abs(pos[1] - y) <= radius:
+                            yield pos
+
+
+class ScanOrder:
+    """
+    Posições ocupadas em ordem de varredura (linha, coluna), no lugar dos laços
+    `for i in range(size): for j in range(size)` sobre a grade inteira: o custo
+    acompanha a população, não a área. Posições colocadas com push() à frente
+    do cursor durante o percurso também são visitadas, como na varredura
+    completa; quem consome confere a célula, que pode ter sido esvaziada.
+    """
+
+    def __init__(self, positions: Iterable[Position]):
+        self.order: List[Position] = sorted(positions)
+        self.extra: List[Position] = []  # Heap das posições adicionadas no percurso
+        self.cursor: Optional[Position] = None
+
+    def push(self, pos: Position) -> None:
+        if self.cursor is None or pos > self.cursor:
+            heapq.heappush(self.extra, pos)
+
+    def __iter__(self) -> Iterator[Position]:
+        order, extra = self.order, self.extra
+        k = 0
+        while True:
+            if extra and (k == len(order) or extra[0] < order[k]):
+                pos = heapq.heappop(extra)
+            elif k < len(order):
+                pos = order[k]
+                k += 1
+            else:
+                return
+            if pos == self.cursor:  # Adicionada de novo numa célula que já estava na fila
+                continue
+            self.cursor = pos
+            yield pos
@@ -0,0 +1,158 @@
+import os
+from typing import Dict, Optional, Tuple
+import numpy as np
+from entities import EntityType
+
+# Séries temporais por tick, em colunas: cada coluna é uma matriz pré-alocada
+# (ticks, ...) preenchida com reduções vetorizadas (bincount, searchsorted)
+# sobre o estado do mundo, e gravada no fim como um .npz comprimido, uma
+# entrada por coluna. Funciona com os motores object (percorre só as
+# entidades, não a grade), array/tiled e legacy; o que o motor não modela
+# fica zerado, e nascimentos/mortes desconhecidos (tiled, legacy) ficam -1.
+
+TEAMS = (EntityType.SPECIES1, EntityType.SPECIES2)
+ROLES = 3  # EntityRole.NORMAL, BUILDER, MINER
+RESOURCES = 3  # Comida, minério, misc (códigos 1 a 3)
+
+# Limites das faixas dos histogramas: faixa k vai de EDGES[k-1] (inclusive) a
+# EDGES[k]; a primeira e a última são abertas
+ENERGY_EDGES = np.array([0.5, 1, 2, 4, 8, 16, 32, 64, 128], dtype=np.float32)
+STRENGTH_EDGES = np.array([0.5, 1, 2, 4, 8, 16, 32, 64, 128], dtype=np.float32)
+
+COLUMNS: Dict[str, Tuple[Tuple[int, ...], type]] = {
+    "tick": ((), np.int64),
+    "population": ((len(TEAMS),), np.int32),           # Seres por time (inclui abrigados)
+    "roles": ((len(TEAMS), ROLES), np.int32),           # Seres no mapa por time e papel
+    "sheltered": ((len(TEAMS),), np.int32),             # Seres dentro de construções
+    "energy_hist": ((len(TEAMS), len(ENERGY_EDGES) + 1), np.int32),
+    "strength_hist": ((len(TEAMS), len(STRENGTH_EDGES) + 1), np.int32),
+    "constructions": ((len(TEAMS),), np.int32),
+    "capacity": ((len(TEAMS),), np.int32),              # Vagas somadas das construções
+    "armies": ((len(TEAMS),), np.int32),
+    "army_soldiers": ((len(TEAMS),), np.int32),
+    "resources": ((RESOURCES,), np.int32),               # Células com cada recurso
+    "births": ((len(TEAMS),), np.int32),                 # No tick
+    "deaths": ((len(TEAMS),), np.int32),                 # No tick (nascimentos - variação da população)
+}
+
+
+def map_entities(world) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """(time, papel, energia, força) das entidades no mapa, como vetores"""
+    if hasattr(world, "grid"):
+        grid = world.grid
+        entities = [grid[x][y] for team in TEAMS for x, y in world.entity_index[team]]
+        n = len(entities)
+        team = np.repeat(np.array([t.value for t in TEAMS], dtype=np.int8),
+                         [len(world.entity_index[t]) for t in TEAMS])
+        return (team, np.fromiter((e.role for e in entities), np.int8, n),
+                np.fromiter((e.energy for e in entities), np.float32, n),
+                np.fromiter((e.strength for e in entities), np.float32, n))
+    # Índices das células ocupadas uma vez só; cada campo é lido com take
+    occupied = np.flatnonzero(world.team)
+    role = world.role.take(occupied) if hasattr(world, "role") else np.zeros(len(occupied), np.int8)
+    return world.team.take(occupied), role, world.energy.take(occupied), world.strength.take(occupied)
+
+
+def histogram(team: np.ndarray, values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    bins = len(edges) + 1
+    index = (team.astype(np.intp) - 1) * bins + np.searchsorted(edges, values, side="right")
+    return np.bincount(index, minlength=len(TEAMS) * bins).reshape(len(TEAMS), bins)
+
+
+def construction_totals(world) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(construções, ocupantes, vagas) por time"""
+    if hasattr(world, "constructions"):
+        totals = np.zeros((3, len(TEAMS)), dtype=np.int64)
+        for construction in world.constructions:
+            k = construction.owner_type.value - 1
+            totals[:, k] += (1, len(construction.occupants), construction.max_occupants)
+        return totals[0], totals[1], totals[2]
+    if hasattr(world, "con_team"):
+        from array_world import MAX_OCCUPANTS
+        cells = np.flatnonzero(world.con_team)
+        owner = world.con_team.take(cells)
+        count = np.bincount(owner, minlength=3)[1:]
+        occupants = np.bincount(owner, weights=world.con_occupants.take(cells), minlength=3)[1:]
+        return count, occupants.astype(np.int64), count * MAX_OCCUPANTS
+    zeros = np.zeros(len(TEAMS), dtype=np.int64)
+    return zeros, zeros, zeros
+
+
+def resource_layer(world) -> np.ndarray:
+    resource = getattr(world, "resource_type", None)
+    return resource if resource is not None else world.layers()["resource"]
+
+
+class StatsCollector:
+    """
+    Uma linha por chamada de record() (normalmente uma por tick), em
+    matrizes que dobram de tamanho quando enchem. save() grava as colunas
+    preenchidas em `path` (npz comprimido); as faixas dos histogramas vão
+    junto como energy_edges e strength_edges. Com `flush_every`, record()
+    também grava a cada N linhas, e uma execução interrompida guarda a série
+    até a última gravação. Leia com load_stats().
+    """
+
+    def __init__(self, path: str, capacity: int = 1024, flush_every: int = 0):
+        self.path = path
+        self.flush_every = flush_every
+        self.rows = 0
+        self.columns = {name: np.zeros((max(capacity, 1),) + shape, dtype=dtype)
+                        for name, (shape, dtype) in COLUMNS.items()}
+        self.previous: Optional[Tuple[np.ndarray, Optional[np.ndarray]]] = None
+
+    def grow(self) -> None:
+        for name, column in self.columns.items():
+            larger = np.zeros((2 * len(column),) + column.shape[1:], dtype=column.dtype)
+            larger[:len(column)] = column
+            self.columns[name] = larger
+
+    def record(self, world) -> None:
+        if self.rows == len(self.columns["tick"]):
+            self.grow()
+        row = {name: column[self.rows] for name, column in self.columns.items()}
+        self.columns["tick"][self.rows] = world.tick
+
+        population = np.array([world.species1_count, world.species2_count], dtype=np.int64)
+        row["population"][:] = population
+        team, role, energy, strength = map_entities(world)
+        index = (team.astype(np.intp) - 1) * ROLES + role
+        row["roles"][:] = np.bincount(index, minlength=len(TEAMS) * ROLES).reshape(len(TEAMS), ROLES)
+        row["energy_hist"][:] = histogram(team, energy, ENERGY_EDGES)
+        row["strength_hist"][:] = histogram(team, strength, STRENGTH_EDGES)
+
+        row["constructions"][:], row["sheltered"][:], row["capacity"][:] = construction_totals(world)
+        armies = getattr(world, "armies", {})
+        row["armies"][:] = [len(armies.get(t, ())) for t in TEAMS]
+        row["army_soldiers"][:] = [sum(len(army) for army in armies.get(t, ())) for t in TEAMS]
+        row["resources"][:] = np.bincount(resource_layer(world).ravel(), minlength=RESOURCES + 1)[1:]
+
+        births = getattr(world, "births", None)
+        births = None if births is None else np.array([births[t] for t in TEAMS], dtype=np.int64)
+        if births is None:
+            row["births"][:] = row["deaths"][:] = -1
+        elif self.previous is not None:
+            last_population, last_births = self.previous
+            row["births"][:] = births - last_births
+            row["deaths"][:] = births - last_births - (population - last_population)
+        self.previous = (population, births)
+        self.rows += 1
+        if self.flush_every and self.rows % self.flush_every == 0:
+            self.save()
+
+    def save(self) -> None:
+        """Grava as linhas até aqui (substitui o arquivo de uma vez, como os checkpoints)"""
+        partial = self.path + ".partial"
+        with open(partial, "wb") as f:
+            np.savez_compressed(f, energy_edges=ENERGY_EDGES, strength_edges=STRENGTH_EDGES,
+                                **{name: column[:self.rows] for name, column in self.columns.items()})
+        os.replace(partial, self.path)
+
+    def close(self) -> None:
+        self.save()
+
+
+def load_stats(path: str) -> Dict[str, np.ndarray]:
+    """Colunas gravadas por StatsCollector, por nome"""
+    with np.load(path) as data:
+        return dict(data)
@@ -0,0 +1,100 @@
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Dict, List
+from world import create_world, ENGINES
+from recording import COUNTERS, world_counters
+
+
+def run_config(config: Dict) -> Dict:
+    """Executa uma configuração sem interface e devolve os contadores finais e por tick"""
+    start = time.perf_counter()
+    world = create_world(config["size"], config["prob_species1"], config["prob_species2"],
+                         engine=config["engine"], seed=config["seed"])
+    history = [world_counters(world).tolist()]
+    for _ in range(config["ticks"]):
+        world.update()
+        history.append(world_counters(world).tolist())
+        if config["stop_on_extinction"] and (world.species1_count == 0 or world.species2_count == 0):
+            break
+
+    final = dict(zip(COUNTERS, history[-1]))
+    if final["species1_count"] > final["species2_count"]:
+        winner = 1
+    elif final["species2_count"] > final["species1_count"]:
+        winner = 2
+    else:
+        winner = 0
+    return {
+        **config,
+        "ticks_run": len(history) - 1,
+        "seconds": round(time.perf_counter() - start, 3),
+        "winner": winner,
+        "final": final,
+        # Uma série por contador, do estado inicial (tick 0) ao último tick
+        "per_tick": {name: [row[k] for row in history] for k, name in enumerate(COUNTERS)},
+    }
+
+
+def build_configs(args) -> List[Dict]:
+    configs = []
+    for size, p1, p2, seed in itertools.product(args.sizes, args.prob1, args.prob2, args.seeds):
+        if p1 + p2 > 1:
+            continue
+        configs.append({"run": len(configs), "engine": args.engine, "size": size,
+                        "prob_species1": p1, "prob_species2": p2, "seed": seed,
+                        "ticks": args.ticks, "stop_on_extinction": args.stop_on_extinction})
+    return configs
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Varredura de parâmetros em vários processos")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50],
+                        help="lados de grade")
+    parser.add_argument("--prob1", type=float, nargs="+", default=[0.1, 0.2, 0.3],
+                        help="probabilidades iniciais da espécie 1")
+    parser.add_argument("--prob2", type=float, nargs="+", default=[0.1, 0.2, 0.3],
+                        help="probabilidades iniciais da espécie 2")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2],
+                        help="sementes (uma execução por semente e combinação)")
+    parser.add_argument("--ticks", type=int, default=200,
+                        help="ticks por execução")
+    parser.add_argument("--engine", choices=ENGINES, default="object",
+                        help="motor de simulação")
+    parser.add_argument("--stop-on-extinction", action="store_true",
+                        help="encerrar a execução quando um dos times for extinto")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="processos em paralelo (padrão: todos os núcleos)")
+    parser.add_argument("--output", default="sweep_results.json",
+                        help="arquivo JSON com os resultados")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    configs = build_configs(args)
+    print(f"{len(configs)} execuções em {args.workers} processos")
+
+    results = []
+    # maxtasksperchild=1: cada execução roda num processo novo, então a memória
+    # de um mundo grande não fica retida no processo que roda a próxima
+    with multiprocessing.Pool(args.workers, maxtasksperchild=1) as pool:
+        for result in pool.imap_unordered(run_config, configs):
+            results.append(result)
+            print(f"[{len(results)}/{len(configs)}] lado {result['size']} "
+                  f"p=({result['prob_species1']}, {result['prob_species2']}) semente {result['seed']}: "
+                  f"{result['ticks_run']} ticks, vencedor {result['winner']} "
+                  f"({result['seconds']:.1f}s)", flush=True)
+
+    # Mesma ordem das configurações, independente de qual processo terminou antes
+    results.sort(key=lambda r: r["run"])
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"args": vars(args), "counters": COUNTERS, "runs": results}, f)
+    print(f"Resultados salvos em {args.output}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
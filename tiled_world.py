@@ -0,0 +1,228 @@
+import multiprocessing
+import os
+import traceback
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from array_world import ArrayWorld, Draw, OFFSETS, STATE_FIELDS
+from recording import world_counters
+from entities import EntityType, ResourceType
+
+# Decomposição do mapa em faixas de linhas, uma por processo. O estado (as
+# matrizes do ArrayWorld) fica em memória compartilhada; a cada tick cada
+# processo copia a sua faixa mais HALO linhas de cada lado, avança o tick
+# inteiro nessa janela e devolve só as próprias linhas.
+#
+# A janela dispensa trocas entre as fases porque a influência de uma célula
+# dentro de um tick tem alcance limitado: defensores (até 8 direções em
+# sequência, 2 células cada), movimento (campo de distância de raio
+# TARGET_RADIUS mais resolução de conflitos), abrigo e entrega (8 direções em
+# sequência) e as fases locais somam menos de 64 linhas. As linhas da borda
+# da janela saem erradas, mas ficam fora da faixa que o processo escreve.
+#
+# Os sorteios não vêm de um gerador sequencial: cada número é um hash de
+# (semente, tick, sorteio, célula), então dois processos que calculam a mesma
+# célula de halo chegam ao mesmo resultado e a simulação não depende do
+# número de processos. Movimentos, ataques e nascimentos que cruzam a
+# fronteira são decididos igualmente dos dois lados.
+HALO = 64
+
+GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+MIX2 = np.uint64(0x94D049BB133111EB)
+
+
+def mix64(x: np.ndarray) -> np.ndarray:
+    """Finalizador do SplitMix64 sobre uint64 (contadores seguidos viram bits independentes)"""
+    z = x + GOLDEN
+    z = (z ^ (z >> np.uint64(30))) * MIX1
+    z = (z ^ (z >> np.uint64(27))) * MIX2
+    return z ^ (z >> np.uint64(31))
+
+
+class TileWindow(ArrayWorld):
+    """
+    Linhas [row0, row0 + n) do mapa copiadas para um processo. Roda as fases
+    do ArrayWorld com sorteios por célula em vez do gerador sequencial.
+    """
+
+    def __init__(self, size: int, key: int, tick: int, row0: int, arrays: Dict[str, np.ndarray]):
+        self.size = size
+        self.key = np.uint64(key)
+        self.tick = tick
+        self.row0 = row0
+        self.births = {EntityType.SPECIES1: 0, EntityType.SPECIES2: 0}  # Descartados: incluem o halo
+        for name, a in arrays.items():
+            setattr(self, name, a)
+
+    def cells(self) -> np.ndarray:
+        """Índice plano de cada célula no mapa inteiro"""
+        start = self.row0 * self.size
+        return np.arange(start, start + self.team.size, dtype=np.uint64).reshape(self.team.shape)
+
+    def bits(self, draw: Draw, cells: np.ndarray, lead: Tuple[int, ...] = ()) -> np.ndarray:
+        # Contador único por (tick, sorteio, eixo à frente, célula)
+        n = self.size * self.size
+        streams = np.arange(int(np.prod(lead)), dtype=np.uint64).reshape(lead + (1,) * cells.ndim)
+        base = ((self.tick * len(Draw) + int(draw)) * len(OFFSETS) * n) % 2 ** 64
+        return mix64((np.uint64(base) + streams * np.uint64(n) + cells) ^ self.key)
+
+    @staticmethod
+    def to_uniform(bits: np.ndarray, dtype) -> np.ndarray:
+        if dtype == np.float32:
+            return (bits >> np.uint64(40)).astype(np.float32) * np.float32(2.0 ** -24)
+        return (bits >> np.uint64(11)).astype(np.float64) * 2.0 ** -53
+
+    def uniform(self, draw: Draw, lead: Tuple[int, ...] = (), dtype=np.float64) -> np.ndarray:
+        return self.to_uniform(self.bits(draw, self.cells(), lead), dtype)
+
+    def integers(self, draw: Draw, low: int, high: int, dtype=np.int64) -> np.ndarray:
+        return (low + self.uniform(draw) * (high - low)).astype(dtype)
+
+    def masked_uniform(self, draw: Draw, mask: np.ndarray) -> np.ndarray:
+        return self.to_uniform(self.bits(draw, self.cells()[mask]), np.float64)
+
+    def masked_integers(self, draw: Draw, mask: np.ndarray, low: int, high: int) -> np.ndarray:
+        return (low + self.masked_uniform(draw, mask) * (high - low)).astype(np.int64)
+
+
+def attach(spec: Dict[str, Tuple[str, str]], shape: Tuple[int, int]):
+    """Abre os segmentos compartilhados e devolve (segmentos, matrizes por nome)"""
+    blocks = []
+    arrays = {}
+    for name, (block_name, dtype) in spec.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    return blocks, arrays
+
+
+def step_tile(arrays: Dict[str, np.ndarray], size: int, key: int, tick: int,
+              start: int, stop: int, halo: int, barrier) -> np.ndarray:
+    """Um tick da faixa [start, stop); devolve os contadores da faixa"""
+    low, high = max(start - halo, 0), min(stop + halo, size)
+    window = TileWindow(size, key, tick, low, {name: a[low:high].copy() for name, a in arrays.items()})
+    window.advance()
+    # Ninguém escreve antes de todos terminarem de ler as suas janelas
+    barrier.wait()
+    for name, a in arrays.items():
+        a[start:stop] = getattr(window, name)[start - low:stop - low]
+    part = TileWindow(size, key, tick, start, {name: a[start:stop] for name, a in arrays.items()})
+    part.count_entities()
+    return world_counters(part)
+
+
+def run_tile(spec, size: int, key: int, start: int, stop: int, halo: int, barrier, conn) -> None:
+    """
+    Processo de uma faixa: avança um tick a cada número recebido e responde
+    com os contadores da faixa; None encerra.
+    """
+    blocks, arrays = attach(spec, (size, size))
+    try:
+        while True:
+            tick = conn.recv()
+            if tick is None:
+                break
+            try:
+                conn.send(("ok", step_tile(arrays, size, key, tick, start, stop, halo, barrier)))
+            except Exception:
+                # Libera quem está na barreira; o processo principal recebe o erro
+                barrier.abort()
+                conn.send(("error", traceback.format_exc()))
+                break
+    finally:
+        del arrays
+        for block in blocks:
+            block.close()
+
+
+class TiledWorld(ArrayWorld):
+    """
+    ArrayWorld dividido em faixas de linhas avançadas em paralelo por
+    `workers` processos sobre memória compartilhada. Mesma interface do
+    ArrayWorld (contadores, layers()); chame close() ao terminar para
+    encerrar os processos e liberar a memória compartilhada.
+
+    Com a mesma semente o resultado é o mesmo para qualquer número de
+    processos, mas difere do ArrayWorld: os sorteios são por célula.
+    """
+
+    def __init__(self, size: int, prob_species1: float, prob_species2: float,
+                 seed: Optional[int] = None, workers: Optional[int] = None, halo: int = HALO):
+        self.segments: List[Tuple[np.ndarray, shared_memory.SharedMemory]] = []
+        super().__init__(size, prob_species1, prob_species2, seed=seed)
+        # Chave dos sorteios por célula, derivada do gerador já semeado
+        self.key = int(self.rng.integers(2 ** 63))
+        self.halo = halo
+        # Nascimentos acontecem nas janelas dos processos, que se sobrepõem no halo
+        self.births = None
+        workers = max(1, min(workers or os.cpu_count() or 1, size))
+        self.bands = np.linspace(0, size, workers + 1).astype(int).tolist()
+
+        spec = {}
+        for name in STATE_FIELDS:
+            a = getattr(self, name)
+            block = next(block for array, block in self.segments if array is a)
+            spec[name] = (block.name, a.dtype.str)
+
+        context = multiprocessing.get_context()
+        # Referência guardada: com "spawn" o processo abre a barreira pelo nome depois de iniciado
+        self.barrier = barrier = context.Barrier(workers)
+        self.conns = []
+        self.processes = []
+        for start, stop in zip(self.bands[:-1], self.bands[1:]):
+            parent, child = context.Pipe()
+            process = context.Process(target=run_tile, daemon=True,
+                                      args=(spec, size, self.key, start, stop, halo, barrier, child))
+            process.start()
+            child.close()
+            self.conns.append(parent)
+            self.processes.append(process)
+
+    def zeros(self, shape: Tuple[int, ...], dtype) -> np.ndarray:
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        block = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+        a = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        a.fill(0)
+        self.segments.append((a, block))
+        return a
+
+    def update(self) -> None:
+        for conn in self.conns:
+            conn.send(self.tick)
+        replies = [conn.recv() for conn in self.conns]
+        errors = [detail for status, detail in replies if status == "error"]
+        if errors:
+            self.close()
+            raise RuntimeError(f"Falha num processo do TiledWorld:\n{errors[0]}")
+        (self.species1_count, self.construction1_count, ore1, misc1,
+         self.species2_count, self.construction2_count, ore2, misc2) = \
+            np.sum([counters for _, counters in replies], axis=0).tolist()
+        self.resources1 = {ResourceType.ORE: ore1, ResourceType.MISC: misc1}
+        self.resources2 = {ResourceType.ORE: ore2, ResourceType.MISC: misc2}
+        self.tick += 1
+
+    def close(self) -> None:
+        """Encerra os processos; o estado é copiado para fora da memória compartilhada"""
+        for conn, process in zip(self.conns, self.processes):
+            if process.is_alive():
+                try:
+                    conn.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for conn in self.conns:
+            conn.close()
+        self.conns = []
+        self.processes = []
+
+        for name in STATE_FIELDS:
+            setattr(self, name, getattr(self, name).copy())
+        blocks = [block for _, block in self.segments]
+        self.segments = []
+        for block in blocks:
+            block.close()
+            block.unlink()
@@ -0,0 +1,41 @@
+from typing import List, Optional, Tuple
+
+Position = Tuple[int, int]
+
+# Deslocamentos de cada vizinhança, em ordem de varredura (linha, depois coluna)
+MOORE: Tuple[Position, ...] = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+VON_NEUMANN: Tuple[Position, ...] = ((-1, 0), (0, -1), (0, 1), (1, 0))
+NEIGHBORHOODS = {"moore": MOORE, "von_neumann": VON_NEUMANN}
+
+
+class Topology:
+    """
+    Vizinhança pré-calculada de uma grade size x size: Moore ou von Neumann,
+    com bordas limitadas ou toroidais (`wrap`). neighbors(x, y) devolve a
+    tupla de posições vizinhas, guardada na primeira consulta de cada célula
+    (o custo acompanha as células usadas). Os deslocamentos (`offsets`) ficam
+    expostos para quem trabalha em janelas da grade (navigation.py).
+    """
+
+    def __init__(self, size: int, neighborhood: str = "moore", wrap: bool = False):
+        if neighborhood not in NEIGHBORHOODS:
+            raise ValueError(f"Vizinhança desconhecida: {neighborhood}. "
+                             f"Opções: {', '.join(NEIGHBORHOODS)}")
+        self.size = size
+        self.neighborhood = neighborhood
+        self.offsets = NEIGHBORHOODS[neighborhood]
+        self.wrap = wrap
+        self.cache: List[Optional[Tuple[Position, ...]]] = [None] * (size * size)
+
+    def neighbors(self, x: int, y: int) -> Tuple[Position, ...]:
+        k = x * self.size + y
+        cell = self.cache[k]
+        if cell is None:
+            size = self.size
+            if self.wrap:
+                cell = tuple(((x + dx) % size, (y + dy) % size) for dx, dy in self.offsets)
+            else:
+                cell = tuple((x + dx, y + dy) for dx, dy in self.offsets
+                             if 0 <= x + dx < size and 0 <= y + dy < size)
+            self.cache[k] = cell
+        return cell
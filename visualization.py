@@ -1,104 +1,107 @@
 import matplotlib.pyplot as plt
-from matplotlib import colors
 import numpy as np
-from world import World
-from entities import EntityType, ResourceType
+from entities import ResourceType
+from rendering import compose_rgba
 
 class Visualizer:
-    def __init__(self, world: World, delay: float):
+    """
+    Desenha o mundo como uma única imagem RGBA: a cada quadro o buffer é
+    reescrito, o artista do imshow recebe os dados com set_data e apenas os
+    artistas animados (imagem, título e rótulos de ocupantes) são redesenhados
+    por blitting sobre o fundo estático.
+    """
+
+    def __init__(self, world, delay: float):
         self.world = world
         self.delay = delay
+        self.status = ""  # Linha extra no título (ex.: pausado)
         self.fig, self.ax = plt.subplots(figsize=(8, 8))
         self.setup_plot()
 
     def setup_plot(self):
         plt.ion()
-        # Cores para entidades (opacas)
-        self.entity_colors = ["white", "blue", "red"]
-        # Cores para recursos (semi-transparentes)
-        self.resource_colors = ["none", "green", "gold", "purple"]
-        # Cores para construções
-        self.construction_colors = ["black", "pink"]  # Preto para time azul, rosa para vermelho
-        self.resource_alpha = {
-            ResourceType.FOOD: 0.3,
-            ResourceType.ORE: 0.5,
-            ResourceType.MISC: 0.3
-        }
+        size = self.world.size
+        self.frame = np.zeros((size, size, 4), dtype=np.uint8)
 
-    def update(self):
-        self.ax.clear()
+        # origin="lower" mantém a linha 0 embaixo, como nos limites originais
+        self.image = self.ax.imshow(self.frame, origin="lower", interpolation="nearest",
+                                    extent=(-0.5, size - 0.5, -0.5, size - 0.5), animated=True)
+        self.ax.set_xlim(-0.5, size - 0.5)
+        self.ax.set_ylim(-0.5, size - 0.5)
+        self.ax.grid(True)
+        self.title = self.ax.set_title("", animated=True)
+        self.labels = []  # Textos reaproveitados entre quadros (um por construção)
 
-        # Criar grade base branca
-        base_grid = np.zeros((self.world.size, self.world.size))
-        self.ax.imshow(base_grid, cmap=colors.ListedColormap(["white"]))
+        self.background = None
+        self.fig.canvas.mpl_connect("draw_event", self.on_draw)
+        plt.show(block=False)
+        self.fig.canvas.draw()
 
-        # Plotar recursos com transparência
-        for i in range(self.world.size):
-            for j in range(self.world.size):
-                resource = self.world.resources[i][j]
-                if resource is not None:
-                    if resource.type == ResourceType.FOOD:
-                        color = "green"
-                        alpha = self.resource_alpha[ResourceType.FOOD]
-                    elif resource.type == ResourceType.ORE:
-                        color = "gold"
-                        alpha = self.resource_alpha[ResourceType.ORE]
-                    else:  # MISC
-                        color = "purple"
-                        alpha = self.resource_alpha[ResourceType.MISC]
-                    
-                    self.ax.add_patch(plt.Rectangle((j-0.5, i-0.5), 1, 1, 
-                                                  facecolor=color, 
-                                                  alpha=alpha))
+    def on_draw(self, event):
+        """Guarda o fundo estático (eixos e grade) sempre que a figura é redesenhada"""
+        self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_animated()
 
-        # Plotar construções
-        for i in range(self.world.size):
-            for j in range(self.world.size):
-                construction = self.world.constructions[i][j]
-                if construction:
-                    team_idx = construction.owner_type.value - 1
-                    color = self.construction_colors[team_idx]
-                    
-                    # Opacidade baseada na ocupação
-                    occupation_ratio = len(construction.occupants) / construction.max_occupants
-                    alpha = 0.3 + (occupation_ratio * 0.7)  # Varia de 0.3 a 1.0
-                    
-                    self.ax.add_patch(plt.Rectangle((j-0.5, i-0.5), 1, 1,
-                                                  facecolor=color,
-                                                  alpha=alpha))
-                    
-                    # Adicionar número de ocupantes
-                    num_occupants = len(construction.occupants)
-                    self.ax.text(j, i, str(num_occupants),
-                               ha='center', va='center',
-                               color='white' if team_idx == 0 else 'black',  # Texto branco para construções pretas
-                               fontweight='bold',
-                               fontsize=10)
+    def on_key(self, callback) -> None:
+        """Chama callback(tecla) a cada tecla pressionada na janela"""
+        self.fig.canvas.mpl_connect("key_press_event", lambda event: callback(event.key))
 
-        # Visualizar entidades
-        entity_grid = np.array([[0 if cell is None else cell.type.value 
-                               for cell in row] 
-                              for row in self.world.grid])
+    def is_open(self) -> bool:
+        return plt.fignum_exists(self.fig.number)
 
-        # Plotar entidades
-        for i in range(self.world.size):
-            for j in range(self.world.size):
-                if entity_grid[i,j] > 0:
-                    color = self.entity_colors[entity_grid[i,j]]
-                    self.ax.add_patch(plt.Rectangle((j-0.5, i-0.5), 1, 1, 
-                                                  facecolor=color))
+    def title_text(self) -> str:
+        world = self.world
+        title = f"Simulador de Vida - Ambiente com Recursos\n"
+        title += f"Time Azul: {world.species1_count} seres, {world.construction1_count} construções\n"
+        title += f"Recursos Time Azul - Ore: {world.resources1[ResourceType.ORE]}, Misc: {world.resources1[ResourceType.MISC]}\n"
+        title += f"Time Vermelho: {world.species2_count} seres, {world.construction2_count} construções\n"
+        title += f"Recursos Time Vermelho - Ore: {world.resources2[ResourceType.ORE]}, Misc: {world.resources2[ResourceType.MISC]}"
+        if self.status:
+            title += f"\n{self.status}"
+        return title
 
-        # Configurar limites e grade
-        self.ax.set_xlim(-0.5, self.world.size-0.5)
-        self.ax.set_ylim(-0.5, self.world.size-0.5)
-        self.ax.grid(True)
+    def update_labels(self, layers):
+        """Número de ocupantes sobre cada construção"""
+        xs, ys = np.nonzero(layers["construction"])
+        while len(self.labels) < len(xs):
+            self.labels.append(self.ax.text(0, 0, "", ha='center', va='center',
+                                            fontweight='bold', fontsize=10, animated=True))
+        for label, i, j in zip(self.labels, xs, ys):
+            team_idx = layers["construction"][i, j] - 1
+            label.set_position((j, i))
+            label.set_text(str(layers["occupants"][i, j]))
+            label.set_color('white' if team_idx == 0 else 'black')  # Texto branco para construções pretas
+            label.set_visible(True)
+        for label in self.labels[len(xs):]:
+            label.set_visible(False)
 
-        # Adicionar contagem de entidades e recursos ao título
-        title = f"Simulador de Vida - Ambiente com Recursos\n"
-        title += f"Time Azul: {self.world.species1_count} seres, {self.world.construction1_count} construções\n"
-        title += f"Recursos Time Azul - Ore: {self.world.resources1[ResourceType.ORE]}, Misc: {self.world.resources1[ResourceType.MISC]}\n"
-        title += f"Time Vermelho: {self.world.species2_count} seres, {self.world.construction2_count} construções\n"
-        title += f"Recursos Time Vermelho - Ore: {self.world.resources2[ResourceType.ORE]}, Misc: {self.world.resources2[ResourceType.MISC]}"
-        self.ax.set_title(title)
+    def draw_animated(self):
+        self.ax.draw_artist(self.image)
+        for label in self.labels:
+            if label.get_visible():
+                self.ax.draw_artist(label)
+        self.ax.draw_artist(self.title)
+
+    def wait(self, seconds: float) -> None:
+        """Processa os eventos da janela sem desenhar um quadro novo"""
+        self.fig.canvas.start_event_loop(seconds)
+
+    def update(self):
+        layers = self.world.layers()
+        compose_rgba(layers, out=self.frame)
+        self.image.set_data(self.frame)
+        self.update_labels(layers)
+        self.title.set_text(self.title_text())
 
-        plt.pause(self.delay) 
\ No newline at end of file
+        canvas = self.fig.canvas
+        if self.background is None or not canvas.supports_blit:
+            canvas.draw_idle()
+        else:
+            canvas.restore_region(self.background)
+            self.draw_animated()
+            canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+        # Aguarda sem forçar um redesenho completo (como plt.pause faria);
+        # timeout 0 significaria esperar para sempre
+        if self.delay > 0:
+            self.wait(self.delay)
@@ -1,308 +1,501 @@
 import numpy as np
-import random
 from typing import List, Tuple, Optional
-from entities import Entity, EntityType, EntityRole, Resource, ResourceType
+from entities import Entity, EntityType, EntityRole, ResourceType, RESOURCE_CODES
+from spatial_index import SpatialIndex, ScanOrder
+from construction_registry import ConstructionRegistry
+from navigation import Navigator, ATTACK, SHELTER, ENEMY
+from topology import Topology
+from events import EventKind
+from rng import RandomStream
+
+TEAMS = (EntityType.SPECIES1, EntityType.SPECIES2)
+
+# Códigos de recurso nas matrizes (0 = célula sem recurso)
+RES_NONE = 0
+RES_FOOD = RESOURCE_CODES[ResourceType.FOOD]
+RES_ORE = RESOURCE_CODES[ResourceType.ORE]
+RES_MISC = RESOURCE_CODES[ResourceType.MISC]
 
 class World:
-    def __init__(self, size: int, prob_species1: float, prob_species2: float):
+    def __init__(self, size: int, prob_species1: float, prob_species2: float, seed: Optional[int] = None):
+        self.allocate(size, seed)
+        self.initialize_world(prob_species1, prob_species2)
+        self.count_entities()
+
+    @classmethod
+    def empty(cls, size: int) -> "World":
+        """Mundo vazio, sem sorteios, para ser preenchido por quem restaura um estado gravado"""
+        world = cls.__new__(cls)
+        world.allocate(size, None)
+        return world
+
+    def allocate(self, size: int, seed: Optional[int]) -> None:
+        """Estado inicial vazio: grade, camadas, índices, contadores e ganchos"""
         self.size = size
+        # Única fonte de aleatoriedade do mundo: a mesma semente reproduz a simulação
+        self.rng = RandomStream(seed)
         self.grid = [[None for _ in range(size)] for _ in range(size)]
-        self.resources = [[None for _ in range(size)] for _ in range(size)]
-        self.constructions = [[None for _ in range(size)] for _ in range(size)]
+        # Recursos por célula: código (RES_*) e quantidade
+        self.resource_type = np.zeros((size, size), dtype=np.int8)
+        self.resource_amount = np.zeros((size, size), dtype=np.int8)
+        # Construções por id, posição e time (com índice espacial por time)
+        self.constructions = ConstructionRegistry(size, TEAMS)
+
+        # Vizinhança de Moore com bordas limitadas, pré-calculada por célula
+        self.topology = Topology(size)
+
+        # Índices espaciais por time, mantidos junto com a grade e as construções
+        self.entity_index = self.new_entity_index()
+        self.construction_index = self.constructions.index
+        self.navigator = Navigator(self)
         
-        # Contadores
+        # Contadores, atualizados a cada evento (nascimento, morte, construção...)
         self.species1_count = 0
         self.species2_count = 0
         self.construction1_count = 0
         self.construction2_count = 0
         self.resources1 = {ResourceType.ORE: 0, ResourceType.MISC: 0}
         self.resources2 = {ResourceType.ORE: 0, ResourceType.MISC: 0}
+        self.births = {team: 0 for team in TEAMS}  # Acumulados desde a criação
         
         self.armies = {
             EntityType.SPECIES1: [],  # Lista de grupos de seres
             EntityType.SPECIES2: []
         }
-        
-        self.initialize_world(prob_species1, prob_species2)
+
+        # Em testes: conferir os contadores com uma recontagem ao fim de cada tick
+        self.check_counters = False
+
+        # Barramento de eventos (events.EventBus); None desativa a emissão
+        self.events = None
+
+        # Medição por fase (profiling.PhaseProfiler); None desativa
+        self.profiler = None
+        self.tick = 0
 
     def initialize_world(self, prob_species1: float, prob_species2: float) -> None:
-        # Inicializar entidades
-        for i in range(self.size):
-            for j in range(self.size):
-                rand = random.random()
-                if rand < prob_species1:
-                    self.grid[i][j] = Entity(EntityType.SPECIES1)
-                elif rand < prob_species1 + prob_species2:
-                    self.grid[i][j] = Entity(EntityType.SPECIES2)
+        # Inicializar entidades (um sorteio vetorizado para todas as células)
+        rand = self.rng.uniform_array(self.size * self.size).reshape(self.size, self.size)
+        for i, j in zip(*np.nonzero(rand < prob_species1 + prob_species2)):
+            entity_type = EntityType.SPECIES1 if rand[i, j] < prob_species1 else EntityType.SPECIES2
+            self.set_cell(self.grid, self.entity_index, int(i), int(j), Entity(entity_type, rng=self.rng))
         
         # Inicializar minério (apenas uma vez)
         num_ore_deposits = int(self.size * self.size * 0.05)  # 5% do mapa terá minério
-        ore_positions = []
-        while len(ore_positions) < num_ore_deposits:
-            i = random.randint(0, self.size-1)
-            j = random.randint(0, self.size-1)
-            if (i,j) not in ore_positions:
-                ore_positions.append((i,j))
-                self.resources[i][j] = Resource.create_ore()
-
-    def get_neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
-        neighbors = []
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                new_x, new_y = x + dx, y + dy
-                if 0 <= new_x < self.size and 0 <= new_y < self.size:
-                    neighbors.append((new_x, new_y))
-        return neighbors
+        ore_positions = self.rng.generator.choice(self.size * self.size, num_ore_deposits, replace=False)
+        self.resource_type.flat[ore_positions] = RES_ORE
+        self.resource_amount.flat[ore_positions] = 3
+
+    def population(self) -> int:
+        """Entidades na grade (fora das construções)"""
+        return sum(len(index) for index in self.entity_index.values())
+
+    def scan(self, index=None) -> ScanOrder:
+        """Células ocupadas (de um índice por time, padrão o da grade) em ordem de varredura"""
+        index = self.entity_index if index is None else index
+        return ScanOrder(pos for team_index in index.values() for pos in team_index)
+
+    def new_entity_index(self):
+        return {team: SpatialIndex(self.size) for team in TEAMS}
+
+    def set_cell(self, grid, index, x: int, y: int, entity: Optional[Entity]) -> None:
+        """Escreve uma célula da grade mantendo o índice espacial correspondente"""
+        old = grid[x][y]
+        if old is not None:
+            index[old.type].remove((x, y))
+        grid[x][y] = entity
+        if entity is not None:
+            index[entity.type].add((x, y))
+
+    def set_construction(self, x: int, y: int, construction) -> None:
+        """Coloca ou remove (None) uma construção mantendo o registro e o índice espacial"""
+        old = self.constructions.at(x, y)
+        if old is not None:
+            self.constructions.remove(old)
+        if construction is not None:
+            self.constructions.add(construction)
+
+    def get_neighbors(self, x: int, y: int) -> Tuple[Tuple[int, int], ...]:
+        return self.topology.neighbors(x, y)
+
+    def layers(self):
+        """Camadas de estado para renderização (ver rendering.py)"""
+        shape = (self.size, self.size)
+        team = np.zeros(shape, dtype=np.int8)
+        for entity_team, index in self.entity_index.items():
+            positions = list(index)
+            if positions:
+                team[tuple(np.array(positions).T)] = entity_team.value
+
+        construction = np.zeros(shape, dtype=np.int8)
+        occupants = np.zeros(shape, dtype=np.int16)
+        capacity = np.zeros(shape, dtype=np.int16)
+        for c in self.constructions:
+            x, y = c.position
+            construction[x, y] = c.owner_type.value
+            occupants[x, y] = len(c.occupants)
+            capacity[x, y] = c.max_occupants
+        return {
+            "team": team,
+            "resource": self.resource_type,
+            "construction": construction,
+            "occupants": occupants,
+            "capacity": capacity
+        }
+
+    def add_counts(self, team: EntityType, entities: int = 0, constructions: int = 0,
+                   ore: int = 0, misc: int = 0) -> None:
+        """Aplica a variação de um evento aos contadores do time"""
+        if team == EntityType.SPECIES1:
+            self.species1_count += entities
+            self.construction1_count += constructions
+            resources = self.resources1
+        else:
+            self.species2_count += entities
+            self.construction2_count += constructions
+            resources = self.resources2
+        resources[ResourceType.ORE] += ore
+        resources[ResourceType.MISC] += misc
+
+    def record_birth(self, entity: Entity, x: int, y: int, kind: EventKind = EventKind.BIRTH,
+                     payload: float = 0.0) -> None:
+        self.add_counts(entity.type, entities=1,
+                        ore=entity.ore, misc=entity.misc)
+        self.births[entity.type] += 1
+        if self.events is not None:
+            self.events.emit(kind, x, y, entity.type.value, payload)
+
+    def record_death(self, entity: Entity, x: int, y: int) -> None:
+        self.add_counts(entity.type, entities=-1,
+                        ore=-entity.ore, misc=-entity.misc)
+        if self.events is not None:
+            self.events.emit(EventKind.DEATH, x, y, entity.type.value)
+
+    def place(self, grid, index, x: int, y: int, entity: Entity) -> None:
+        """Coloca a entidade na célula; quem já estava ali é sobrescrito e se perde"""
+        old = grid[x][y]
+        if old is not None and old is not entity:
+            self.record_death(old, x, y)
+        self.set_cell(grid, index, x, y, entity)
+
+    def damage_construction(self, x: int, y: int, amount: float) -> bool:
+        """Aplica dano à construção em (x, y); destruída, ela some junto com os ocupantes"""
+        construction = self.constructions.at(x, y)
+        occupants = list(construction.occupants)
+        if not construction.take_damage(amount):
+            return False
+        # Os expulsos na destruição não são recolocados no mapa
+        for occupant in occupants:
+            self.record_death(occupant, x, y)
+        self.set_construction(x, y, None)
+        self.add_counts(construction.owner_type, constructions=-1)
+        if self.events is not None:
+            self.events.emit(EventKind.CONSTRUCTION_DESTROYED, x, y, construction.owner_type.value)
+        return True
+
+    def build(self, entity: Entity, x: int, y: int):
+        """O construtor ergue a construção na própria célula e passa a ocupá-la"""
+        ore, misc = entity.ore, entity.misc
+        construction = entity.build_construction((x, y))
+        if construction:
+            self.set_cell(self.grid, self.entity_index, x, y, None)
+            self.set_construction(x, y, construction)
+            self.add_counts(entity.type, constructions=1,
+                            ore=entity.ore - ore,
+                            misc=entity.misc - misc)
+            if self.events is not None:
+                self.events.emit(EventKind.CONSTRUCTION_BUILT, x, y, entity.type.value)
+        return construction
+
+    def tally(self):
+        """Recontagem a partir dos índices: {time: [seres, construções, ore, misc]}"""
+        totals = {team: [0, 0, 0, 0] for team in TEAMS}
+        for team, index in self.entity_index.items():
+            for x, y in index:
+                entity = self.grid[x][y]
+                totals[team][0] += 1
+                totals[team][2] += entity.ore
+                totals[team][3] += entity.misc
+        for construction in self.constructions:
+            team = construction.owner_type
+            totals[team][0] += len(construction.occupants)
+            totals[team][1] += 1
+            for occupant in construction.occupants:
+                totals[team][2] += occupant.ore
+                totals[team][3] += occupant.misc
+        return totals
+
+    def counters(self):
+        """Contadores atuais no mesmo formato de tally()"""
+        return {
+            EntityType.SPECIES1: [self.species1_count, self.construction1_count,
+                                  self.resources1[ResourceType.ORE], self.resources1[ResourceType.MISC]],
+            EntityType.SPECIES2: [self.species2_count, self.construction2_count,
+                                  self.resources2[ResourceType.ORE], self.resources2[ResourceType.MISC]]
+        }
 
     def count_entities(self):
-        self.species1_count = 0
-        self.species2_count = 0
-        self.construction1_count = 0
-        self.construction2_count = 0
-        self.resources1 = {ResourceType.ORE: 0, ResourceType.MISC: 0}
-        self.resources2 = {ResourceType.ORE: 0, ResourceType.MISC: 0}
-        
-        # Contar entidades na grade e seus recursos
-        for i in range(self.size):
-            for j in range(self.size):
-                entity = self.grid[i][j]
-                if entity:
-                    if entity.type == EntityType.SPECIES1:
-                        self.species1_count += 1
-                        for resource_type in [ResourceType.ORE, ResourceType.MISC]:
-                            self.resources1[resource_type] += entity.inventory[resource_type]
-                    elif entity.type == EntityType.SPECIES2:
-                        self.species2_count += 1
-                        for resource_type in [ResourceType.ORE, ResourceType.MISC]:
-                            self.resources2[resource_type] += entity.inventory[resource_type]
-        
-        # Contar construções e entidades dentro delas
-        for i in range(self.size):
-            for j in range(self.size):
-                construction = self.constructions[i][j]
-                if construction:
-                    if construction.owner_type == EntityType.SPECIES1:
-                        self.construction1_count += 1
-                        self.species1_count += len(construction.occupants)
-                        for occupant in construction.occupants:
-                            for resource_type in [ResourceType.ORE, ResourceType.MISC]:
-                                self.resources1[resource_type] += occupant.inventory[resource_type]
-                    else:
-                        self.construction2_count += 1
-                        self.species2_count += len(construction.occupants)
-                        for occupant in construction.occupants:
-                            for resource_type in [ResourceType.ORE, ResourceType.MISC]:
-                                self.resources2[resource_type] += occupant.inventory[resource_type]
+        """Recalcula todos os contadores do zero"""
+        self.species1_count, self.construction1_count, ore1, misc1 = self.tally()[EntityType.SPECIES1]
+        self.species2_count, self.construction2_count, ore2, misc2 = self.tally()[EntityType.SPECIES2]
+        self.resources1 = {ResourceType.ORE: ore1, ResourceType.MISC: misc1}
+        self.resources2 = {ResourceType.ORE: ore2, ResourceType.MISC: misc2}
+
+    def verify_counters(self) -> None:
+        expected = self.tally()
+        actual = self.counters()
+        if expected != actual:
+            raise AssertionError(f"Contadores divergentes: esperado {expected}, obtido {actual}")
 
     def update(self) -> None:
-        new_grid = [[None for _ in range(self.size)] for _ in range(self.size)]
+        new_grid = [[None] * self.size for _ in range(self.size)]
+        new_index = self.new_entity_index()
+        self.navigator.reset()
+        events = self.events
+        if events is not None:
+            events.tick = self.tick
+        profiler = self.profiler
+        get_neighbors = self.topology.neighbors
+        construction_at = self.constructions.at
+        if profiler is not None:
+            profiler.start(self.tick, events)
         defenders_to_return = []  # Lista de defensores que devem voltar para construção
+        visited = searched = 0
         
         # Primeira fase: Movimento inteligente e Consumo de Recursos
-        for i in range(self.size):
-            for j in range(self.size):
-                entity = self.grid[i][j]
-                if entity is None or entity.is_sheltered:
-                    continue
+        for i, j in self.scan():
+            entity = self.grid[i][j]
+            if entity is None or entity.is_sheltered:
+                continue
+            visited += 1
 
-                # Verificar se há construção inimiga próxima
-                for nx, ny in self.get_neighbors(i, j):
-                    construction = self.constructions[nx][ny]
-                    if construction and construction.owner_type != entity.type:
-                        # Atacar construção
-                        construction.take_damage(entity.get_power() * 0.2)
-                        print(f"Construção atacada na posição ({nx}, {ny})")
+            # Verificar se há construção inimiga próxima
+            for nx, ny in get_neighbors(i, j):
+                construction = construction_at(nx, ny)
+                if construction and construction.owner_type != entity.type:
+                    # Atacar construção
+                    damage = entity.get_power() * 0.2
+                    if events is not None:
+                        events.emit(EventKind.CONSTRUCTION_ATTACKED, nx, ny, entity.type.value, damage)
+                    destroyed = self.damage_construction(nx, ny, damage)
                         
-                        # Fazer defensores saírem
-                        if construction.occupants:
-                            print(f"{len(construction.occupants)} defensores saindo para proteger a construção!")
-                            # Encontrar posições livres ao redor
-                            empty_positions = []
-                            for dx, dy in self.get_neighbors(nx, ny):
-                                if self.grid[dx][dy] is None and new_grid[dx][dy] is None:
-                                    empty_positions.append((dx, dy))
+                    # Fazer defensores saírem
+                    if not destroyed and construction.occupants:
+                        if events is not None:
+                            events.emit(EventKind.DEFENDERS_DEPLOYED, nx, ny,
+                                        construction.owner_type.value, len(construction.occupants))
+                        # Encontrar posições livres ao redor
+                        empty_positions = []
+                        for dx, dy in get_neighbors(nx, ny):
+                            if self.grid[dx][dy] is None and new_grid[dx][dy] is None:
+                                empty_positions.append((dx, dy))
                             
-                            # Colocar defensores em posições livres
-                            random.shuffle(empty_positions)
-                            for defender in construction.occupants[:]:
-                                if empty_positions:
-                                    dx, dy = empty_positions.pop()
-                                    construction.remove_occupant(defender)
-                                    new_grid[dx][dy] = defender
-                                    defenders_to_return.append((defender, construction))
-                                    print(f"Defensor posicionado em ({dx}, {dy})")
-                                else:
-                                    break
-                        
-                        if construction.energy <= 0:
-                            self.constructions[nx][ny] = None
-                            print(f"Construção destruída na posição ({nx}, {ny})")
+                        # Colocar defensores em posições livres
+                        self.rng.shuffle(empty_positions)
+                        for defender in list(construction.occupants):
+                            if empty_positions:
+                                construction.remove_occupant(defender)
+                                if defender.is_sheltered:  # Construtores/mineradores podem ficar
+                                    continue
+                                dx, dy = empty_positions.pop()
+                                self.place(new_grid, new_index, dx, dy, defender)
+                                defenders_to_return.append((defender, construction))
+                                if events is not None:
+                                    events.emit(EventKind.DEFENDER_PLACED, dx, dy, defender.type.value)
+                            else:
+                                break
 
-                # Consumir recursos
-                if self.resources[i][j]:
-                    entity.consume_resource(self.resources[i][j])
-                    self.resources[i][j] = None
+            # Consumir recursos
+            code = int(self.resource_type[i, j])
+            if code != RES_NONE:
+                ore, misc = entity.ore, entity.misc
+                entity.consume(code, int(self.resource_amount[i, j]))
+                self.add_counts(entity.type,
+                                ore=entity.ore - ore,
+                                misc=entity.misc - misc)
+                self.resource_type[i, j] = RES_NONE
+                self.resource_amount[i, j] = 0
 
-                # Buscar alvos
-                target = self.find_nearest_target(i, j, entity)
+            # Buscar alvos
+            target = self.find_nearest_target(i, j, entity)
+            searched += 1
                 
-                if target:
-                    tx, ty, action = target
-                    
-                    if action == "attack" and self.manhattan_distance(i, j, tx, ty) <= 1:
-                        # Atacar construção
-                        construction = self.constructions[tx][ty]
-                        if construction:
-                            construction.take_damage(entity.get_power() * 0.2)
-                            if construction.energy <= 0:
-                                self.constructions[tx][ty] = None
-                                print(f"Construção destruída na posição ({tx}, {ty})")
+            if target:
+                tx, ty, action = target
                     
-                    elif action == "mate" and self.manhattan_distance(i, j, tx, ty) <= 1:
-                        # Reproduzir com parceiro
-                        partner = self.grid[tx][ty]
-                        if partner and partner.can_reproduce() and entity.can_reproduce():
-                            empty_neighbors = [(x, y) for x, y in self.get_neighbors(i, j)
-                                            if self.grid[x][y] is None]
-                            if empty_neighbors:
-                                child_x, child_y = random.choice(empty_neighbors)
-                                new_grid[child_x][child_y] = entity.reproduce()
-                                print(f"Reprodução ocorreu na posição ({child_x}, {child_y})")
+                if action == "attack" and self.manhattan_distance(i, j, tx, ty) <= 1:
+                    # Atacar construção
+                    construction = construction_at(tx, ty)
+                    if construction:
+                        self.damage_construction(tx, ty, entity.get_power() * 0.2)
                     
-                    elif action == "shelter" and self.manhattan_distance(i, j, tx, ty) <= 1:
-                        # Entrar na construção
-                        construction = self.constructions[tx][ty]
-                        if construction and construction.add_occupant(entity):
-                            continue
+                elif action == "mate" and self.manhattan_distance(i, j, tx, ty) <= 1:
+                    # Reproduzir com parceiro
+                    partner = self.grid[tx][ty]
+                    if partner and partner.can_reproduce() and entity.can_reproduce():
+                        empty_neighbors = [(x, y) for x, y in get_neighbors(i, j)
+                                        if self.grid[x][y] is None]
+                        if empty_neighbors:
+                            child_x, child_y = self.rng.choice(empty_neighbors)
+                            child = entity.reproduce(self.rng)
+                            self.record_birth(child, child_x, child_y)
+                            self.place(new_grid, new_index, child_x, child_y, child)
                     
-                    # Mover em direção ao alvo
-                    new_x, new_y = self.move_towards(entity, (i, j), (tx, ty))
-                    if (new_x, new_y) != (i, j):
-                        new_grid[new_x][new_y] = entity
+                elif action == "shelter" and self.manhattan_distance(i, j, tx, ty) <= 1:
+                    # Entrar na construção
+                    construction = construction_at(tx, ty)
+                    if construction and construction.add_occupant(entity):
                         continue
+                    
+                # Mover em direção ao alvo
+                new_x, new_y = self.navigate(entity, (i, j), (tx, ty), action)
+                if (new_x, new_y) != (i, j):
+                    self.place(new_grid, new_index, new_x, new_y, entity)
+                    continue
 
-                # Se não conseguiu mover para o alvo, mover aleatoriamente
-                if random.random() < 0.2:
-                    empty_neighbors = [(x, y) for x, y in self.get_neighbors(i, j)
-                                    if self.grid[x][y] is None]
-                    if empty_neighbors:
-                        new_x, new_y = random.choice(empty_neighbors)
-                        new_grid[new_x][new_y] = entity
-                        continue
+            # Se não conseguiu mover para o alvo, mover aleatoriamente
+            if self.rng.random() < 0.2:
+                empty_neighbors = [(x, y) for x, y in get_neighbors(i, j)
+                                if self.grid[x][y] is None]
+                if empty_neighbors:
+                    new_x, new_y = self.rng.choice(empty_neighbors)
+                    self.place(new_grid, new_index, new_x, new_y, entity)
+                    continue
 
-                new_grid[i][j] = entity
+            self.place(new_grid, new_index, i, j, entity)
 
-        # Segunda fase: Combate e Reprodução
-        for i in range(self.size):
-            for j in range(self.size):
-                entity = new_grid[i][j]
-                if entity is None:
-                    continue
+        if profiler is not None:
+            profiler.lap("movement", visited, searched)
+            visited = 0
 
-                # Combate
-                for nx, ny in self.get_neighbors(i, j):
-                    neighbor = new_grid[nx][ny]
-                    if (neighbor and 
-                        neighbor.type != entity.type and 
-                        entity.get_power() > neighbor.get_power()):
-                        new_grid[nx][ny] = None
-
-                # Reprodução
-                if entity.can_reproduce():
-                    empty_neighbors = [(x, y) for x, y in self.get_neighbors(i, j)
-                                    if new_grid[x][y] is None]
-                    if empty_neighbors:
-                        child_x, child_y = random.choice(empty_neighbors)
-                        new_grid[child_x][child_y] = entity.reproduce()
+        # Segunda fase: Combate e Reprodução (filhos à frente na varredura também agem)
+        order = self.scan(new_index)
+        for i, j in order:
+            entity = new_grid[i][j]
+            if entity is None:
+                continue
+            visited += 1
+
+            # Combate
+            for nx, ny in get_neighbors(i, j):
+                neighbor = new_grid[nx][ny]
+                if (neighbor and 
+                    neighbor.type != entity.type and 
+                    entity.get_power() > neighbor.get_power()):
+                    self.record_death(neighbor, nx, ny)
+                    self.set_cell(new_grid, new_index, nx, ny, None)
+
+            # Reprodução
+            if entity.can_reproduce():
+                empty_neighbors = [(x, y) for x, y in get_neighbors(i, j)
+                                if new_grid[x][y] is None]
+                if empty_neighbors:
+                    child_x, child_y = self.rng.choice(empty_neighbors)
+                    child = entity.reproduce(self.rng)
+                    self.record_birth(child, child_x, child_y)
+                    self.place(new_grid, new_index, child_x, child_y, child)
+                    order.push((child_x, child_y))
 
         self.grid = new_grid
-        self.update_resources()
+        self.entity_index = new_index
+        if profiler is not None:
+            profiler.lap("combat", visited)
+        drawn = self.update_resources()
+        if profiler is not None:
+            profiler.lap("resources", drawn)
 
         # Atualizar construções e reprodução dentro delas
-        for i in range(self.size):
-            for j in range(self.size):
-                entity = self.grid[i][j]
+        order = self.scan()
+        for i, j in order:
+            entity = self.grid[i][j]
                 
-                # Verificar mineração de ore
-                if (entity and entity.role == EntityRole.MINER and 
-                    self.resources[i][j] and self.resources[i][j].type == ResourceType.ORE):
-                    print(f"Minério minerado por {'Time Azul' if entity.type == EntityType.SPECIES1 else 'Time Vermelho'} na posição ({i}, {j})")
+            # Verificar mineração de ore
+            if (entity and entity.role == EntityRole.MINER and 
+                self.resource_type[i, j] == RES_ORE and
+                events is not None):
+                events.emit(EventKind.ORE_MINED, i, j, entity.type.value)
                 
-                # Verificar construção
-                if entity and entity.can_build():
-                    empty_neighbors = sum(1 for x, y in self.get_neighbors(i, j)
-                                       if self.grid[x][y] is None and 
-                                          self.constructions[x][y] is None)
-                    if empty_neighbors >= 3:
-                        construction = entity.build_construction((i, j))
-                        if construction:
-                            self.constructions[i][j] = construction
-                            team = "Time Azul" if entity.type == EntityType.SPECIES1 else "Time Vermelho"
-                            print(f"Nova construção do {team} na posição ({i}, {j})")
+            # Verificar construção
+            if entity and entity.can_build():
+                empty_neighbors = sum(1 for x, y in get_neighbors(i, j)
+                                   if self.grid[x][y] is None and 
+                                      construction_at(x, y) is None)
+                if empty_neighbors >= 3:
+                    self.build(entity, i, j)
                     
-                    # Verificar ameaças e resto do código das construções...
-                    threats = []
-                    for nx, ny in self.get_neighbors(i, j):
-                        enemy = self.grid[nx][ny]
-                        if enemy and enemy.type != construction.owner_type:
-                            threats.append((enemy, (nx, ny)))
+                # Verificar ameaças à construção desta posição (se houver)
+                construction = construction_at(i, j)
+                threats = []
+                for nx, ny in get_neighbors(i, j) if construction else []:
+                    enemy = self.grid[nx][ny]
+                    if enemy and enemy.type != construction.owner_type:
+                        threats.append((enemy, (nx, ny)))
                     
-                    if threats:
-                        # Defender a construção
-                        for occupant in construction.occupants[:]:
-                            construction.remove_occupant(occupant)
-                            # Encontrar posição livre próxima
-                            for nx, ny in self.get_neighbors(i, j):
-                                if self.grid[nx][ny] is None:
-                                    self.grid[nx][ny] = occupant
-                                    break
+                if threats:
+                    # Defender a construção
+                    for occupant in list(construction.occupants):
+                        # Encontrar posição livre próxima; sem espaço, os demais ficam dentro
+                        free = next(((nx, ny) for nx, ny in get_neighbors(i, j)
+                                     if self.grid[nx][ny] is None), None)
+                        if free is None:
+                            break
+                        construction.remove_occupant(occupant)
+                        if occupant.is_sheltered:  # Construtores/mineradores podem ficar
+                            continue
+                        self.set_cell(self.grid, self.entity_index, free[0], free[1], occupant)
+                        order.push(free)
+
+        if profiler is not None:
+            profiler.lap("build", self.population())
 
         # Permitir construção de novas estruturas
-        for i in range(self.size):
-            for j in range(self.size):
-                entity = self.grid[i][j]
-                if entity and entity.can_build():
-                    # Verificar se há espaço adequado para construção
-                    empty_neighbors = sum(1 for x, y in self.get_neighbors(i, j)
-                                       if self.grid[x][y] is None and 
-                                          self.constructions[x][y] is None)
-                    if empty_neighbors >= 3:  # Precisa de espaço
-                        construction = entity.build_construction((i, j))
-                        if construction:
-                            self.constructions[i][j] = construction
+        for i, j in self.scan():
+            entity = self.grid[i][j]
+            if entity and entity.can_build():
+                # Verificar se há espaço adequado para construção
+                empty_neighbors = sum(1 for x, y in get_neighbors(i, j)
+                                   if self.grid[x][y] is None and 
+                                      construction_at(x, y) is None)
+                if empty_neighbors >= 3:  # Precisa de espaço
+                    self.build(entity, i, j)
+
+        if profiler is not None:
+            profiler.lap("build_again", self.population())
 
         # Permitir que entidades entrem em construções aliadas
-        for i in range(self.size):
-            for j in range(self.size):
-                entity = self.grid[i][j]
-                if entity and not entity.is_sheltered:
-                    for nx, ny in self.get_neighbors(i, j):
-                        construction = self.constructions[nx][ny]
-                        if (construction and 
-                            construction.owner_type == entity.type and
-                            construction.add_occupant(entity)):
-                            self.grid[i][j] = None
-                            break
+        for i, j in self.scan():
+            entity = self.grid[i][j]
+            if entity and not entity.is_sheltered:
+                for nx, ny in get_neighbors(i, j):
+                    construction = construction_at(nx, ny)
+                    if (construction and 
+                        construction.owner_type == entity.type and
+                        construction.add_occupant(entity)):
+                        self.set_cell(self.grid, self.entity_index, i, j, None)
+                        break
+
+        if profiler is not None:
+            profiler.lap("shelter", self.population())
 
         # Mineradores procuram construtores para entregar recursos
-        for i in range(self.size):
-            for j in range(self.size):
-                entity = self.grid[i][j]
-                if (entity and 
-                    entity.role == EntityRole.MINER and 
-                    (entity.inventory[ResourceType.ORE] > 0 or 
-                     entity.inventory[ResourceType.MISC] > 0)):
+        for i, j in self.scan():
+            entity = self.grid[i][j]
+            if (entity and 
+                entity.role == EntityRole.MINER and 
+                (entity.ore > 0 or 
+                 entity.misc > 0)):
                     
-                    # Procurar construtor nas vizinhanças
-                    for nx, ny in self.get_neighbors(i, j):
-                        neighbor = self.grid[nx][ny]
-                        if (neighbor and 
-                            neighbor.role == EntityRole.BUILDER and 
-                            neighbor.type == entity.type):
-                            entity.transfer_to_builder(neighbor)
-                            break
+                # Procurar construtor nas vizinhanças
+                for nx, ny in get_neighbors(i, j):
+                    neighbor = self.grid[nx][ny]
+                    if (neighbor and 
+                        neighbor.role == EntityRole.BUILDER and 
+                        neighbor.type == entity.type):
+                        entity.transfer_to_builder(neighbor)
+                        break
+
+        if profiler is not None:
+            profiler.lap("transfer", self.population())
 
         # Tentar retornar defensores para suas construções
         for defender, construction in defenders_to_return:
@@ -312,90 +505,140 @@ class World:
                 
                 cx, cy = construction.position
                 # Verificar se está adjacente à construção
-                for nx, ny in self.get_neighbors(cx, cy):
+                for nx, ny in get_neighbors(cx, cy):
                     if self.grid[nx][ny] == defender:
                         # Tentar retornar para a construção
                         if construction.add_occupant(defender):
-                            self.grid[nx][ny] = None
-                            print(f"Defensor retornou para a construção em ({cx}, {cy})")
+                            self.set_cell(self.grid, self.entity_index, nx, ny, None)
+                            if events is not None:
+                                events.emit(EventKind.DEFENDER_RETURNED, cx, cy, defender.type.value)
                         break
 
-        # Atualizar contagem de entidades
-        self.count_entities()
+        if profiler is not None:
+            profiler.lap("defenders", len(defenders_to_return))
+
+        self.update_constructions()
+        if profiler is not None:
+            profiler.lap("constructions", len(self.constructions))
+
+        if self.check_counters:
+            self.verify_counters()
+            if profiler is not None:
+                profiler.lap("counting", self.population())
 
         # Verificar formação de novos exércitos (apenas com seres normais)
         for team in [EntityType.SPECIES1, EntityType.SPECIES2]:
             team_entities = []
-            for i in range(self.size):
-                for j in range(self.size):
-                    entity = self.grid[i][j]
-                    if (entity and 
-                        entity.type == team and 
-                        not entity.is_sheltered and
-                        entity.role == EntityRole.NORMAL):  # Apenas seres normais
-                        team_entities.append(entity)
-                        entity.position = (i, j)
+            for i, j in sorted(self.entity_index[team]):
+                entity = self.grid[i][j]
+                if (entity and 
+                    entity.type == team and 
+                    not entity.is_sheltered and
+                    entity.role == EntityRole.NORMAL):  # Apenas seres normais
+                    team_entities.append(entity)
+                    entity.position = (i, j)
             
             if len(team_entities) >= 10:
                 potential_army = team_entities[:10]
                 self.form_army(potential_army)
 
+        if profiler is not None:
+            profiler.lap("army_formation", self.population())
+
         # Atualizar exércitos existentes
         self.update_armies()
+        if profiler is not None:
+            profiler.lap("army_update", sum(len(army) for armies in self.armies.values() for army in armies))
 
-    def update_resources(self) -> None:
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.resources[i][j] is None:
-                    # Gerar apenas comida e misc, não minério
-                    for resource_type in [ResourceType.FOOD, ResourceType.MISC]:
-                        resource = Resource.create_random(resource_type)
-                        if resource:
-                            self.resources[i][j] = resource
-                            break 
+        if events is not None:
+            events.flush()
+        self.tick += 1
+
+    def update_constructions(self) -> None:
+        """
+        Manutenção das construções numa passada pelo registro, em ordem de
+        criação: lotadas liberam 8 seres normais nas células livres em volta
+        (que formam um exército), as demais tentam reproduzir dentro
+        """
+        for construction in list(self.constructions):
+            construction.update()
+            x, y = construction.position
+            if construction.is_full():
+                free = [(nx, ny) for nx, ny in self.topology.neighbors(x, y)
+                        if self.grid[nx][ny] is None and (nx, ny) not in self.constructions]
+                army = construction.release_army(min(len(free), 8))
+                for soldier, (nx, ny) in zip(army, free):
+                    soldier.position = (nx, ny)
+                    self.set_cell(self.grid, self.entity_index, nx, ny, soldier)
+                if army:
+                    self.form_army(army, EventKind.CONSTRUCTION_ARMY, (x, y))
+            else:
+                child = construction.try_reproduce(self.rng)
+                if child is not None:
+                    self.record_birth(child, x, y, EventKind.CONSTRUCTION_BIRTH,
+                                      len(construction.occupants))
+
+    def update_resources(self) -> int:
+        """
+        Regeneração em células sem recurso: comida com 10%, senão misc com 10%
+        (minério não regenera), quantidade de 1 a 3. Um único sorteio por
+        célula vazia decide o tipo e, reescalado dentro da faixa, a quantidade.
+        Só as células vazias sorteiam: depois dos primeiros ticks elas são as
+        consumidas, e o custo acompanha a população em vez da área. Devolve
+        quantas células sortearam.
+        """
+        empty = np.flatnonzero(self.resource_type.ravel() == RES_NONE)
+        roll = self.rng.uniform_array(len(empty))
+        food = roll < 0.1
+        misc = (roll >= 0.1) & (roll < 0.19)  # 10% dos 90% restantes
+        grown = food | misc
+        scaled = np.where(food, roll / 0.1, (roll - 0.1) / 0.09)[grown]
+        cells = empty[grown]
+        self.resource_type.flat[cells] = np.where(food[grown], RES_FOOD, RES_MISC)
+        self.resource_amount.flat[cells] = np.minimum(1 + (scaled * 3).astype(np.int8), 3)
+        return len(empty)
 
     def manhattan_distance(self, x1: int, y1: int, x2: int, y2: int) -> int:
         return abs(x1 - x2) + abs(y1 - y2)
 
     def find_nearest_target(self, x: int, y: int, entity: Entity, max_distance: int = 10) -> Optional[Tuple[int, int]]:
         """Encontra o alvo mais próximo (construção inimiga, parceiro ou construção aliada)"""
-        best_distance = max_distance + 1
-        best_target = None
-        
-        for i in range(self.size):
-            for j in range(self.size):
+        # Candidatos como (distância, i, j, prioridade, ação): empates de distância
+        # seguem a ordem da grade e, na mesma célula, atacar > reproduzir > abrigar
+        candidates = []
+        enemy_positions = set()
+        for team, index in self.construction_index.items():
+            for i, j in index.within(x, y, max_distance):
                 distance = self.manhattan_distance(x, y, i, j)
-                if distance > max_distance:
-                    continue
-                    
-                # Procurar construção inimiga para atacar
-                construction = self.constructions[i][j]
-                if (construction and 
-                    construction.owner_type != entity.type and 
-                    distance < best_distance):
-                    best_distance = distance
-                    best_target = (i, j, "attack")
-                
-                # Se não estiver procurando ataque, procurar parceiro/abrigo
-                elif distance < best_distance:
-                    # Procurar construção aliada com espaço
-                    if (construction and 
-                        construction.owner_type == entity.type and
-                        len(construction.occupants) < construction.max_occupants):
-                        best_distance = distance
-                        best_target = (i, j, "shelter")
-                    
-                    # Procurar parceiro para reprodução
-                    partner = self.grid[i][j]
-                    if (partner and 
-                        partner.type == entity.type and 
-                        partner != entity and
-                        partner.can_reproduce() and 
-                        entity.can_reproduce()):
-                        best_distance = distance
-                        best_target = (i, j, "mate")
-        
-        return best_target
+                if team != entity.type:
+                    enemy_positions.add((i, j))
+                    candidates.append((distance, i, j, 0, "attack"))
+                else:
+                    construction = self.constructions.at(i, j)
+                    if len(construction.occupants) < construction.max_occupants:
+                        candidates.append((distance, i, j, 2, "shelter"))
+
+        # Procurar parceiro para reprodução
+        if entity.can_reproduce():
+            for i, j in self.entity_index[entity.type].within(x, y, max_distance):
+                partner = self.grid[i][j]
+                if (partner != entity and
+                    (i, j) not in enemy_positions and
+                    partner.can_reproduce()):
+                    candidates.append((self.manhattan_distance(x, y, i, j), i, j, 1, "mate"))
+
+        if not candidates:
+            return None
+        _, i, j, _, action = min(candidates)
+        return (i, j, action)
+
+    def navigate(self, entity: Entity, current_pos: Tuple[int, int], target_pos: Tuple[int, int], action: str) -> Tuple[int, int]:
+        """Desce o campo de distância compartilhado do time; sem campo (ou parado), passo guloso"""
+        if action in (ATTACK, SHELTER):
+            new_pos = self.navigator.step(entity.type, action, current_pos)
+            if new_pos != current_pos:
+                return new_pos
+        return self.move_towards(entity, current_pos, target_pos)
 
     def move_towards(self, entity: Entity, current_pos: Tuple[int, int], target_pos: Tuple[int, int]) -> Tuple[int, int]:
         """Move a entidade em direção ao alvo"""
@@ -417,15 +660,22 @@ class World:
         
         return current_pos 
 
-    def form_army(self, entities: List[Entity]) -> None:
-        """Agrupa entidades em um exército, apenas com guerreiros (papel NORMAL)"""
+    def form_army(self, entities: List[Entity], kind: EventKind = EventKind.ARMY_FORMED,
+                  position: Optional[Tuple[int, int]] = None) -> None:
+        """
+        Agrupa entidades em um exército, apenas com guerreiros (papel NORMAL).
+        O evento sai na posição do primeiro guerreiro, ou em `position` (a
+        construção que liberou o exército)
+        """
         # Filtrar apenas seres normais (não construtores/mineradores)
         warriors = [e for e in entities if e.role == EntityRole.NORMAL]
         
         if len(warriors) >= 8:
             team = warriors[0].type
             self.armies[team].append(warriors)
-            print(f"Novo exército formado para o {'Time Azul' if team == EntityType.SPECIES1 else 'Time Vermelho'} com {len(warriors)} guerreiros")
+            if self.events is not None:
+                position = position or warriors[0].position or (-1, -1)
+                self.events.emit(kind, position[0], position[1], team.value, len(warriors))
 
     def update_armies(self) -> None:
         """Atualiza o comportamento dos exércitos"""
@@ -438,25 +688,34 @@ class World:
                     self.armies[team].remove(army)
                     continue
                 
-                # Encontrar inimigos próximos ou construções inimigas
-                enemies = []
-                for i in range(self.size):
-                    for j in range(self.size):
-                        entity = self.grid[i][j]
-                        if entity and entity.type != team:
-                            enemies.append((entity, (i, j)))
-                
-                if enemies:
-                    # Atacar inimigo mais próximo
-                    target, pos = min(enemies, key=lambda e: self.manhattan_distance(
-                        army[0].position[0], army[0].position[1], e[1][0], e[1][1]))
-                    
-                    # Mover exército em direção ao alvo
+                enemy_team = EntityType.SPECIES2 if team == EntityType.SPECIES1 else EntityType.SPECIES1
+                if len(self.entity_index[enemy_team]):
+                    # Todos os soldados do time descem o mesmo campo até o inimigo mais próximo
                     for soldier in army:
                         if not soldier.position:
                             continue
-                        new_pos = self.move_towards(soldier, soldier.position, pos)
+                        x, y = soldier.position
+                        if self.grid[x][y] is not soldier:  # Posição desatualizada
+                            continue
+                        new_pos = self.navigator.step(team, ENEMY, soldier.position)
                         if new_pos != soldier.position:
-                            self.grid[soldier.position[0]][soldier.position[1]] = None
-                            self.grid[new_pos[0]][new_pos[1]] = soldier
-                            soldier.position = new_pos 
\ No newline at end of file
+                            self.set_cell(self.grid, self.entity_index, soldier.position[0], soldier.position[1], None)
+                            self.set_cell(self.grid, self.entity_index, new_pos[0], new_pos[1], soldier)
+                            soldier.position = new_pos 
+
+ENGINES = ("object", "legacy")
+
+def create_world(size: int, prob_species1: float, prob_species2: float, engine: str = "object",
+                 seed: Optional[int] = None):
+    """
+    Cria o mundo com o motor escolhido: "object" (World) ou "legacy"
+    (LegacyAutomaton, o autômato celular original, outro modelo). Com a
+    mesma `seed` o motor repete a simulação. ArrayWorld e TiledWorld não
+    entram aqui: seguem regras simplificadas próprias, não as do World.
+    """
+    if engine == "object":
+        return World(size, prob_species1, prob_species2, seed=seed)
+    if engine == "legacy":
+        from legacy_automaton import LegacyAutomaton
+        return LegacyAutomaton(size, prob_species1, prob_species2, seed=seed)
+    raise ValueError(f"Motor desconhecido: {engine}. Opções: {', '.join(ENGINES)}")